@@ -3,13 +3,11 @@ Application factory
 """
 
 # Python Packages
+import threading
 from flask import Flask
-from flask_cors import CORS
-from flask_migrate import Migrate
+from werkzeug.local import LocalProxy
 
 # Local Imports
-from .config.swagger import api
-from .config.urls import URLs
 from .config.database import init_db, db
 
 
@@ -19,12 +17,29 @@ from .config.database import init_db, db
 def create_app():
     """
     Application Factory
+
+    Flask extensions, Swagger and the namespace registry are imported here
+    rather than at module top, so CLI entry points that import this module
+    without building the app (alembic, scripts, workers) skip their cost.
     """
 
+    # Python Packages
+    from flask_cors import CORS
+    from flask_migrate import Migrate
+
+    # Local Imports
+    from .base import constants
+    from .config.cors import StaticCORSMiddleware
+    from .config.json_provider import OrjsonProvider
+    from .config.swagger import api
+
     # App Object
     app = Flask(__name__)
     app.config["DEBUG"] = True
 
+    # JSON via orjson — compact, insertion-ordered, C-level encode/decode
+    app.json = OrjsonProvider(app)
+
     # Initialize Database
     init_db(app)
 
@@ -34,22 +49,78 @@ def create_app():
     # Initialize Migration
     Migrate(app, db)
 
-    # Enable CORS
-    CORS(app)
+    # Enable CORS — fixed-origin WSGI middleware in production, flask-cors elsewhere
+    if constants.APP_ENV == "production":
+        app.wsgi_app = StaticCORSMiddleware(app.wsgi_app, origin = constants.CORS_ORIGIN)
+    else:
+        CORS(app)
 
     # Initialize Swagger
     api.init_app(app)
 
-    # Register Namespaces
-    URLs.add_namespaces()
+    # Register Namespaces — deferred until the first request (see register_routes)
+    app.extensions["odp_routes"] = {"lock": threading.Lock(), "registered": False}
+    wsgi_app = app.wsgi_app
+
+    def lazy_routes_wsgi_app(environ, start_response):
+        if not app.extensions["odp_routes"]["registered"]:
+            register_routes(app)
+        return wsgi_app(environ, start_response)
+
+    app.wsgi_app = lazy_routes_wsgi_app
 
     return app
 
 
 
-# Create app instance for Flask CLI
-app = create_app()
+def register_routes(app):
+    """
+    Register every API namespace on *app* (idempotent, thread-safe)
+
+    Importing the namespaces pulls in every handler, service and LLM SDK, so
+    create_app() leaves it to the first request: CLI commands that never
+    serve HTTP (flask db upgrade, flask shell) skip that cost. It is hooked
+    at the WSGI entry point because Flask refuses new routes once it has
+    started handling a request. Call this directly to warm up eagerly
+    (e.g. a gunicorn post_fork hook) or before inspecting app.url_map.
+    """
+
+    state = app.extensions["odp_routes"]
+    if state["registered"]:
+        return
+
+    with state["lock"]:
+        if state["registered"]:
+            return
+
+        # Local Imports
+        from .config.urls import URLs
+
+        URLs.add_namespaces()
+        state["registered"] = True
+
+
+
+_app = None
+
+
+def get_app():
+    """
+    Return the process-wide app, building it on first call
+    """
+
+    global _app
+    if _app is None:
+        _app = create_app()
+    return _app
+
+
+
+# App instance for Flask CLI / WSGI servers (`flask run`, `gunicorn app:app`).
+# A proxy: the app is built on first attribute access or request, so modules
+# that only import this file (alembic, scripts, tests) never construct it.
+app = LocalProxy(get_app)
 
 
 if __name__ == "__main__":
-    app.run(host = "0.0.0.0", port = 5000)
+    get_app().run(host = "0.0.0.0", port = 5000)
@@ -1,15 +1,29 @@
 """ All Application Constants declare here... """
 
 # Python Packages
-from decouple import config
+import os
+from decouple import AutoConfig, Config
+
+
+# Settings reader — os.environ always wins; otherwise values come from
+# base/_env_cache.py when it exists (written at build time by
+# scripts/compile_env.py, loaded as a plain .pyc), else from .env, which is
+# located and parsed once here and then served from the cached repository.
+try:
+    from ._env_cache import ENV as _ENV_CACHE
+    _config = Config(_ENV_CACHE)
+except ImportError:
+    _config = AutoConfig(search_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 
 
 
 # App Constants
-APP_ENV                         =   config('APP_ENV')
-APP_SECRET_KEY                  =   config('APP_SECRET_KEY')
+APP_ENV                         =   _config('APP_ENV')
+APP_SECRET_KEY                  =   _config('APP_SECRET_KEY')
+CORS_ORIGIN                     =   _config('CORS_ORIGIN', default = '*')   # Production allowed origin
+DEBUG_ENDPOINTS_ENABLED         =   _config('DEBUG_ENDPOINTS_ENABLED', default = APP_ENV != 'production', cast = bool)   # GET /bot/debug/<deal_id>
 
 
 # Swagger Constants
@@ -23,25 +37,25 @@ SWAGGER_APP_PROPS       =   {
 
 
 # Database Constants
-DB_HOST                         =   config('DB_HOST')
-DB_PORT                         =   config('DB_PORT')
-DB_NAME                         =   config('DB_NAME')
-DB_USER                         =   config('DB_USER')
-DB_PASSWORD                     =   config('DB_PASSWORD')
+DB_HOST                         =   _config('DB_HOST')
+DB_PORT                         =   _config('DB_PORT')
+DB_NAME                         =   _config('DB_NAME')
+DB_USER                         =   _config('DB_USER')
+DB_PASSWORD                     =   _config('DB_PASSWORD')
 
 
 # AWS Constants
-AWS_ACCESS_KEY_ID		        =	config('AWS_ACCESS_KEY_ID')
-AWS_SECRET_ACCESS_KEY	        =	config('AWS_SECRET_ACCESS_KEY')
-AWS_REGION				        =	config('AWS_REGION')
-AWS_S3_BUCKET_NAME	            =	config('AWS_S3_BUCKET_NAME')
+AWS_ACCESS_KEY_ID		        =	_config('AWS_ACCESS_KEY_ID')
+AWS_SECRET_ACCESS_KEY	        =	_config('AWS_SECRET_ACCESS_KEY')
+AWS_REGION				        =	_config('AWS_REGION')
+AWS_S3_BUCKET_NAME	            =	_config('AWS_S3_BUCKET_NAME')
 
 
 # Google Variables
-GOOGLE_PROJECT_ID		        =	config('GOOGLE_PROJECT_ID')
-GOOGLE_PROJECT_LOCATION	        =	config('GOOGLE_PROJECT_LOCATION')
-GOOGLE_PROJECT_PROCESSOR_ID     =	config('GOOGLE_PROJECT_PROCESSOR_ID')
-GOOGLE_APPLICATION_CREDENTIALS	=	config('GOOGLE_APPLICATION_CREDENTIALS')
+GOOGLE_PROJECT_ID		        =	_config('GOOGLE_PROJECT_ID')
+GOOGLE_PROJECT_LOCATION	        =	_config('GOOGLE_PROJECT_LOCATION')
+GOOGLE_PROJECT_PROCESSOR_ID     =	_config('GOOGLE_PROJECT_PROCESSOR_ID')
+GOOGLE_APPLICATION_CREDENTIALS	=	_config('GOOGLE_APPLICATION_CREDENTIALS')
 
 
 # AI Provider Variables
@@ -50,12 +64,12 @@ AI_PROVIDER                     =   'anthropic'
 
 
 # Anthropic Variables
-ANTHROPIC_API_KEY				=	config('ANTHROPIC_API_KEY')
+ANTHROPIC_API_KEY				=	_config('ANTHROPIC_API_KEY')
 ANTHROPIC_DEFAULT_MODEL			=	"claude-sonnet-4-6"
 
 
 # OpenAI Constants
-OPENAI_API_KEY		            =	config('OPENAI_API_KEY')
+OPENAI_API_KEY		            =	_config('OPENAI_API_KEY')
 OPENAI_DEFAULT_MODEL            =   "gpt-4o-mini"
 OPENAI_MAX_TOKENS		        =	3000
 OPENAI_ANSWER_TEMPERATURE	    =	0.7 # Very Fliexible for creative answers
@@ -4,16 +4,53 @@ bot/config/__init__.py
 Public surface of the bot configuration package.
 
 Config files:
-  bot_config   — API-level settings (top_k, similarity threshold, message limits)
-  llm_config   — LLM temperatures & max_tokens for every call type
-  prompts      — ALL system prompts, user prompt templates, and section strings
-  keywords     — ALL keyword lists, detection patterns, and phrase sets
-  thresholds   — Confidence scoring thresholds & text truncation limits
+  bot_config     — API-level settings (top_k, similarity threshold, message limits)
+  llm_config     — LLM temperatures & max_tokens for every call type
+  prompts        — ALL system prompts, user prompt templates, and section strings
+  keywords       — ALL keyword lists, detection patterns, and phrase sets
+  thresholds     — Confidence scoring thresholds & text truncation limits
+  fact_patterns  — Fact-key mappings & atomic fact extraction patterns
+  tone           — TTL cache of canonical tone sections loaded from the DB
+  matchers       — Builds the precompiled phrase regexes used by keywords / fact_patterns
+
+Loading:
+  Submodules are imported lazily on first access (PEP 562 module __getattr__),
+  so `from ..config import bot_config` loads bot_config only — not the large
+  prompt strings or the compiled keyword matchers. Once loaded, a submodule
+  is cached in this package's globals and later lookups skip __getattr__.
 """
 
-from . import bot_config
-from . import llm_config
-from . import prompts
-from . import keywords
-from . import thresholds
-from . import fact_patterns
+# Python Packages
+import importlib
+
+
+_SUBMODULES = frozenset({
+    "bot_config",
+    "llm_config",
+    "prompts",
+    "keywords",
+    "thresholds",
+    "fact_patterns",
+    "tone",
+    "matchers",
+})
+
+__all__ = tuple(sorted(_SUBMODULES))
+
+
+
+
+
+def __getattr__(name):
+    """ Import a config submodule on first access and cache it. """
+    if name in _SUBMODULES:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+
+def __dir__():
+    """ List the lazy submodules alongside the loaded globals. """
+    return sorted(set(globals()) | _SUBMODULES)
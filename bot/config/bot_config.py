@@ -10,20 +10,75 @@ To tune RAG quality:
   - Lower BOT_SIMILARITY_THRESHOLD → more results, possibly noisier
 """
 
+# Python Packages
+from types import MappingProxyType
+from typing import Final
+
+
 # Number of document chunks returned per KB search tier
-BOT_DEFAULT_TOP_K = 5
+BOT_DEFAULT_TOP_K: Final[int] = 5
 
 # Minimum cosine similarity for a chunk to be included (0.0 – 1.0)
-BOT_SIMILARITY_THRESHOLD = 0.5
+BOT_SIMILARITY_THRESHOLD: Final[float] = 0.5
 
 # Max messages returned by GET /bot/conversation/<session_id>
-BOT_LAST_CONVERSATION_MESSAGES_LIMIT = 10
+BOT_LAST_CONVERSATION_MESSAGES_LIMIT: Final[int] = 10
 
 # ── Email Thread Settings ───────────────────────────────────────────────────────
 # Maximum raw thread text length accepted (characters).
 # Prevents extremely large pastes that would blow the LLM context window.
-BOT_THREAD_MAX_LENGTH = 50_000
+BOT_THREAD_MAX_LENGTH: Final[int] = 50_000
 
 # Minimum raw thread text length (characters).
 # Rejects obviously empty or trivial submissions.
-BOT_THREAD_MIN_LENGTH = 20
+BOT_THREAD_MIN_LENGTH: Final[int] = 20
+
+# Largest POST /bot/thread body read at all (bytes). Bodies above this are
+# rejected from Content-Length before being read or parsed. Allows for every
+# character of a max-length thread being JSON-escaped (\uXXXX = 6 bytes) plus
+# the other fields.
+BOT_THREAD_MAX_BODY_BYTES: Final[int] = BOT_THREAD_MAX_LENGTH * 6 + 4_096
+
+# ── Answer Cache ───────────────────────────────────────────────────────────────
+# First-turn questions (new session) are cached per (question, deal, top_k) in
+# each worker process — see services/answer_cache.py. Team-supplied facts and
+# processed documents bump the deal's knowledge version in the DB, which
+# invalidates its cached answers in every process at once. The TTL is only the
+# backstop for changes made outside the app (e.g. manual DB edits).
+BOT_ANSWER_CACHE_SIZE: Final[int]        = 1024
+BOT_ANSWER_CACHE_TTL_SECONDS: Final[int] = 600
+
+# Near-duplicate first-turn questions ("minimum check size?" vs "minimum
+# ticket?") reuse a cached answer when their embeddings are at least this
+# similar. Keep it high — "minimum" vs "maximum" questions can score ~0.9.
+BOT_SEMANTIC_CACHE_SIZE: Final[int]        = 256
+BOT_SEMANTIC_CACHE_THRESHOLD: Final[float] = 0.95
+
+# ── Embedding Batching ─────────────────────────────────────────────────────────
+# Question embeddings from concurrent requests are sent as one API call — see
+# services/embedding_batcher.py. The window is the longest a request waits for
+# company; 0 disables waiting (each call still goes through the batcher).
+# A caller whose batch has not come back within the timeout embeds its own
+# text(s) directly instead.
+BOT_EMBED_BATCH_WINDOW_MS: Final[int]       = 10
+BOT_EMBED_BATCH_MAX: Final[int]             = 64
+BOT_EMBED_BATCH_TIMEOUT_SECONDS: Final[int] = 15
+
+# ── Vector Index Search ────────────────────────────────────────────────────────
+# Candidates the pgvector HNSW index visits for a deal-scoped search (pgvector's
+# default is 40). The deal filter is applied to those candidates, so with many
+# deals a small value can return fewer than top_k chunks of the asked-about deal.
+BOT_HNSW_EF_SEARCH: Final[int] = 100
+
+# ── Read-only Defaults View ────────────────────────────────────────────────────
+# All of the above in one immutable mapping, built once at import. Callers that
+# need these as a dict (kwargs, API payloads, debug output) use this view —
+# e.g. dict(BOT_DEFAULTS) or **BOT_DEFAULTS — instead of rebuilding a dict per
+# request. Edit the constants above, not this.
+BOT_DEFAULTS = MappingProxyType({
+    "top_k":                BOT_DEFAULT_TOP_K,
+    "similarity_threshold": BOT_SIMILARITY_THRESHOLD,
+    "history_limit":        BOT_LAST_CONVERSATION_MESSAGES_LIMIT,
+    "thread_max":           BOT_THREAD_MAX_LENGTH,
+    "thread_min":           BOT_THREAD_MIN_LENGTH,
+})
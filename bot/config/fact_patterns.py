@@ -10,161 +10,229 @@ Two groups:
                    user answers into separate atomic fact records.
 
 How to extend:
-  - Add a new KEY_MAPPINGS entry: (list_of_phrases, "fact_key_string")
+  - Add a new KEY_MAPPINGS entry: (frozenset_of_phrases, "fact_key_string")
   - Add a new FACT_PATTERNS entry:
       (topic_keywords_in_question, answer_signal_keywords, "{deal_name}" template)
   - Keep question templates natural and specific — they become the stored
     question used for future vector similarity searches.
 """
 
+# Python Packages
+import sys
+
+# Config
+from .matchers import PhraseScanner, compile_ranked_phrases
+
+
 # ── Fact Key Mappings ──────────────────────────────────────────────────────────
 # Maps question phrase substrings → canonical snake_case fact_key.
 # First match wins. Used by _derive_fact_key() when no FACT_PATTERN fires.
 #
-# Format: (list_of_trigger_phrases, "fact_key_string")
-KEY_MAPPINGS = [
+# Format: (frozenset_of_trigger_phrases, "fact_key_string")
+KEY_MAPPINGS = (
     (
-        ["price per share", "share price", "stock price", "per share",
-         "price of share", "current price", "cost per share"],
+        frozenset({"price per share", "share price", "stock price", "per share",
+                   "price of share", "current price", "cost per share"}),
         "share_price"
     ),
     (
-        ["minimum ticket", "min ticket", "check size", "minimum check",
-         "minimum investment", "min check"],
+        frozenset({"minimum ticket", "min ticket", "check size", "minimum check",
+                   "minimum investment", "min check"}),
         "minimum_ticket"
     ),
     (
-        ["payment date", "wire date", "payment deadline", "payment schedule"],
+        frozenset({"payment date", "wire date", "payment deadline", "payment schedule"}),
         "payment_dates"
     ),
     (
-        ["management fee", "carry", "carried interest"],
+        frozenset({"management fee", "carry", "carried interest"}),
         "fees_and_carry"
     ),
     (
-        ["lock-up", "lockup", "lock up", "holding period"],
+        frozenset({"lock-up", "lockup", "lock up", "holding period"}),
         "lockup_period"
     ),
     (
-        ["closing date", "close date", "final close"],
+        frozenset({"closing date", "close date", "final close"}),
         "closing_date"
     ),
     (
-        ["valuation", "company value", "pre-money", "post-money"],
+        frozenset({"valuation", "company value", "pre-money", "post-money"}),
         "valuation"
     ),
     (
-        ["irr", "internal rate of return"],
+        frozenset({"irr", "internal rate of return"}),
         "irr"
     ),
     (
-        ["allocation", "available allocation"],
+        frozenset({"allocation", "available allocation"}),
         "allocation"
     ),
     (
-        ["distribution", "distribution schedule"],
+        frozenset({"distribution", "distribution schedule"}),
         "distributions"
     ),
     (
-        ["return", "expected return", "target return"],
+        frozenset({"return", "expected return", "target return"}),
         "expected_return"
     ),
     (
-        ["fee", "fees"],
+        frozenset({"fee", "fees"}),
         "fees"
     ),
     (
-        ["structure", "investment structure"],
+        frozenset({"structure", "investment structure"}),
         "deal_structure"
     ),
-]
+)
 
 # ── Atomic Fact Patterns ───────────────────────────────────────────────────────
 # Each entry is a 3-tuple:
 #   (topic_keywords, answer_signals, question_template)
 #
-# topic_keywords   : if ANY appear in the investor's question → this topic is relevant
-# answer_signals   : phrases in the user's answer that precede the actual value
+# topic_keywords   : frozenset — if ANY appear in the investor's question → this topic is relevant
+# answer_signals   : tuple — phrases in the user's answer that precede the actual value
+#                    (ordered: the first signal found in the answer wins)
 # question_template: focused question stored in Dynamic KB; use {deal_name} placeholder
 #
 # IMPORTANT: question_template must contain {deal_name} so the service can fill it.
-FACT_PATTERNS = [
+FACT_PATTERNS = (
     (
-        ["minimum", "ticket", "check size", "min ticket", "minimum ticket",
-         "minimum check", "min check", "minimum investment"],
-        ["minimum ticket", "min ticket", "minimum check", "min check",
+        frozenset({"minimum", "ticket", "check size", "min ticket", "minimum ticket",
+                   "minimum check", "min check", "minimum investment"}),
+        ("minimum ticket", "min ticket", "minimum check", "min check",
          "minimum is", "minimum would be", "minimum:", "ticket is",
          "ticket would be", "ticket:", "check size is", "check size would be",
-         "check size:", "minimum investment"],
+         "check size:", "minimum investment"),
         "What is the minimum ticket size for {deal_name}?"
     ),
     (
-        ["payment date", "payment dates", "wire date", "wire dates",
-         "payment deadline", "when to pay", "payment schedule"],
-        ["payment date", "payment dates", "wire date", "wire by",
+        frozenset({"payment date", "payment dates", "wire date", "wire dates",
+                   "payment deadline", "when to pay", "payment schedule"}),
+        ("payment date", "payment dates", "wire date", "wire by",
          "payment is", "payment would be", "payment:", "dates would be",
-         "date would be", "dates are", "date is"],
+         "date would be", "dates are", "date is"),
         "What are the payment dates for {deal_name}?"
     ),
     (
-        ["structure", "investment structure", "deal structure",
-         "how is it structured", "investing structure"],
-        ["structure is", "structure would be", "structured as",
-         "structured through", "investment structure"],
+        frozenset({"structure", "investment structure", "deal structure",
+                   "how is it structured", "investing structure"}),
+        ("structure is", "structure would be", "structured as",
+         "structured through", "investment structure"),
         "What is the investment structure for {deal_name}?"
     ),
     (
-        ["fee", "fees", "management fee", "carry", "carried interest"],
-        ["fee is", "fees are", "management fee", "carry is",
-         "carry would be", "carried interest"],
+        frozenset({"fee", "fees", "management fee", "carry", "carried interest"}),
+        ("fee is", "fees are", "management fee", "carry is",
+         "carry would be", "carried interest"),
         "What are the fees and carry for {deal_name}?"
     ),
     (
-        ["lockup", "lock-up", "lock up", "lock period", "holding period"],
-        ["lockup is", "lock-up is", "lock up is", "lockup period",
-         "holding period", "locked for", "locked up for"],
+        frozenset({"lockup", "lock-up", "lock up", "lock period", "holding period"}),
+        ("lockup is", "lock-up is", "lock up is", "lockup period",
+         "holding period", "locked for", "locked up for"),
         "What is the lock-up period for {deal_name}?"
     ),
     (
-        ["closing date", "close date", "deadline", "final close",
-         "closing deadline"],
-        ["closing date", "close date", "deadline is", "closes on",
-         "closing on", "final close"],
+        frozenset({"closing date", "close date", "deadline", "final close",
+                   "closing deadline"}),
+        ("closing date", "close date", "deadline is", "closes on",
+         "closing on", "final close"),
         "What is the closing date for {deal_name}?"
     ),
     (
-        ["valuation", "pre-money", "post-money", "company valuation"],
-        ["valuation is", "valued at", "valuation:", "pre-money", "post-money"],
+        frozenset({"valuation", "pre-money", "post-money", "company valuation"}),
+        ("valuation is", "valued at", "valuation:", "pre-money", "post-money"),
         "What is the valuation of {deal_name}?"
     ),
     (
-        ["price per share", "share price", "stock price", "per share",
-         "price of share", "share cost", "price now", "current price",
-         "cost per share"],
-        ["share price is", "share price:", "price per share is",
+        frozenset({"price per share", "share price", "stock price", "per share",
+                   "price of share", "share cost", "price now", "current price",
+                   "cost per share"}),
+        ("share price is", "share price:", "price per share is",
          "price per share:", "price is", "price would be", "priced at",
-         "currently priced", "trading at", "cost is", "price now"],
+         "currently priced", "trading at", "cost is", "price now"),
         "What is the current share price for {deal_name}?"
     ),
     (
-        ["allocation", "how much is available", "available allocation",
-         "total allocation", "remaining allocation"],
-        ["allocation is", "allocation:", "available allocation",
-         "total allocation", "we have", "remaining is"],
+        frozenset({"allocation", "how much is available", "available allocation",
+                   "total allocation", "remaining allocation"}),
+        ("allocation is", "allocation:", "available allocation",
+         "total allocation", "we have", "remaining is"),
         "What is the available allocation for {deal_name}?"
     ),
     (
-        ["return", "irr", "multiple", "expected return", "target return",
-         "projected return"],
-        ["return is", "irr is", "expected return", "target return",
-         "projected return", "multiple is", "multiple would be"],
+        frozenset({"return", "irr", "multiple", "expected return", "target return",
+                   "projected return"}),
+        ("return is", "irr is", "expected return", "target return",
+         "projected return", "multiple is", "multiple would be"),
         "What is the expected return or IRR for {deal_name}?"
     ),
     (
-        ["distribution", "distributions", "distribution schedule",
-         "when are distributions", "distribution frequency"],
-        ["distribution is", "distributions are", "distributed",
-         "distribution schedule", "distributions would be"],
+        frozenset({"distribution", "distributions", "distribution schedule",
+                   "when are distributions", "distribution frequency"}),
+        ("distribution is", "distributions are", "distributed",
+         "distribution schedule", "distributions would be"),
         "What is the distribution schedule for {deal_name}?"
     ),
-]
+)
+
+# ── Canonical Phrase Table (derived) ───────────────────────────────────────────
+# Every phrase in KEY_MAPPINGS and FACT_PATTERNS, normalised (lowercased,
+# stripped) and interned once. All derived tables below reference these shared
+# objects, so a phrase listed in several places ("minimum ticket", "carried
+# interest", "pre-money", …) exists — and is hashed — exactly once.
+PHRASES = {}
+
+
+def _canonical(phrase: str) -> str:
+    """ Return the shared canonical string object for *phrase*. """
+    key = phrase.lower().strip()
+    return PHRASES.setdefault(key, sys.intern(key))
+
+
+# ── Fact Key Lookup (derived) ──────────────────────────────────────────────────
+# KEY_MAPPINGS flattened once into trigger phrase → (group_rank, fact_key).
+# A phrase listed in several groups keeps its earliest group, and the lowest
+# rank among all hits wins — identical to the top-to-bottom "first match wins"
+# scan. KEY_TRIGGER_MATCHER finds every trigger in a question in one pass.
+# Derived from KEY_MAPPINGS — edit that, not these.
+TRIGGER_TO_KEY = {}
+for _rank, (_phrases, _fact_key) in enumerate(KEY_MAPPINGS):
+    for _phrase in _phrases:
+        TRIGGER_TO_KEY.setdefault(_canonical(_phrase), (_rank, sys.intern(_fact_key)))
+
+KEY_TRIGGER_MATCHER = compile_ranked_phrases(
+    {phrase: rank for phrase, (rank, _) in TRIGGER_TO_KEY.items()}
+)
+
+del _rank, _phrases, _fact_key, _phrase
+
+# ── Normalised Fact Patterns (derived) ─────────────────────────────────────────
+# FACT_PATTERNS with every phrase replaced by its canonical form, as tuples
+# (signal order preserved). _extract_atomic_facts() iterates this, so
+# no runtime path lowercases a constant. Derived from FACT_PATTERNS — edit
+# that, not this.
+FACT_PATTERNS_LC = tuple(
+    (
+        tuple(_canonical(kw) for kw in topic_keywords),
+        tuple(_canonical(signal) for signal in answer_signals),
+        question_template
+    )
+    for topic_keywords, answer_signals, question_template in FACT_PATTERNS
+)
+
+# ── Fact Pattern Scanners (derived) ────────────────────────────────────────────
+# Each scanner maps phrase → ids of the FACT_PATTERNS_LC entries that list it.
+# One scan of the question yields every relevant topic; one scan of the answer
+# yields every entry with an answer signal present — instead of one scan per
+# entry. _extract_atomic_facts() only visits entries present in both sets.
+FACT_TOPIC_SCANNER = PhraseScanner({
+    kw: [i for i, (topics, _, _) in enumerate(FACT_PATTERNS_LC) if kw in topics]
+    for topics, _, _ in FACT_PATTERNS_LC for kw in topics
+})
+
+FACT_SIGNAL_SCANNER = PhraseScanner({
+    signal: [i for i, (_, signals, _) in enumerate(FACT_PATTERNS_LC) if signal in signals]
+    for _, signals, _ in FACT_PATTERNS_LC for signal in signals
+})
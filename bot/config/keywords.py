@@ -9,13 +9,38 @@ How to extend:
   - Add new greeting phrases to GREETING_PATTERNS / GREETING_STARTERS
   - Add new missing-info signals to MISSING_INFO_SIGNALS
   - Add company names for query enhancement to COMPANY_NAMES
+
+Containers:
+  Every container is Final and built from interned strings.
+  Membership-only lists are frozensets (O(1) `in`, immutable at runtime).
+  Prefix lists consumed by str.startswith() are tuples, since startswith
+  accepts a tuple directly and scans it in C. Ordered signal lists are tuples.
+  Every phrase is lowercase — services match against lowercased text, and
+  the precompiled matchers lowercase phrases again when they are built.
 """
 
+# Python Packages
+import re
+import sys
+from typing import Final
+
+# Config
+from .matchers import compile_phrases, compile_words
+
+
+# ── Interning ──────────────────────────────────────────────────────────────────
+# Multi-word / punctuated phrases are not interned by the compiler. Every
+# phrase container below is built through sys.intern(), so each phrase is a
+# single shared object — across these lists and with fact_patterns.py — and
+# equal-key lookups on interned strings resolve by identity.
+_intern = sys.intern
+
+
 # ── Deal-Specific Keywords ─────────────────────────────────────────────────────
 # Questions containing these words REQUIRE a known deal_id before answering.
 # Without a deal context, we must ask "which deal?" first — otherwise the LLM
 # may hallucinate specific numbers for the wrong deal.
-DEAL_SPECIFIC_KEYWORDS = [
+DEAL_SPECIFIC_KEYWORDS: Final[frozenset[str]] = frozenset(map(_intern, {
     "structure", "minimum", "ticket", "fee", "fees", "carry",
     "management fee", "payment", "close", "closing", "timeline",
     "valuation", "revenue", "ipo", "lock", "lock-up", "lock up",
@@ -26,22 +51,22 @@ DEAL_SPECIFIC_KEYWORDS = [
     "when", "deadline", "date", "dates", "schedule",
     "documents", "sign", "dropbox", "wiring", "wire",
     "ebitda", "arr", "growth", "customers",
-]
+}))
 
 # ── General / ODP-Level Keywords ──────────────────────────────────────────────
 # Questions about ODP in general — no deal context required to answer these.
-GENERAL_KEYWORDS = [
+GENERAL_KEYWORDS: Final[frozenset[str]] = frozenset(map(_intern, {
     "hello", "hi", "hey", "how are you",
     "what can you", "what do you", "who are you",
     "what is odp", "open doors", "what deals", "which deals",
     "what opportunities", "what investment", "what do you offer",
     "tell me about", "available deals", "current deals",
-]
+}))
 
 # ── Missing Info Signals ───────────────────────────────────────────────────────
 # Phrases that indicate the LLM could NOT confirm a fact from the KB.
 # If the LLM answer contains any of these → trigger Tier 3 (ask the team).
-MISSING_INFO_SIGNALS = [
+MISSING_INFO_SIGNALS: Final[tuple[str, ...]] = tuple(map(_intern, (
     "we don't have",
     "we do not have",
     "not in our knowledge base",
@@ -55,22 +80,22 @@ MISSING_INFO_SIGNALS = [
     "not present in our documents",
     "i don't have",
     "i do not have",
-]
+)))
 
 # ── Question Starters ──────────────────────────────────────────────────────────
 # If a user message starts with any of these, treat it as a NEW question —
 # NOT as a supplied answer to a pending needs_info request.
 # This guards Step 7 from swallowing real questions as answers.
-QUESTION_STARTERS = [
+QUESTION_STARTERS: Final[tuple[str, ...]] = tuple(map(_intern, (
     "what", "when", "where", "which", "who", "why", "how",
     "can you", "could you", "do you", "is there", "are there",
     "tell me", "please tell", "please provide", "please share",
     "can we", "would you",
-]
+)))
 
 # ── Greeting Detection ─────────────────────────────────────────────────────────
 # Exact-match phrases that are unambiguously greetings/social messages.
-GREETING_PATTERNS = {
+GREETING_PATTERNS: Final[frozenset[str]] = frozenset(map(_intern, {
     "hello", "hi", "hey", "hiya", "howdy",
     "good morning", "good afternoon", "good evening", "good day",
     "how are you", "how r u", "what's up", "whats up", "sup",
@@ -78,30 +103,30 @@ GREETING_PATTERNS = {
     "bye", "goodbye", "see you", "talk later",
     "ok", "okay", "alright", "got it", "noted",
     "yes", "no", "sure", "great", "perfect", "sounds good",
-}
+}))
 
 # First words of a message that suggest it might be a greeting.
 # If a message starts with one of these, we inspect further before deciding.
-GREETING_STARTERS = {
+GREETING_STARTERS: Final[frozenset[str]] = frozenset(map(_intern, {
     "hello", "hi", "hey", "hiya", "howdy", "good",
     "thanks", "thank", "bye", "goodbye", "ok", "okay", "alright",
-}
+}))
 
 # Words that carry NO business intent — pure social filler.
 # After stripping these from a greeting-starter message, if nothing
 # meaningful remains → treat as greeting.
-SOCIAL_FILLER_WORDS = {
+SOCIAL_FILLER_WORDS: Final[frozenset[str]] = frozenset(map(_intern, {
     "hello", "hi", "hey", "hiya", "howdy", "good", "morning",
     "afternoon", "evening", "day", "how", "are", "you", "doing",
     "i", "am", "we", "bot", "there", "mate", "sir", "team",
     "thanks", "thank", "cheers", "bye", "goodbye", "ok", "okay",
     "alright", "sure", "great", "perfect", "noted", "got", "it",
     "very", "well", "fine", "nice", "sup", "whats", "up",
-}
+}))
 
 # Words that confirm BUSINESS intent — if any remain after filtering filler,
 # the message is NOT a greeting (e.g. "Hi, what is the fee?" → "fee" is here).
-BUSINESS_KEYWORDS = {
+BUSINESS_KEYWORDS: Final[frozenset[str]] = frozenset(map(_intern, {
     "minimum", "ticket", "investment", "deal", "structure",
     "payment", "date", "fee", "fees", "carry", "valuation",
     "return", "returns", "fund", "close", "closing", "allocation",
@@ -114,42 +139,154 @@ BUSINESS_KEYWORDS = {
     "can you", "could you", "please", "tell me", "explain",
     "do you have", "is there", "are there", "how much", "how many",
     "how long", "how do",
-}
+}))
+
+# Hedge words that add nothing to a question — dropped by
+# QueryHelper.compress_question() before the question reaches the LLM.
+HEDGE_WORDS: Final[frozenset[str]] = frozenset(map(_intern, {
+    "kindly", "basically", "literally",
+}))
 
 # Maximum word count for a greeting-starter message before we stop treating
 # it as a greeting (e.g. a 10-word message starting with "Hi" is probably real).
-GREETING_MAX_WORD_COUNT = 8
+GREETING_MAX_WORD_COUNT: Final[int] = 8
 
 # ── Fact Extractor — Pre-screen Greetings ─────────────────────────────────────
 # Messages that START with any of these AND are shorter than 30 characters
 # are skipped by FactExtractorService without calling the LLM.
 # Keeps the pre-screen fast and free of LLM cost for obvious non-facts.
-FACT_EXTRACTOR_SKIP_STARTERS = (
+FACT_EXTRACTOR_SKIP_STARTERS: Final[tuple[str, ...]] = tuple(map(_intern, (
     "hello", "hi ", "hey", "thanks", "thank you",
     "ok", "okay", "great", "sounds good", "noted",
-)
+)))
 
 # ── Query Enhancement — Vague Words ───────────────────────────────────────────
-# If a question contains any of these, it likely needs context to be understood.
+# If a question contains any of these (as whole words), it likely needs context
+# to be understood.
 # Triggers the query rewriter to resolve pronouns / vague references.
-VAGUE_WORDS = [
-    "it", "that", "this", "these", "those",
+VAGUE_WORDS: Final[frozenset[str]] = frozenset(map(_intern, {
+    "it", "its", "that", "this", "these", "those",
     "they", "their", "them",
     "the company", "the deal", "the investment",
     "same", "also", "too",
-]
+}))
 
 # Short questions mentioning only a metric (with no company name) also need
 # rewriting — e.g. "revenue?" → "What is the revenue of SpaceX?"
-METRIC_ONLY_PATTERNS = [
+METRIC_ONLY_PATTERNS: Final[frozenset[str]] = frozenset(map(_intern, {
     "revenue", "valuation", "profit", "growth",
     "ebitda", "customers", "users", "employees",
-]
+}))
 
 # ── Company Names (for Query Enhancement) ─────────────────────────────────────
 # Used to detect whether a short question already names a company.
 # If a short question has NO company name → likely needs rewriting.
 # Expand this list as new deals are added (or replace with a DB lookup).
-COMPANY_NAMES = [
+COMPANY_NAMES: Final[frozenset[str]] = frozenset(map(_intern, {
     "spacex", "anthropic", "tesla", "openai", "google", "amazon",
-]
+}))
+
+# ── Greeting Lookup Tables ─────────────────────────────────────────────────────
+# Derived — edit GREETING_PATTERNS / GREETING_STARTERS above, not these.
+#
+# GREETING_PUNCTUATION_RE: the normaliser is_greeting() applies to messages —
+#   punctuation → space, then whitespace collapsed. The patterns are run through
+#   the SAME normaliser here, so "what's up" / "thank you!" match as intended.
+# GREETING_FIRST_TOKENS: every token a greeting can start with. A message whose
+#   first word is not in it can be rejected with a single set probe.
+# GREETING_BY_LEN: normalised patterns bucketed by length — most messages are
+#   longer than any greeting, so the exact-match check is one small-int lookup.
+GREETING_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
+GREETING_PATTERNS_NORMALISED = frozenset(
+    _intern(" ".join(GREETING_PUNCTUATION_RE.sub(" ", pattern).split()))
+    for pattern in GREETING_PATTERNS
+)
+
+GREETING_FIRST_TOKENS = frozenset(
+    pattern.split()[0] for pattern in GREETING_PATTERNS_NORMALISED
+) | GREETING_STARTERS
+
+GREETING_BY_LEN = {}
+for _greeting in GREETING_PATTERNS_NORMALISED:
+    GREETING_BY_LEN.setdefault(len(_greeting), set()).add(_greeting)
+GREETING_BY_LEN = {length: frozenset(bucket) for length, bucket in GREETING_BY_LEN.items()}
+del _greeting
+
+# ── Canned Greeting Replies ────────────────────────────────────────────────────
+# Greetings answered from prompts.GREETING_CANNED_REPLIES with no LLM call,
+# grouped by reply category. A greeting not listed here ("yes", "hi bot, all
+# good?") still gets a generated reply.
+GREETING_REPLY_PHRASES: Final[dict[str, frozenset[str]]] = {
+    "hello": frozenset({
+        "hello", "hi", "hey", "hiya", "howdy", "hello there", "hi there", "hey there",
+        "good morning", "good afternoon", "good evening", "good day",
+    }),
+    "how_are_you": frozenset({"how are you", "how r u", "what's up", "whats up", "sup"}),
+    "thanks":      frozenset({"thanks", "thank you", "thank you!", "thanks!", "cheers"}),
+    "bye":         frozenset({"bye", "goodbye", "see you", "talk later"}),
+    "ack":         frozenset({
+        "ok", "okay", "alright", "got it", "noted", "sure", "great", "perfect", "sounds good",
+    }),
+}
+
+# Derived — normalised phrase → category, through the is_greeting() normaliser.
+GREETING_REPLY_CATEGORY: Final[dict[str, str]] = {
+    _intern(" ".join(GREETING_PUNCTUATION_RE.sub(" ", phrase).split())): category
+    for category, phrases in GREETING_REPLY_PHRASES.items()
+    for phrase in phrases
+}
+
+# ── Query Enhancement — Rule-based Rewrites ───────────────────────────────────
+# VAGUE_WORDS that can only mean "the company under discussion". When one of
+# these is the ONLY vague reference in a follow-up, QueryEnhancementService
+# substitutes the company named most recently in the conversation instead of
+# calling the LLM rewriter; ENTITY_POSSESSIVES become "<company>'s". Anything
+# else vague still goes to the LLM — including a bare "it", which is often a
+# dummy subject ("Is it possible to…") rather than the company.
+ENTITY_REFERENCES: Final[frozenset[str]] = frozenset(map(_intern, {
+    "the company", "the deal", "the investment",
+}))
+
+ENTITY_POSSESSIVES: Final[frozenset[str]] = frozenset(map(_intern, {
+    "its", "their",
+}))
+
+# ── Answer Length Tier ─────────────────────────────────────────────────────────
+# A short question that starts with one of SHORT_FACT_STARTERS and has no
+# LONG_FORM_KEYWORDS asks for a single fact ("What is the minimum ticket?"),
+# so its answer is generated with the smaller llm_config.SHORT_ANSWER budget.
+# A question with LONG_FORM_KEYWORDS, or longer than MEDIUM_ANSWER_MAX_WORD_COUNT,
+# keeps the full llm_config.ANSWER budget; anything else gets MEDIUM_ANSWER.
+SHORT_FACT_STARTERS: Final[tuple[str, ...]] = tuple(map(_intern, (
+    "what is", "what's", "what are", "how much", "how many",
+    "when", "who", "which", "is there", "are there", "is it", "does it",
+)))
+
+LONG_FORM_KEYWORDS: Final[frozenset[str]] = frozenset(map(_intern, {
+    "explain", "describe", "compare", "comparison", "difference", "list",
+    "all", "details", "detailed", "summary", "summarize", "summarise",
+    "overview", "breakdown", "why", "walk me", "pros", "cons", "risks",
+    "structure", "process", "and",
+}))
+
+SHORT_FACT_MAX_WORD_COUNT: Final[int]    = 10
+MEDIUM_ANSWER_MAX_WORD_COUNT: Final[int] = 20
+
+# ── Precompiled Matchers ───────────────────────────────────────────────────────
+# Built once from the lists above (see matchers.py) — edit the lists, not these.
+# Services call .search() on the lowercased text instead of looping the lists.
+DEAL_SPECIFIC_MATCHER = compile_phrases(DEAL_SPECIFIC_KEYWORDS)
+GENERAL_MATCHER       = compile_phrases(GENERAL_KEYWORDS)
+MISSING_INFO_MATCHER  = compile_phrases(MISSING_INFO_SIGNALS)
+COMPANY_NAME_MATCHER  = compile_phrases(COMPANY_NAMES)
+
+# Whole-word matchers — a substring hit would be wrong here
+# ("it" inside "with"/"equity", "revenue" inside "prerevenue").
+VAGUE_WORD_MATCHER    = compile_words(VAGUE_WORDS)
+METRIC_WORD_MATCHER   = compile_words(METRIC_ONLY_PATTERNS)
+LONG_FORM_MATCHER     = compile_words(LONG_FORM_KEYWORDS)
+
+# BUSINESS_KEYWORDS holds multi-word phrases ("how much", "is there") that a
+# token-set check can never see, so is_greeting() scans the normalised text.
+BUSINESS_MATCHER      = compile_words(BUSINESS_KEYWORDS)
@@ -13,47 +13,68 @@ To improve output quality:
   - Lower temperature  → more predictable, less variation
   - Raise max_tokens   → longer responses allowed
   - Lower max_tokens   → forces concise output
+
+Each call type is one frozen LLMCallCfg(temperature, max_tokens) instance,
+read at the call site as e.g. llm_config.ANSWER.temperature.
 """
 
+# Python Packages
+from dataclasses import dataclass
+
+
+
+
+
+@dataclass(frozen = True, slots = True)
+class LLMCallCfg:
+    """ Sampling settings for one LLM call type. """
+    temperature: float
+    max_tokens:  int
+
+
+
 # ── Greeting Reply ─────────────────────────────────────────────────────────────
 # Warm, 1–2 sentence social reply. Slightly creative but still consistent.
-LLM_GREETING_TEMPERATURE = 0.5
-LLM_GREETING_MAX_TOKENS  = 80
+GREETING = LLMCallCfg(temperature = 0.5, max_tokens = 80)
 
 # ── Standard RAG Answer ────────────────────────────────────────────────────────
 # Fact-focused Q&A. Low temperature = accurate, no hallucination.
-LLM_ANSWER_TEMPERATURE = 0.2
-LLM_ANSWER_MAX_TOKENS  = 900
+ANSWER = LLMCallCfg(temperature = 0.2, max_tokens = 900)
+
+# ── Short Fact Answer ──────────────────────────────────────────────────────────
+# Same as ANSWER, for single-fact questions (see keywords.SHORT_FACT_STARTERS).
+# A smaller cap trims rambling replies and the tail latency that comes with them.
+SHORT_ANSWER = LLMCallCfg(temperature = 0.2, max_tokens = 250)
+
+# ── Medium Answer ──────────────────────────────────────────────────────────────
+# Same as ANSWER, for questions that are neither a single fact nor long-form
+# (no keywords.LONG_FORM_KEYWORDS, at most MEDIUM_ANSWER_MAX_WORD_COUNT words).
+MEDIUM_ANSWER = LLMCallCfg(temperature = 0.2, max_tokens = 500)
 
 # ── Info Request (ask team for gaps) ──────────────────────────────────────────
 # Precise numbered list of ONLY missing items. Very deterministic.
-LLM_INFO_REQUEST_TEMPERATURE = 0.2
-LLM_INFO_REQUEST_MAX_TOKENS  = 400
+INFO_REQUEST = LLMCallCfg(temperature = 0.2, max_tokens = 400)
 
 # ── Draft Email ────────────────────────────────────────────────────────────────
 # Full email body. Slightly creative for natural writing flow.
-LLM_DRAFT_TEMPERATURE = 0.3
-LLM_DRAFT_MAX_TOKENS  = 1200
+DRAFT = LLMCallCfg(temperature = 0.3, max_tokens = 1200)
 
 # ── Clarifying Question ────────────────────────────────────────────────────────
 # Single warm question. Conversational tone, short.
-LLM_CLARIFICATION_TEMPERATURE = 0.5
-LLM_CLARIFICATION_MAX_TOKENS  = 80
+CLARIFICATION = LLMCallCfg(temperature = 0.5, max_tokens = 80)
 
 # ── Query Rewriter ─────────────────────────────────────────────────────────────
 # Resolves pronouns & vague follow-ups. Near-zero creativity — just clarity.
-# Max tokens is generous because user questions can be up to 1000 words.
-LLM_QUERY_REWRITER_TEMPERATURE = 0.1
-LLM_QUERY_REWRITER_MAX_TOKENS  = 1500
+# max_tokens bounds the OUTPUT only — a single rewritten question — so it stays
+# small regardless of how long the input question or history is.
+QUERY_REWRITER = LLMCallCfg(temperature = 0.1, max_tokens = 128)
 
 # ── Fact Extractor ─────────────────────────────────────────────────────────────
 # Extracts structured JSON facts from team messages. Must be deterministic.
-LLM_FACT_EXTRACTOR_TEMPERATURE = 0.0
-LLM_FACT_EXTRACTOR_MAX_TOKENS  = 100
+FACT_EXTRACTOR = LLMCallCfg(temperature = 0.0, max_tokens = 100)
 
 # ── Thread Parser ───────────────────────────────────────────────────────────────
 # Parses raw email thread into structured JSON.
 # Temperature 0 = fully deterministic JSON extraction, no creativity needed.
 # Max tokens is generous — threads can be long and the JSON output is detailed.
-LLM_THREAD_PARSER_TEMPERATURE = 0.0
-LLM_THREAD_PARSER_MAX_TOKENS  = 800
+THREAD_PARSER = LLMCallCfg(temperature = 0.0, max_tokens = 800)
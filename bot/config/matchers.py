@@ -0,0 +1,120 @@
+"""
+matchers.py — Precompiled Phrase Matchers
+==========================================
+Turns the phrase lists in keywords.py / fact_patterns.py into compiled
+regular expressions once, at import time.
+
+A single alternation pattern scans a message in one C-level pass instead
+of running one Python-level `phrase in text` check per phrase. Matching
+keeps plain substring semantics (no word boundaries), so the compiled
+pattern finds a hit exactly when the old `any(p in text for p in phrases)`
+loop did.
+
+Phrases are lowercased when compiled, so callers only need to lowercase
+the text being scanned — never the constants.
+
+The longest-first phrase sets are compiled as a character trie rather than a
+flat list of alternatives ("fee|fees|few" → "fe(?:e(?:s)?|w)"). At each text
+position the engine then follows a single path — one branch per distinct
+next character — instead of trying every phrase in turn, which is the same
+idea as an Aho–Corasick automaton expressed in the C regex engine. Greedy
+optional groups keep the longest phrase as the reported match, so results
+are identical to the flat longest-first alternation.
+
+Edit the phrase lists in their own config files — never the patterns.
+"""
+
+# Python Packages
+import re
+import sys
+from typing import FrozenSet, Iterable, Mapping, Pattern
+
+
+def trie_pattern(phrases: Iterable[str]) -> str:
+    """
+    Regex source matching any of *phrases*, factored into a character trie.
+
+    At every position the longest matching phrase is preferred (greedy
+    optional groups), exactly like a longest-first flat alternation.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}   # end-of-phrase marker
+
+    def build(node) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+
+def compile_phrases(phrases: Iterable[str]) -> Pattern:
+    """
+    Compile *phrases* into one trie-factored regex.
+
+    Longer phrases win, so the reported match is the most specific one
+    (e.g. "management fee" before "fee").
+    """
+    return re.compile(trie_pattern({p.lower() for p in phrases}))
+
+
+
+def compile_words(phrases: Iterable[str]) -> Pattern:
+    """
+    Like compile_phrases(), but each phrase must match as whole words
+    ("it" matches "is it live?" — not "with" or "its").
+    """
+    return re.compile(r"\b(?:" + trie_pattern({p.lower() for p in phrases}) + r")\b")
+
+
+
+def compile_ranked_phrases(ranked: Mapping[str, int]) -> Pattern:
+    """
+    Compile a phrase → rank mapping into a zero-width lookahead alternation.
+
+    finditer() then reports one hit per start position (overlaps included),
+    and at each position the lowest-ranked phrase is the one captured in
+    group(1) — so the minimum rank over all hits equals the rank of the
+    first list entry that a plain top-to-bottom scan would have matched.
+    """
+    ordered = sorted(ranked, key=lambda p: (ranked[p], -len(p), p))
+    return re.compile("(?=(" + "|".join(re.escape(p) for p in ordered) + "))")
+
+
+
+class PhraseScanner:
+    """
+    Multi-pattern scanner: one pass over the text returns the ids of every
+    phrase group that has at least one phrase in it.
+
+    Built from phrase → ids. Uses an overlapping lookahead over the phrase
+    trie (longest first), so each start position reports its longest phrase;
+    every shorter phrase matching at that same position is a prefix of it,
+    so each phrase's id set is pre-merged with the ids of its prefixes.
+    """
+
+    __slots__ = ("pattern", "index")
+
+    def __init__(self, phrase_ids: Mapping[str, Iterable[int]]):
+        merged = {}
+        for phrase, ids in phrase_ids.items():
+            merged.setdefault(sys.intern(phrase.lower()), set()).update(ids)
+
+        self.index = {
+            phrase: frozenset().union(*(ids for other, ids in merged.items() if phrase.startswith(other)))
+            for phrase in merged
+        }
+        self.pattern = re.compile("(?=(" + trie_pattern(self.index) + "))")
+
+
+    def scan(self, text: str) -> FrozenSet[int]:
+        """ Return the ids of every group with a phrase in *text* (already lowercased). """
+        index = self.index
+        return frozenset().union(*(index[m.group(1)] for m in self.pattern.finditer(text)))
@@ -11,17 +11,22 @@ Sections
 --------
 1.  Query Rewriter           — resolves vague follow-up questions
 2.  Tone Consistency Block   — injected into EVERY prompt; enforces stable tone
-3.  Greeting Reply           — warm social responses
+3.  Greeting Reply           — warm social responses (+ canned replies)
 4.  Answer Mode              — RAG Q&A (main answer flow)
-5.  Info Request Mode        — ask team ONLY for missing gaps
+5.  Info Request Mode        — ask team ONLY for missing gaps (+ user-turn template)
 6.  Draft Email Mode         — compose investor reply email
 7.  System Prompt Template   — base wrapper used by all answer modes
 8.  Clarification            — "which deal?" questions
 9.  Answer Prompt Sections   — labelled blocks injected into user turn
 10. Draft Prompt Sections    — labelled blocks injected into draft user turn
-11. Info Request User Prompt — user-turn template for gap-asking
-12. Fact Extractor           — extract structured facts from team messages
-13. Default Tone Fallback    — used when no tone rules exist in the DB
+11. Fact Extractor           — extract structured facts from team messages (+ output schema)
+12. Default Tone Fallback    — used when no tone rules exist in the DB
+13. Thread Parser            — split a pasted email thread into its parts
+14. Thread Context Block     — parsed-thread summary injected into the prompt
+15. Precompiled Renderers    — *_RENDER callables for every .format() template
+16. Cached Prompt Builders   — PromptMode + memoised system prompts per (mode, tone)
+17. Static Token Counts      — cl100k token counts of the static system prompts
+18. Prompt Size Budgets      — import fails if a static prompt outgrows its budget
 
 TONE DESIGN PRINCIPLE
 ----------------------
@@ -31,11 +36,22 @@ TONE_CONSISTENCY_BLOCK (Section 2) is the enforcement layer: it explicitly
 instructs the LLM to hold tone stable, avoid drift, and adapt gradually to
 match the communication style visible in the conversation history.
 
-Order matters: TONE rules are ALWAYS declared BEFORE task instructions so
-the LLM treats tone as a constraint that task instructions must work within,
-not the other way around.
+Order matters, for two reasons:
+  - Prompt caching: providers cache the longest byte-identical PREFIX of a
+    prompt. Everything static (identity, task instructions, tone enforcement)
+    comes first; the per-request tone rules from the DB come LAST, so an edit
+    to tone rules never invalidates the cached static prefix.
+  - Precedence: the tone enforcement block explicitly tells the LLM that the
+    tone rules below it are a hard constraint that task instructions must
+    work within, not the other way around.
 """
 
+# Python Packages
+from enum import IntEnum
+from functools import lru_cache
+from string import Formatter
+from typing import Final
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 # 1. Query Rewriter
@@ -43,7 +59,7 @@ not the other way around.
 # Used by QueryEnhancementService to resolve pronouns and vague follow-ups.
 # e.g. "What about revenue?" → "What is the revenue of SpaceX?"
 
-QUERY_REWRITER_SYSTEM_PROMPT = """\
+QUERY_REWRITER_SYSTEM_PROMPT: Final[str] = """\
 You are a query rewriter that makes vague follow-up questions standalone and clear.
 
 RULES:
@@ -75,7 +91,7 @@ Examples:
 IMPORTANT: Extract the company/entity from the MOST RECENT assistant message.\
 """
 
-QUERY_REWRITER_USER_TEMPLATE = """\
+QUERY_REWRITER_USER_TEMPLATE: Final[str] = """\
 Conversation History:
 {history_text}
 
@@ -88,21 +104,21 @@ Rewritten Question:\
 # ══════════════════════════════════════════════════════════════════════════════
 # 2. Tone Consistency Block
 # ══════════════════════════════════════════════════════════════════════════════
-# Injected into EVERY system prompt immediately after the tone rules section.
+# Injected into EVERY system prompt immediately before the tone rules section.
 # This is the enforcement layer for all three tone requirements:
 #   (a) Consistent tone across responses
 #   (b) No random tone variation
 #   (c) Progressive adaptation based on historical communication style
 #
-# Why it comes BEFORE task instructions: tone is a hard constraint.
-# Task instructions (answer, ask, draft) must operate WITHIN the tone,
-# not override it. Placing tone first in the prompt anchors the LLM.
+# Tone is a hard constraint: task instructions (answer, ask, draft) must
+# operate WITHIN the tone, not override it. The block says so explicitly, so
+# it can sit after the task instructions and directly before the DB tone
+# rules — keeping everything up to the tone rules byte-identical per mode.
 
-TONE_CONSISTENCY_BLOCK = """
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-TONE ENFORCEMENT — READ BEFORE ANYTHING ELSE
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-The tone rules above are NON-NEGOTIABLE. Apply them to EVERY sentence you write.
+TONE_CONSISTENCY_BLOCK: Final[str] = """
+## TONE ENFORCEMENT — OVERRIDES THE TASK INSTRUCTIONS
+The tone rules below are NON-NEGOTIABLE. Apply them to EVERY sentence you write.
+Task instructions above operate WITHIN these tone rules, never against them.
 
 (a) CONSISTENCY — Hold the same tone throughout this entire response.
     Do NOT start formal and drift casual, or start warm and drift clinical.
@@ -120,7 +136,7 @@ The tone rules above are NON-NEGOTIABLE. Apply them to EVERY sentence you write.
     not a fresh start written by a different author.
 
 SELF-CHECK before sending:
-  ✓ Does every sentence match the tone rules above?
+  ✓ Does every sentence match the tone rules below?
   ✓ Does this response sound the same as my previous messages in this conversation?
   ✓ If there are past emails in the history, does this match their style?
   ✗ If any answer is NO — rewrite until all three are YES.
@@ -133,33 +149,65 @@ SELF-CHECK before sending:
 # Used by AnswerGenerator.generate_greeting_reply()
 # Produces a warm, 1–2 sentence social response with no deal content.
 
-GREETING_SYSTEM_PROMPT = """\
+GREETING_SYSTEM_PROMPT: Final[str] = """\
 You are a helpful assistant for Open Doors Partners (ODP), a private investment firm.
 You assist the ODP team in answering investor questions.
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-TONE RULES (from database)
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{tone_section}
-{tone_consistency_block}
 TASK:
 The user sent a greeting or social message.
 Reply in a warm, brief, natural way — 1 to 2 sentences maximum.
 Hold the same tone throughout. Do NOT mention deals or investments
-unless the user brings it up. Simply greet them and signal you are ready to help.\
+unless the user brings it up. Simply greet them and signal you are ready to help.
+{tone_consistency_block}
+## TONE RULES (from database)
+{tone_section}\
 """
 
 
+# Fixed replies for the most common greetings (see keywords.GREETING_REPLY_PHRASES),
+# one picked at random per message. Kept plain and professional — they are
+# sent without the DB tone rules, so they must suit any tone.
+GREETING_CANNED_REPLIES: Final[dict[str, tuple[str, ...]]] = {
+    "hello": (
+        "Hello! How can I help you today?",
+        "Hi there! What can I help you with?",
+        "Hello! Ready when you are — what would you like to know?",
+    ),
+    "how_are_you": (
+        "Doing well, thank you! How can I help you today?",
+        "All good here, thanks for asking. What can I help you with?",
+    ),
+    "thanks": (
+        "You're welcome! Let me know if there's anything else I can help with.",
+        "Happy to help. Just ask if anything else comes up.",
+    ),
+    "bye": (
+        "Goodbye! Reach out anytime you need help.",
+        "Talk soon — I'm here whenever you need me.",
+    ),
+    "ack": (
+        "Great. Let me know if there's anything else you need.",
+        "Sounds good. I'm here if you need anything else.",
+    ),
+}
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # 4. Answer Mode Instructions
 # ══════════════════════════════════════════════════════════════════════════════
-# Injected into the system prompt when mode="answer".
+# Injected into the system prompt for PromptMode.ANSWER.
 # Tells the LLM how to prioritise context and what to do when info is missing.
+#
+# Built from three independent blocks so an edit to one (e.g. an escalation
+# threshold) leaves the others byte-identical. Escalation thresholds live in
+# ESCALATION_THRESHOLDS and are rendered into the block once, at import.
+
+ESCALATION_THRESHOLDS = {
+    "commitment_usd": 2_000_000,   # commitments above this are escalated to the team
+}
 
-ANSWER_MODE_INSTRUCTIONS = """
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-CONTEXT PRIORITY — READ CAREFULLY
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_CONTEXT_PRIORITY_BLOCK = """
+## CONTEXT PRIORITY — READ CAREFULLY
 The context below is ordered from HIGHEST to LOWEST priority:
 
   1. TEAM-SUPPLIED FACTS  — at the top, labelled "TEAM-SUPPLIED FACTS"
@@ -171,10 +219,10 @@ The context below is ordered from HIGHEST to LOWEST priority:
   2. DOCUMENT PASSAGES  — below, labelled "Document N:"
      These are from deal PDFs. Use them for any fact not covered above.
      If a fact appears in BOTH team facts AND documents, the team fact wins.
+"""
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-STRICT NO-HALLUCINATION RULE
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_NO_HALLUCINATION_BLOCK = """\
+## STRICT NO-HALLUCINATION RULE
 NEVER invent:
 - Dollar amounts (minimums, valuations, fees)
 - Dates or timelines (payment dates, closing dates)
@@ -184,22 +232,28 @@ WHEN INFORMATION IS MISSING from ALL context above:
 1. Answer only what you CAN confirm.
 2. For missing items say: "We don't have [specific detail] in our knowledge base."
 3. NEVER guess or use typical industry figures.
+"""
 
+_ESCALATION_BLOCK = """\
 ESCALATION — say "Let me flag this for our team to follow up":
-- Fee negotiation, commitments over $2M, KYC/subscription document requests
-"""
+- Fee negotiation, commitments over ${commitment_musd:g}M, KYC/subscription document requests
+""".format(commitment_musd = ESCALATION_THRESHOLDS["commitment_usd"] / 1_000_000)
+
+ANSWER_MODE_INSTRUCTIONS: Final[str] = "\n".join((
+    _CONTEXT_PRIORITY_BLOCK,
+    _NO_HALLUCINATION_BLOCK,
+    _ESCALATION_BLOCK,
+))
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 # 5. Info Request Mode Instructions (Ask for Gaps Only)
 # ══════════════════════════════════════════════════════════════════════════════
-# Injected into the system prompt when mode="ask".
+# Injected into the system prompt for PromptMode.ASK.
 # The LLM sees the partial answer it already gave and asks ONLY for what's missing.
 
-ASK_MODE_INSTRUCTIONS = """
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-YOUR TASK: REQUEST MISSING INFO (GAPS ONLY)
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+ASK_MODE_INSTRUCTIONS: Final[str] = """
+## YOUR TASK: REQUEST MISSING INFO (GAPS ONLY)
 You already gave a partial answer. Now ask ONLY for what you could NOT confirm.
 - Read the partial answer carefully first.
 - Ask ONLY about items where the answer said "we don't have",
@@ -213,7 +267,7 @@ You already gave a partial answer. Now ask ONLY for what you could NOT confirm.
 
 # User-turn template for the info request call.
 # Receives the investor's original question and the bot's partial answer.
-INFO_REQUEST_USER_PROMPT = """\
+INFO_REQUEST_USER_PROMPT: Final[str] = """\
 The investor asked:
 "{original_question}"
 
@@ -236,12 +290,10 @@ End with: "Once you share these, I will draft the reply right away."\
 # ══════════════════════════════════════════════════════════════════════════════
 # 6. Draft Email Mode Instructions
 # ══════════════════════════════════════════════════════════════════════════════
-# Injected into the system prompt when mode="draft".
+# Injected into the system prompt for PromptMode.DRAFT.
 
-DRAFT_MODE_INSTRUCTIONS = """
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-YOUR TASK: DRAFT EMAIL REPLY
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+DRAFT_MODE_INSTRUCTIONS: Final[str] = """
+## YOUR TASK: DRAFT EMAIL REPLY
 Draft a professional email reply to the investor question provided.
 Use team-supplied information, deal context, and document passages.
 
@@ -268,26 +320,23 @@ ACCURACY:
 # ══════════════════════════════════════════════════════════════════════════════
 # Wrapper used by AnswerGenerator._build_system_prompt() for all three modes.
 #
-# ORDER IS INTENTIONAL:
-#   1. Identity & role
-#   2. Tone rules (from DB)          ← declared FIRST as a hard constraint
-#   3. Tone consistency enforcement  ← reinforces and operationalises the rules
-#   4. Task instructions             ← must operate WITHIN the tone constraint
+# ORDER IS INTENTIONAL — static first, per-request last (prompt caching):
+#   1. Identity & role               ┐
+#   2. Task instructions             │ byte-identical for every request of a
+#   3. Tone consistency enforcement  ┘ mode → cached prefix at the provider
+#   4. Tone rules (from DB)          ← LAST; the block above makes them a hard
+#                                      constraint the task must work within
 #
 # {tone_section}            → from odp_tone_rules DB table
 # {tone_consistency_block}  → TONE_CONSISTENCY_BLOCK (always the same)
 # {mode_instructions}       → one of ANSWER / ASK / DRAFT mode instructions above
 
-SYSTEM_PROMPT_TEMPLATE = """\
+SYSTEM_PROMPT_TEMPLATE: Final[str] = """\
 You are an AI assistant for Open Doors Partners (ODP), a private investment firm.
 You help the ODP team respond accurately and professionally to investor questions.
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-TONE & COMPLIANCE RULES (from database)
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{tone_section}
-{tone_consistency_block}
-{mode_instructions}\
+{mode_instructions}{tone_consistency_block}
+## TONE & COMPLIANCE RULES (from database)
+{tone_section}\
 """
 
 
@@ -296,14 +345,14 @@ TONE & COMPLIANCE RULES (from database)
 # ══════════════════════════════════════════════════════════════════════════════
 # Used by ClarificationService when the bot needs to ask "which deal?"
 
-CLARIFICATION_SYSTEM_PROMPT = """\
+CLARIFICATION_SYSTEM_PROMPT: Final[str] = """\
 You are a helpful assistant for Open Doors Partners (ODP).
 Ask ONE short clarifying question in a warm, direct style.
 Our current deals are: {deals_text}.
 One sentence maximum.\
 """
 
-CLARIFICATION_USER_PROMPT = """\
+CLARIFICATION_USER_PROMPT: Final[str] = """\
 The user asked: "{question}"
 Ask which deal or what they need.\
 """
@@ -315,17 +364,17 @@ Ask which deal or what they need.\
 # Labelled section headers and fallback messages injected into the user turn
 # for the answer mode. These delimit different context blocks in the prompt.
 
-ANSWER_SECTION_DEAL        = "── DEAL INFORMATION ──"
-ANSWER_SECTION_KB          = "── KNOWLEDGE BASE (team facts first, then documents) ──"
-ANSWER_SECTION_NO_KB       = "── NO KNOWLEDGE BASE CONTEXT FOUND ──"
-ANSWER_NO_KB_MESSAGE       = """\
+ANSWER_SECTION_DEAL: Final[str]        = "### DEAL INFORMATION"
+ANSWER_SECTION_KB: Final[str]          = "### KNOWLEDGE BASE (team facts first, then documents)"
+ANSWER_SECTION_NO_KB: Final[str]       = "### NO KNOWLEDGE BASE CONTEXT FOUND"
+ANSWER_NO_KB_MESSAGE: Final[str]       = """\
 Our knowledge base returned NO information for this question.
 Do NOT answer from training knowledge.
 Say: "We don't have [specific detail] in our knowledge base."
 Ask the user to provide the specific information.\
 """
-ANSWER_FOOTER_TEMPLATE     = """\
-──────────────────────────────────────
+ANSWER_FOOTER_TEMPLATE: Final[str]     = """\
+---
 Investor Question: {question}
 
 Answer:\
@@ -337,12 +386,12 @@ Answer:\
 # ══════════════════════════════════════════════════════════════════════════════
 # Labelled section headers injected into the user turn for draft mode.
 
-DRAFT_SECTION_QUESTION     = "── INVESTOR'S QUESTION (we are replying to this) ──"
-DRAFT_SECTION_TEAM_INFO    = "── INFORMATION PROVIDED BY OUR TEAM ──"
-DRAFT_SECTION_DEAL         = "── DEAL INFORMATION ──"
-DRAFT_SECTION_KB           = "── KNOWLEDGE BASE (team facts first, then documents) ──"
-DRAFT_FOOTER               = """\
-──────────────────────────────────────
+DRAFT_SECTION_QUESTION: Final[str]     = "### INVESTOR'S QUESTION (we are replying to this)"
+DRAFT_SECTION_TEAM_INFO: Final[str]    = "### INFORMATION PROVIDED BY OUR TEAM"
+DRAFT_SECTION_DEAL: Final[str]         = "### DEAL INFORMATION"
+DRAFT_SECTION_KB: Final[str]           = "### KNOWLEDGE BASE (team facts first, then documents)"
+DRAFT_FOOTER: Final[str]               = """\
+---
 Draft the email reply using all information above.
 Follow the tone rules exactly — every sentence must match the tone.
 If prior emails are visible in the conversation history, match their style.
@@ -357,8 +406,12 @@ Draft Email:\
 # ══════════════════════════════════════════════════════════════════════════════
 # Used by FactExtractorService._extract_via_llm()
 # Extracts a structured JSON fact from a team member's chat message.
+#
+# The output shape is NOT described in the prompt — it is enforced by the
+# provider's structured-output mode using FACT_EXTRACTOR_SCHEMA below
+# (Anthropic: forced tool call, OpenAI: json_schema response_format).
 
-FACT_EXTRACTOR_SYSTEM_PROMPT = """\
+FACT_EXTRACTOR_SYSTEM_PROMPT: Final[str] = """\
 You are a fact extractor for a private investment firm.
 
 Your job: decide if a message from an internal team member contains a factual
@@ -382,16 +435,30 @@ RULES:
 - Do NOT extract questions, opinions, greetings, or vague statements.
 - fact_key must be snake_case, lowercase, descriptive.
 - fact_value must be the raw value exactly as stated by the user.
-
-Respond ONLY with valid JSON, no markdown, no explanation:
-
-If a fact is present:
-{"is_fact": true, "fact_key": "share_price", "fact_value": "~$378"}
-
-If no fact:
-{"is_fact": false}\
+- If no fact is present, set is_fact to false and leave fact_key / fact_value null.\
 """
 
+FACT_EXTRACTOR_SCHEMA_NAME: Final[str] = "record_fact"
+FACT_EXTRACTOR_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "is_fact": {
+            "type":        "boolean",
+            "description": "True only if the message states a clear deal value."
+        },
+        "fact_key": {
+            "type":        ["string", "null"],
+            "description": "snake_case key, e.g. share_price, minimum_ticket, lockup_period."
+        },
+        "fact_value": {
+            "type":        ["string", "null"],
+            "description": "The raw value exactly as stated, e.g. \"~$378\"."
+        },
+    },
+    "required":             ["is_fact", "fact_key", "fact_value"],
+    "additionalProperties": False,
+}
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 # 12. Default Tone Fallback
@@ -400,7 +467,7 @@ If no fact:
 # Keep this minimal — real tone should always come from the database.
 # This fallback should match the firm's baseline communication standard.
 
-DEFAULT_TONE_RULES = (
+DEFAULT_TONE_RULES: Final[str] = (
     "- Speak as 'we' (the firm). Be direct, warm, and confident.\n"
     "- Use clear, concise sentences. No corporate jargon or filler phrases.\n"
     "- Match the register of the investor: if they are formal, stay formal;\n"
@@ -419,7 +486,7 @@ DEFAULT_TONE_RULES = (
 # Output shape is fixed — ThreadParserService validates every field.
 # If the LLM cannot determine a field, it must return null (not omit it).
 
-THREAD_PARSER_SYSTEM_PROMPT = """\
+THREAD_PARSER_SYSTEM_PROMPT: Final[str] = """\
 You are an email thread analyser for Open Doors Partners (ODP), a private investment firm.
 
 You will receive a raw email thread — a back-and-forth between an investor and an ODP team member.
@@ -453,7 +520,7 @@ RULES:
 - IMPORTANT: Return ONLY the JSON object. No preamble, no explanation, no markdown fences.\
 """
 
-THREAD_PARSER_USER_TEMPLATE = """\
+THREAD_PARSER_USER_TEMPLATE: Final[str] = """\
 Email Thread:
 ─────────────────────────────────────────────
 {raw_thread}
@@ -472,8 +539,8 @@ Extract the structured information from the thread above.\
 #
 # Used by both answer mode (QueryService) and draft mode (DraftService).
 
-THREAD_CONTEXT_BLOCK_TEMPLATE = """\
-── EMAIL THREAD CONTEXT ──
+THREAD_CONTEXT_BLOCK_TEMPLATE: Final[str] = """\
+### EMAIL THREAD CONTEXT
 The team member has provided the previous email thread with this investor.
 Use this context to understand: who the investor is, what has already been
 discussed, and what their current open question is. When drafting, match
@@ -488,9 +555,216 @@ Latest Question:     {latest_question}
 
 Thread Summary:
 {thread_summary}
-──────────────────────────────────────\
+---\
 """
 
 # Fallback used when parsed_context exists but some fields are missing.
-THREAD_CONTEXT_UNKNOWN = "Unknown"
-THREAD_CONTEXT_NONE    = "None identified"
+THREAD_CONTEXT_UNKNOWN: Final[str] = "Unknown"
+THREAD_CONTEXT_NONE: Final[str]    = "None identified"
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 15. Precompiled Renderers
+# ══════════════════════════════════════════════════════════════════════════════
+# Each template above that services fill with .format() is split ONCE, here,
+# into its constant chunks and field names. The resulting *_RENDER(**fields)
+# callable only joins strings — no format-string parsing per call.
+# Output is identical to TEMPLATE.format(**fields); the raw templates above
+# stay the single place to edit wording.
+
+def _compile(template: str):
+    """
+    Precompile a str.format template into a render(**fields) -> str callable.
+
+    Only plain {field} placeholders are supported (no format specs or
+    conversions) — every template in this file uses that form.
+    """
+    literals = []   # constant text before each field
+    names    = []   # field names, in order
+    pending  = ""
+    for literal, field, spec, conversion in Formatter().parse(template):
+        pending += literal
+        if field is None:
+            continue
+        if spec or conversion or not field.isidentifier():
+            raise ValueError(f"Unsupported placeholder {{{field}}} in prompt template")
+        literals.append(pending)
+        names.append(field)
+        pending = ""
+
+    if not names:
+        return lambda **values: pending
+
+    head  = literals[0]
+    pairs = tuple(zip(names, literals[1:] + [pending]))
+
+    def render(**values) -> str:
+        out = [head]
+        for name, tail in pairs:
+            out.append(str(values[name]))
+            out.append(tail)
+        return "".join(out)
+
+    return render
+
+
+QUERY_REWRITER_USER_RENDER   = _compile(QUERY_REWRITER_USER_TEMPLATE)
+GREETING_SYSTEM_RENDER       = _compile(GREETING_SYSTEM_PROMPT)
+INFO_REQUEST_USER_RENDER     = _compile(INFO_REQUEST_USER_PROMPT)
+SYSTEM_PROMPT_RENDER         = _compile(SYSTEM_PROMPT_TEMPLATE)
+CLARIFICATION_SYSTEM_RENDER  = _compile(CLARIFICATION_SYSTEM_PROMPT)
+CLARIFICATION_USER_RENDER    = _compile(CLARIFICATION_USER_PROMPT)
+ANSWER_FOOTER_RENDER         = _compile(ANSWER_FOOTER_TEMPLATE)
+THREAD_PARSER_USER_RENDER    = _compile(THREAD_PARSER_USER_TEMPLATE)
+THREAD_CONTEXT_BLOCK_RENDER  = _compile(THREAD_CONTEXT_BLOCK_TEMPLATE)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 16. Cached Prompt Builders
+# ══════════════════════════════════════════════════════════════════════════════
+# A system prompt depends only on (mode, tone_section), and tone rules change
+# rarely — so each distinct pair is rendered once and the same string object
+# is returned for every later request (same bytes → provider prefix-cache hit).
+# Callers pass an already-normalised tone_section so the cache key is stable.
+#
+# Modes are a PromptMode (IntEnum); MODE_INSTRUCTIONS is indexed by its value,
+# so a typo is an AttributeError at the call site instead of a silent fallback.
+
+class PromptMode(IntEnum):
+    """ Which task instructions the system prompt carries. """
+    ANSWER = 0
+    ASK    = 1
+    DRAFT  = 2
+
+    @classmethod
+    def from_str(cls, name: str) -> "PromptMode":
+        """ Parse "answer" / "ask" / "draft" (case-insensitive) at API boundaries. """
+        try:
+            return cls[name.strip().upper()]
+        except KeyError:
+            raise ValueError(f"Unknown prompt mode: {name!r}") from None
+
+
+MODE_INSTRUCTIONS: Final[tuple[str, str, str]] = (
+    ANSWER_MODE_INSTRUCTIONS,   # PromptMode.ANSWER
+    ASK_MODE_INSTRUCTIONS,      # PromptMode.ASK
+    DRAFT_MODE_INSTRUCTIONS,    # PromptMode.DRAFT
+)
+
+
+# The static prefix of every system prompt — everything before the tone
+# section — rendered once here. Prompts are built as prefix + tone_section,
+# so the prefix is the same bytes for every request of a mode by construction.
+# That only holds while {tone_section} is the LAST thing in each template.
+for _name, _template in (
+    ("SYSTEM_PROMPT_TEMPLATE", SYSTEM_PROMPT_TEMPLATE),
+    ("GREETING_SYSTEM_PROMPT", GREETING_SYSTEM_PROMPT),
+):
+    if not _template.endswith("{tone_section}"):
+        raise ValueError(f"{_name} must end with {{tone_section}} (static prefix first)")
+del _name, _template
+
+SYSTEM_PROMPT_PREFIXES: Final[tuple[str, str, str]] = tuple(
+    SYSTEM_PROMPT_RENDER(
+        tone_section           = "",
+        tone_consistency_block = TONE_CONSISTENCY_BLOCK,
+        mode_instructions      = MODE_INSTRUCTIONS[mode]
+    )
+    for mode in PromptMode
+)
+
+GREETING_SYSTEM_PREFIX: Final[str] = GREETING_SYSTEM_RENDER(
+    tone_section           = "",
+    tone_consistency_block = TONE_CONSISTENCY_BLOCK
+)
+
+
+@lru_cache(maxsize = 32)   # 3 modes × a handful of tone-rule variants
+def build_system_prompt(mode: PromptMode, tone_section: str) -> str:
+    """ System prompt for *mode* with the given (canonical) tone section. """
+    return SYSTEM_PROMPT_PREFIXES[mode] + tone_section
+
+
+@lru_cache(maxsize = 8)
+def build_greeting_system_prompt(tone_section: str) -> str:
+    """ System prompt for greeting replies. """
+    return GREETING_SYSTEM_PREFIX + tone_section
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 17. Static Token Counts
+# ══════════════════════════════════════════════════════════════════════════════
+# Token counts of the static system prompts, measured once at import with the
+# same encoding the document chunker uses (cl100k_base). The KB context budget
+# (QueryHelper.kb_context_budget) subtracts them instead of re-encoding
+# multi-KB literals on every request.
+#
+# SYSTEM_PROMPT_BASE_TOKENS[mode] is the full system prompt for that mode with
+# an empty tone section; system_prompt_tokens() adds the tone rules' own count,
+# once per (mode, tone) like build_system_prompt().
+#
+# count_tokens() / truncate_to_tokens() measure and cut per-request text
+# (history turns, KB context) the same way. Without tiktoken (or its BPE
+# file) every count is a character estimate.
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:   # not installed, or BPE file cannot be fetched offline
+    _ENCODING = None
+
+
+def count_tokens(text: str) -> int:
+    """ Token count of *text* — exact with tiktoken, otherwise ≈ 4 characters per token. """
+    return len(_ENCODING.encode(text)) if _ENCODING else (len(text) + 3) // 4
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """ *text* cut to at most *budget* tokens (counted as in count_tokens()); unchanged if it fits. """
+    if not _ENCODING:
+        return text[:budget * 4]
+    tokens = _ENCODING.encode(text)
+    return text if len(tokens) <= budget else _ENCODING.decode(tokens[:budget])
+
+
+SYSTEM_PROMPT_BASE_TOKENS: Final[dict] = {
+    mode: count_tokens(SYSTEM_PROMPT_PREFIXES[mode]) for mode in PromptMode
+}
+
+
+@lru_cache(maxsize = 32)   # same keys as build_system_prompt()
+def system_prompt_tokens(mode: PromptMode, tone_section: str) -> int:
+    """ Token count of build_system_prompt(mode, tone_section). """
+    return SYSTEM_PROMPT_BASE_TOKENS[mode] + count_tokens(tone_section)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# 18. Prompt Size Budgets
+# ══════════════════════════════════════════════════════════════════════════════
+# Every static prompt is sent on every call of its kind, so growth here is a
+# direct, per-request cost increase. Importing this module FAILS if a prompt
+# exceeds its budget — raise the budget deliberately, in the same change that
+# grows the prompt.
+#
+# Budgets are in characters (≈ 4 per token), so the check behaves the same in
+# every environment, with or without tiktoken. Set ~20% above current size.
+
+PROMPT_CHAR_BUDGETS = {
+    "QUERY_REWRITER_SYSTEM_PROMPT": 1500,
+    "TONE_CONSISTENCY_BLOCK":       1700,
+    "GREETING_SYSTEM_PROMPT":        600,
+    "ANSWER_MODE_INSTRUCTIONS":     1400,
+    "ASK_MODE_INSTRUCTIONS":         700,
+    "INFO_REQUEST_USER_PROMPT":      750,
+    "DRAFT_MODE_INSTRUCTIONS":      1000,
+    "SYSTEM_PROMPT_TEMPLATE":        350,
+    "FACT_EXTRACTOR_SYSTEM_PROMPT": 1500,
+    "THREAD_PARSER_SYSTEM_PROMPT":  2500,
+}
+
+for _name, _budget in PROMPT_CHAR_BUDGETS.items():
+    if len(globals()[_name]) > _budget:
+        raise ValueError(
+            f"{_name} is {len(globals()[_name])} chars — over its budget of {_budget}. "
+            f"Trim the prompt or raise PROMPT_CHAR_BUDGETS in prompts.py."
+        )
@@ -14,23 +14,49 @@ Text length values control how much history/context is passed to the LLM.
 Larger values = richer context but higher token cost.
 """
 
+# Python Packages
+from typing import Final
+
+
 # ── Confidence Thresholds ──────────────────────────────────────────────────────
-CONFIDENCE_HIGH_THRESHOLD   = 0.85   # avg cosine similarity ≥ 0.85 → "high"
-CONFIDENCE_MEDIUM_THRESHOLD = 0.70   # avg cosine similarity ≥ 0.70 → "medium"
-                                      # below 0.70               → "low"
+CONFIDENCE_HIGH_THRESHOLD: Final[float]   = 0.85   # avg cosine similarity ≥ 0.85 → "high"
+CONFIDENCE_MEDIUM_THRESHOLD: Final[float] = 0.70   # avg cosine similarity ≥ 0.70 → "medium"
+                                                  # below 0.70               → "low"
 
 # ── History Windowing ──────────────────────────────────────────────────────────
 # How many recent conversation turns are injected into LLM context.
 # More turns = better continuity, higher token cost.
-HISTORY_MESSAGES_FOR_ANSWER = 6    # Used during standard Q&A (Steps 14–15)
-HISTORY_MESSAGES_FOR_DRAFT  = 10   # Used during draft generation (more context needed)
+HISTORY_MESSAGES_FOR_ANSWER: Final[int] = 6    # Used during standard Q&A (Steps 13–15)
+HISTORY_MESSAGES_FOR_DRAFT: Final[int]  = 10   # Used during draft generation (more context needed)
+
+# Token ceiling on those turns — the oldest are dropped first when a window of
+# long messages would exceed it (counted with prompts.count_tokens()).
+HISTORY_TOKENS_FOR_ANSWER: Final[int] = 2000
+HISTORY_TOKENS_FOR_DRAFT: Final[int]  = 3000
+
+# ── KB Context Budget ──────────────────────────────────────────────────────────
+# Token ceiling on the merged Dynamic + Static KB context in one prompt. Team
+# facts are cut only beyond their reserved share; documents get the rest.
+KB_CONTEXT_MAX_TOKENS: Final[int]      = 6000
+KB_CONTEXT_FACTS_SHARE: Final[float]   = 0.30
+
+# Token ceiling on system prompt (tone rules included) + history turns + KB
+# context of one answer / draft call. The KB context gets whatever the other
+# two leave, up to KB_CONTEXT_MAX_TOKENS — so a long tone-rule set or history
+# window shrinks the passages instead of growing the prompt.
+PROMPT_INPUT_MAX_TOKENS: Final[int]    = 11000
 
 # ── Source Preview ─────────────────────────────────────────────────────────────
 # Characters shown in the API "sources" array before truncation with "…"
-SOURCE_PREVIEW_MAX_LENGTH = 200
+SOURCE_PREVIEW_MAX_LENGTH: Final[int] = 200
 
 # ── Assistant Message Truncation ───────────────────────────────────────────────
 # Long assistant messages are trimmed before being added back to LLM history.
 # This keeps prompt sizes manageable without losing important context.
-ASSISTANT_MESSAGE_TRUNCATE_LENGTH = 600   # In history messages for Q&A
-ASSISTANT_MESSAGE_DRAFT_LENGTH    = 800   # In history messages for draft generation
+ASSISTANT_MESSAGE_TRUNCATE_LENGTH: Final[int] = 600   # In history messages for Q&A
+ASSISTANT_MESSAGE_DRAFT_LENGTH: Final[int]    = 800   # In history messages for draft generation
+
+# ── Question Compression ───────────────────────────────────────────────────────
+# Words kept from a user message when it is forwarded to the LLM prompts.
+# The full message is still stored in the conversation history.
+QUESTION_MAX_WORDS: Final[int] = 300
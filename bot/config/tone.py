@@ -0,0 +1,87 @@
+"""
+tone.py — Canonical Tone Section Cache
+=======================================
+Tone rules live in odp_tone_rules and change rarely (an edit a day at most),
+but every answer, draft and greeting needs them. This module keeps the last
+rendered tone section per deal for TONE_CACHE_TTL_SECONDS, so the DB is hit
+at most once per deal per TTL window per process.
+
+Every value handed out is canonical — stripped, trailing whitespace removed
+from each line, interned — so identical rules always produce the identical
+tone_section string. That keeps the system prompt byte-stable across requests
+(provider prompt-cache hits) and makes it a stable key for build_system_prompt().
+
+Rule ORDER is preserved: rules arrive sorted by priority and the model reads
+them top-down, so lines are never re-sorted.
+
+Usage:
+    tone_section = tone.get_tone_section(deal_id, loader)
+
+`loader` is a zero-arg callable that reads the rules from the DB and returns
+the rendered text ("" when no rules exist → DEFAULT_TONE_RULES). If it
+raises, TONE_LOAD_FAILED_FALLBACK is returned for this call only and nothing
+is cached — the next request retries the DB.
+"""
+
+# Python Packages
+import logging
+import sys
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, Tuple
+
+# Config
+from .prompts import DEFAULT_TONE_RULES
+
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds a cached tone section stays valid. Edits to odp_tone_rules become
+# visible within this window.
+TONE_CACHE_TTL_SECONDS = 300
+
+# Returned when the loader raises — the one-line rule the bot has always
+# fallen back to on a DB failure (DEFAULT_TONE_RULES covers an empty table).
+TONE_LOAD_FAILED_FALLBACK = "- Be direct, warm, and helpful."
+
+# cache key (deal_id or None) → (monotonic timestamp, canonical tone section)
+_TONE_CACHE: Dict[Hashable, Tuple[float, str]] = {}
+
+
+
+
+
+@lru_cache(maxsize = 32)   # a handful of distinct tone texts per process
+def canonical_tone(tone_rules: str) -> str:
+    """
+    Stripped, per-line rstripped, interned tone text — DEFAULT_TONE_RULES if empty.
+    Memoised: every LLM call resolves its tone through here, with one of a few texts.
+    """
+    if not tone_rules or not tone_rules.strip():
+        return DEFAULT_TONE_RULES
+    return sys.intern("\n".join(line.rstrip() for line in tone_rules.strip().splitlines()))
+
+
+
+def get_tone_section(key: Hashable, loader: Callable[[], str]) -> str:
+    """ Return the cached tone section for *key*, reloading it once the TTL expires. """
+    now    = time.monotonic()
+    cached = _TONE_CACHE.get(key)
+    if cached and now - cached[0] < TONE_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    try:
+        value = canonical_tone(loader())
+    except Exception as exc:
+        logger.warning("⚠️  Tone rules load failed — using fallback: %s", exc)
+        return TONE_LOAD_FAILED_FALLBACK
+
+    _TONE_CACHE[key] = (now, value)
+    return value
+
+
+
+def clear_tone_cache() -> None:
+    """ Drop every cached tone section (e.g. after editing odp_tone_rules). """
+    _TONE_CACHE.clear()
@@ -4,7 +4,7 @@ Orchestrates between handler and service layer.
 """
 
 # Python Packages
-from typing import Optional
+from typing import Callable, Optional
 
 # Services
 from .services.query_service import QueryService
@@ -34,7 +34,8 @@ class BotController:
         user_id: str,
         deal_id: Optional[int] = None,
         session_id: Optional[str] = None,
-        top_k: int = bot_config.BOT_DEFAULT_TOP_K
+        top_k: int = bot_config.BOT_DEFAULT_TOP_K,
+        on_token: Optional[Callable[[str], None]] = None
     ) -> dict:
         """
         Ask a question to the bot and get an answer.
@@ -45,6 +46,7 @@ class BotController:
             deal_id:    Optional deal ID to scope the question to a specific deal.
             session_id: Optional session ID to maintain conversation context.
             top_k:      Number of top results to retrieve (default from constants).
+            on_token:   Optional callback receiving answer text as it streams.
 
         Returns:
             Dict containing the bot's response with answer and metadata.
@@ -55,11 +57,24 @@ class BotController:
             user_id    = user_id,
             deal_id    = deal_id,
             session_id = session_id,
-            top_k      = top_k
+            top_k      = top_k,
+            on_token   = on_token
         )
 
 
 
+    def clear_cache(self, deal_id: Optional[int] = None) -> None:
+        """
+        Flush cached first-turn answers (call after knowledge-base updates,
+        e.g. new documents processed for a deal). With *deal_id*, only that
+        deal's answers and cross-deal answers are dropped — in every worker
+        process, via the deal's knowledge version.
+        """
+
+        self.query_service.clear_answer_caches(deal_id = deal_id)
+
+
+
     def generate_draft(self, session_id: str, user_id: str) -> dict:
         """
         Generate a draft email reply from the conversation history.
@@ -142,10 +157,10 @@ class BotController:
         source: str = "manual_paste"
     ) -> dict:
         """
-        Submit and parse an email thread for a session.
+        Submit an email thread for a session.
 
-        Stores the raw thread, parses it via LLM to extract investor context,
-        detects deal_id from thread content, and returns the full parsed record.
+        Stores the raw thread and returns it with parse_status 'pending'; the
+        LLM parse (investor context, deal_id detection) runs in the background.
         Thread is completely optional — bot works with no thread at all.
 
         Args:
@@ -155,7 +170,7 @@ class BotController:
             source:          'manual_paste' (v1) | 'gmail_extension' (future).
 
         Returns:
-            Serialised DealEmailThread dict with parse results.
+            Serialised DealEmailThread dict (parse_status 'pending').
         """
 
         thread = self.thread_parser_service.submit_thread(
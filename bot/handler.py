@@ -4,8 +4,19 @@ API endpoints for chatbot functionality.
 """
 
 # Python Packages
-from flask import request
+import logging
+import queue
+import threading
+from functools import wraps
+from typing import Final, Optional
+
+import anthropic
+import openai
+import orjson
+from flask import Response, current_app, g, request, stream_with_context
 from flask_restx import Namespace, Resource
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.exceptions import HTTPException
 
 # Validations
 from .validations import BotValidation
@@ -19,17 +30,154 @@ from ..util import messages
 
 # Config
 from .config import bot_config
+from ..base import constants
+from ..config.json_provider import dumps_bytes
 
 # Namespace
 bot_namespace = Namespace("bot", description="Chatbot and Q&A operations")
 
+logger = logging.getLogger(__name__)
+
+# One controller per worker process. Its services hold only clients (LLM,
+# embeddings) and no per-request state, so endpoints share it safely.
+_controller = BotController()
+
+# top_k is not client-supplied — validate the configured default once, here.
+_DEFAULT_TOP_K: Final[int] = bot_config.BOT_DEFAULT_TOP_K
+BotValidation.validate_top_k(_DEFAULT_TOP_K)
+
+
+
+
+
+# Serialised bodies of the fixed-text errors in messages.ERROR (validation
+# failures, mostly), encoded once at import. Key: (error_code, message).
+_STATIC_ERROR_BODIES: Final[dict] = {
+    (code, message): dumps_bytes(AppException(error_code = code, message = message).to_dict())
+    for code, message in messages.ERROR.items()
+}
+
+
+
+def _error_response(error: AppException):
+    """
+    Response for *error*: the pre-encoded body when it is one of the static
+    messages.ERROR payloads, else its dict for flask-restx to encode.
+    """
+    body = None if error.details else _STATIC_ERROR_BODIES.get((error.error_code, error.message))
+    if body is None:
+        return error.to_dict(), error.status_code
+    return Response(body, status = error.status_code, mimetype = "application/json")
+
+
+
+# Every success body is {"status":"success","data":...}; only data is encoded
+# per response and framed by these constant bytes.
+_SUCCESS_PREFIX: Final[bytes] = b'{"status":"success","data":'
+_SUCCESS_SUFFIX: Final[bytes] = b"}"
+
+
+
+def _success(data, status: int = 200) -> Response:
+    """ {"status": "success", "data": *data*} as a JSON response. """
+    return Response(
+        _SUCCESS_PREFIX + dumps_bytes(data) + _SUCCESS_SUFFIX,
+        status = status,
+        mimetype = "application/json"
+    )
+
+
+
+# Failures the pipeline can hit in normal operation: the database, and the
+# chat / embedding providers (their APIError covers connection errors and
+# timeouts too). Logged in one line; anything else is a bug and is logged
+# with its traceback.
+_EXPECTED_ERRORS: Final[tuple] = (SQLAlchemyError, openai.APIError, anthropic.APIError)
+
+
+
+def _handle_errors(method):
+    """
+    Turn an AppException (validation included) escaping an endpoint into its
+    own payload/status — through the pre-encoded bodies, so the common
+    validation errors are never re-serialised. Everything else goes to
+    _handle_unexpected_error().
+    Applied once through BotResource, so endpoints raise instead of catching.
+    """
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        try:
+            return method(*args, **kwargs)
+
+        except AppException as error:
+            return _error_response(error)
+
+    return wrapper
+
+
+
+@bot_namespace.errorhandler(Exception)
+def _handle_unexpected_error(error):
+    """
+    Central handler for every other exception: the standard
+    InternalServerException payload with a 500 (HTTP errors keep their own
+    status). Registered with flask-restx, so the client gets JSON even when
+    DEBUG makes Flask propagate exceptions.
+    """
+    if isinstance(error, AppException):
+        return error.to_dict(), error.status_code
+
+    if isinstance(error, HTTPException):
+        error = AppException(
+            error_code = error.name.upper().replace(" ", "_"),
+            message = error.description,
+            status_code = error.code
+        )
+        return error.to_dict(), error.status_code
+
+    if isinstance(error, _EXPECTED_ERRORS):
+        logger.warning("⚠️  %s: %s", type(error).__name__, error)
+    else:
+        logger.exception("Unhandled error in a bot endpoint")
+
+    error = InternalServerException(details = str(error))
+    return error.to_dict(), error.status_code
+
+
+
+class BotResource(Resource):
+    """ Base for every bot endpoint — wraps each HTTP method in _handle_errors. """
+
+    method_decorators = [_handle_errors]
+
+
+
+
+
+def _json_body():
+    """
+    Parse the request body with orjson (C parser) instead of request.get_json().
+    An empty or malformed body gives None, which validate_body() rejects as
+    INVALID_REQUEST.
+
+    The raw bytes are read once and not kept on the request; the parsed body
+    is memoised on flask.g, so any later call in the same request reuses it.
+    """
+    if "json_body" not in g:
+        try:
+            g.json_body = orjson.loads(request.get_data(cache = False))
+        except orjson.JSONDecodeError:
+            g.json_body = None
+    return g.json_body
+
 
 
 
 
 # ── POST /bot/ask ─────────────────────────────────────────────────────────────
 @bot_namespace.route("/ask")
-class AskQuestion(Resource):
+class AskQuestion(BotResource):
     """ Ask a question — searches across ALL deals... """
 
     def post(self):
@@ -50,45 +198,112 @@ class AskQuestion(Resource):
           "draft_email"          — user answered pending question, draft ready
         """
 
-        try:
-            data = request.get_json()
+        data = _json_body()
 
-            # Request Data
-            print(f"Request Data: {data}")
+        # Request Data — formatted only when DEBUG logging is enabled
+        logger.debug("Request Data: %s", data)
 
-            BotValidation.validate_body(data)
+        question, user_id, session_id = BotValidation.validate_ask_body(data)
 
-            question   = data.get("question")
-            user_id    = data.get("user_id")
-            session_id = data.get("session_id")
-            top_k      = bot_config.BOT_DEFAULT_TOP_K
+        result = _controller.ask_question(
+            question = question,
+            user_id = user_id,
+            deal_id = None,
+            session_id = session_id,
+            top_k = _DEFAULT_TOP_K
+        )
 
-            BotValidation.validate_question(question)
-            BotValidation.validate_user_id(user_id)
-            BotValidation.validate_top_k(top_k)
+        return _success(result)
 
-            result = BotController().ask_question(
-                question = question.strip(),
-                user_id = user_id,
-                deal_id = None,
-                session_id = session_id,
-                top_k = top_k
-            )
 
-            return {"status": "success", "data": result}, 200
 
-        except AppException as error:
-            return error.to_dict(), error.status_code
+# ── POST /bot/ask/stream ──────────────────────────────────────────────────────
+def _sse(event: str, payload) -> str:
+    """ One Server-Sent Events frame; the payload is JSON so newlines stay inside it. """
+    return f"event: {event}\ndata: {dumps_bytes(payload).decode()}\n\n"
+
+
+
+def _stream_answer(
+    question: str,
+    user_id: str,
+    deal_id: Optional[int],
+    session_id: Optional[str]
+) -> Response:
+    """
+    Run ask_question() and stream its answer as Server-Sent Events:
 
-        except Exception as error:
-            error = InternalServerException(details = str(error))
-            return error.to_dict(), error.status_code
+      event: token   data: {"text": "..."}         — answer text, in order
+      event: result  data: {"status": "success", "data": {...}}
+      event: error   data: {"status": "error", ...}
+
+    The RAG answer streams, and for "needs_info" the "---" separator and the
+    info request follow it. The "result" event is always last and is
+    authoritative: greetings, clarifications and drafts arrive only there.
+    """
+
+    # The pipeline runs in a worker thread with its own app context (and
+    # so its own DB session); it hands text to this response via a queue.
+    app    = current_app._get_current_object()
+    frames = queue.Queue()
+
+    def run_pipeline():
+        with app.app_context():
+            try:
+                result = _controller.ask_question(
+                    question = question,
+                    user_id = user_id,
+                    deal_id = deal_id,
+                    session_id = session_id,
+                    top_k = _DEFAULT_TOP_K,
+                    on_token = lambda text: frames.put(_sse("token", {"text": text}))
+                )
+                frames.put(_sse("result", {"status": "success", "data": result}))
+            except AppException as error:
+                frames.put(_sse("error", error.to_dict()))
+            except Exception as error:
+                # Nothing above this thread can report it — log the traceback
+                # unless it is one of the expected failures
+                if not isinstance(error, _EXPECTED_ERRORS):
+                    logger.exception("Unexpected error in streamed ask")
+                frames.put(_sse("error", InternalServerException(details = str(error)).to_dict()))
+            finally:
+                frames.put(None)
+
+    threading.Thread(target = run_pipeline, name = "bot-ask-stream", daemon = True).start()
+
+    def stream():
+        while (frame := frames.get()) is not None:
+            yield frame
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype = "text/event-stream",
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@bot_namespace.route("/ask/stream")
+class AskQuestionStream(BotResource):
+    """ Ask a question — same as /ask, but the answer streams as Server-Sent Events. """
+
+    def post(self):
+        """
+        Ask a question and receive the answer as it is generated.
+
+        Request: same body as POST /bot/ask.
+        Response (text/event-stream): see _stream_answer().
+        """
+
+        question, user_id, session_id = BotValidation.validate_ask_body(_json_body())
+
+        return _stream_answer(question, user_id, None, session_id)
 
 
 
 # ── POST /bot/ask/<deal_id> ───────────────────────────────────────────────────
 @bot_namespace.route("/ask/<int:deal_id>")
-class AskQuestionDeal(Resource):
+class AskQuestionDeal(BotResource):
     """Ask a question scoped to a specific deal."""
 
     def post(self, deal_id):
@@ -103,41 +318,42 @@ class AskQuestionDeal(Resource):
         }
         """
 
-        try:
-            data = request.get_json()
-            BotValidation.validate_body(data)
-
-            question   = data.get("question")
-            user_id    = data.get("user_id")
-            session_id = data.get("session_id")
-            top_k      = bot_config.BOT_DEFAULT_TOP_K
-
-            BotValidation.validate_question(question)
-            BotValidation.validate_user_id(user_id)
-            BotValidation.validate_top_k(top_k)
-
-            result = BotController().ask_question(
-                question = question.strip(),
-                user_id = user_id,
-                deal_id = deal_id,
-                session_id = session_id,
-                top_k = top_k
-            )
+        question, user_id, session_id = BotValidation.validate_ask_body(_json_body())
 
-            return {"status": "success", "data": result}, 200
+        result = _controller.ask_question(
+            question = question,
+            user_id = user_id,
+            deal_id = deal_id,
+            session_id = session_id,
+            top_k = _DEFAULT_TOP_K
+        )
+
+        return _success(result)
 
-        except AppException as error:
-            return error.to_dict(), error.status_code
 
-        except Exception as error:
-            error = InternalServerException(details = str(error))
-            return error.to_dict(), error.status_code
+
+# ── POST /bot/ask/<deal_id>/stream ────────────────────────────────────────────
+@bot_namespace.route("/ask/<int:deal_id>/stream")
+class AskQuestionDealStream(BotResource):
+    """ Ask a question scoped to a deal — the answer streams as Server-Sent Events. """
+
+    def post(self, deal_id):
+        """
+        Ask a question about a specific deal and receive the answer as it is generated.
+
+        Request: same body as POST /bot/ask/<deal_id>.
+        Response (text/event-stream): see _stream_answer().
+        """
+
+        question, user_id, session_id = BotValidation.validate_ask_body(_json_body())
+
+        return _stream_answer(question, user_id, deal_id, session_id)
 
 
 
 # ── POST /bot/generate-draft ──────────────────────────────────────────────────
 @bot_namespace.route("/generate-draft")
-class GenerateDraft(Resource):
+class GenerateDraft(BotResource):
     """
     Manually trigger a draft email from the conversation history.
     Useful when the user wants a draft even after a complete answer.
@@ -169,96 +385,81 @@ class GenerateDraft(Resource):
         }
         """
 
-        try:
-            data = request.get_json()
-            BotValidation.validate_body(data)
-
-            session_id = data.get("session_id", "").strip()
-            user_id    = data.get("user_id", "").strip()
+        data = _json_body()
+        BotValidation.validate_body(data)
 
-            BotValidation.validate_user_id(user_id)
+        session_id = data.get("session_id", "").strip()
+        user_id    = data.get("user_id", "").strip()
 
-            if not session_id:
-                raise AppException(
-                    error_code = "MISSING_SESSION_ID",
-                    message = messages.ERROR["MISSING_SESSION_ID"],
-                    status_code = 400
-                )
+        BotValidation.validate_user_id(user_id)
 
-            result = BotController().generate_draft(
-                session_id = session_id,
-                user_id = user_id
+        if not session_id:
+            raise AppException(
+                error_code = "MISSING_SESSION_ID",
+                message = messages.ERROR["MISSING_SESSION_ID"],
+                status_code = 400
             )
 
-            return {"status": "success", "data": result}, 200
+        result = _controller.generate_draft(
+            session_id = session_id,
+            user_id = user_id
+        )
 
-        except AppException as error:
-            return error.to_dict(), error.status_code
-
-        except Exception as error:
-            error = InternalServerException(details = str(error))
-            return error.to_dict(), error.status_code
+        return _success(result)
 
 
 
 # ── GET /bot/conversation/<session_id> ────────────────────────────────────────
 @bot_namespace.route("/conversation/<session_id>")
-class ConversationHistory(Resource):
+class ConversationHistory(BotResource):
     """Get or delete a conversation."""
 
     def get(self, session_id):
         """ Get conversation history for a session... """
  
-        try:
-            limit  = request.args.get("limit", bot_config.BOT_LAST_CONVERSATION_MESSAGES_LIMIT, type = int)
-            result = BotController().get_conversation_history(
-                session_id = session_id, limit = limit
-            )
-            return {"status": "success", "data": result}, 200
-
-        except Exception as error:
-            return {"status": "error", "message": str(error)}, 500
+        limit  = request.args.get("limit", bot_config.BOT_LAST_CONVERSATION_MESSAGES_LIMIT, type = int)
+        result = _controller.get_conversation_history(
+            session_id = session_id, limit = limit
+        )
+        return _success(result)
 
 
     def delete(self, session_id):
         """ Clear a conversation... """
 
-        try:
-            result = BotController().clear_conversation(session_id)
-            return {"status": "success", "data": {"session_id": session_id, "cleared": result}}, 200
-
-        except Exception as error:
-            return {"status": "error", "message": str(error)}, 500
+        result = _controller.clear_conversation(session_id)
+        return _success({"session_id": session_id, "cleared": result})
 
 
 
 # ── GET /bot/debug/<deal_id> ──────────────────────────────────────────────────
-@bot_namespace.route("/debug/<int:deal_id>")
-class DebugDeal(Resource):
-    """Debug endpoint — inspect deal data. Not for production."""
+# Diagnostics only — registered when DEBUG_ENDPOINTS_ENABLED (off in production).
+if constants.DEBUG_ENDPOINTS_ENABLED:
 
-    def get(self, deal_id):
-        try:
-            from .services.debug_service import DebugService
-            debug   = DebugService()
-            stats   = debug.get_deal_stats(deal_id)
-            samples = debug.get_sample_chunks(deal_id, limit = 3)
+    # Services
+    from .services.debug_service import DebugService
+
+    _debug = DebugService()
+
+
+    @bot_namespace.route("/debug/<int:deal_id>")
+    class DebugDeal(BotResource):
+        """Debug endpoint — inspect deal data. Not for production."""
+
+        def get(self, deal_id):
+            stats   = _debug.get_deal_stats(deal_id)
+            samples = _debug.get_sample_chunks(deal_id, limit = 3)
 
             question    = request.args.get("question")
-            search_test = debug.test_search(deal_id, question) if question else None
+            search_test = _debug.test_search(deal_id, question) if question else None
 
-            return {
-                "status": "success",
-                "data": {"stats": stats, "sample_chunks": samples, "search_test": search_test}
-            }, 200
-        except Exception as error:
-            return {"status": "error", "message": str(error)}, 500
+            return _success({"stats": stats, "sample_chunks": samples, "search_test": search_test})
 
 
 
 # ── GET /bot/sessions/<user_id> ───────────────────────────────────────────────
 @bot_namespace.route("/sessions/<user_id>")
-class GetUserSessions(Resource):
+class GetUserSessions(BotResource):
     """Get all sessions for a specific user."""
 
     def get(self, user_id):
@@ -297,25 +498,17 @@ class GetUserSessions(Resource):
         }
         """
 
-        try:
-            BotValidation.validate_user_id(user_id)
-
-            result = BotController().get_user_sessions(user_id)
+        BotValidation.validate_user_id(user_id)
 
-            return {"status": "success", "data": result}, 200
-
-        except AppException as error:
-            return error.to_dict(), error.status_code
+        result = _controller.get_user_sessions(user_id)
 
-        except Exception as error:
-            error = InternalServerException(details = str(error))
-            return error.to_dict(), error.status_code
+        return _success(result)
 
 
 
 # ── POST /bot/thread ──────────────────────────────────────────────────────────
 @bot_namespace.route("/thread")
-class SubmitThread(Resource):
+class SubmitThread(BotResource):
     """
     Submit a previous email thread before starting a bot conversation.
 
@@ -331,7 +524,7 @@ class SubmitThread(Resource):
 
     def post(self):
         """
-        Parse and store an email thread for a session.
+        Store an email thread for a session and parse it in the background.
 
         Request:
         {
@@ -341,7 +534,23 @@ class SubmitThread(Resource):
             "source":          "manual_paste"       // optional — default: 'manual_paste'
         }
 
-        Response:
+        Response (202 — the thread is stored, parsing continues in the background):
+        {
+            "status": "success",
+            "data": {
+                "id":                     1,
+                "session_id":             "abc-xyz",
+                "deal_id":                null,
+                "source":                 "manual_paste",
+                "parse_status":           "pending",
+                "parsed_investor_name":   null,
+                ...
+                "created_at": "2024-01-15T10:30:00"
+            }
+        }
+
+        Poll GET /bot/thread/<session_id> until parse_status is "completed"
+        (or "failed"). A completed thread looks like:
         {
             "status": "success",
             "data": {
@@ -366,54 +575,42 @@ class SubmitThread(Resource):
         }
 
         Notes:
+          - Until parsing completes, /bot/ask runs in no-thread mode for the session.
           - If parse_status is "failed", the thread is still stored but the bot
             will not have structured context — it falls back to no-thread mode.
           - deal_id in the response tells you which deal was auto-detected.
             If null, the bot will detect the deal from the conversation as normal.
         """
 
-        try:
-            data = request.get_json()
-            BotValidation.validate_body(data)
-
-            session_id      = data.get("session_id", "").strip()
-            user_id         = data.get("user_id", "").strip()
-            raw_thread_text = data.get("raw_thread_text", "")
-            source          = data.get("source", "manual_paste").strip()
-
-            BotValidation.validate_session_id(session_id)
-            BotValidation.validate_user_id(user_id)
-            BotValidation.validate_thread_text(raw_thread_text)
-
-            result = BotController().submit_thread(
-                session_id      = session_id,
-                raw_thread_text = raw_thread_text,
-                user_id         = user_id,
-                source          = source
-            )
+        # Oversized pastes are refused from the header — never read or parsed
+        BotValidation.validate_thread_body_size(request.content_length)
 
-            return {"status": "success", "data": result}, 200
+        data = _json_body()
+        BotValidation.validate_body(data)
 
-        except AppException as error:
-            return error.to_dict(), error.status_code
+        session_id      = data.get("session_id", "").strip()
+        user_id         = data.get("user_id", "").strip()
+        raw_thread_text = data.get("raw_thread_text", "")
+        source          = data.get("source", "manual_paste").strip()
+
+        BotValidation.validate_session_id(session_id)
+        BotValidation.validate_user_id(user_id)
+        BotValidation.validate_thread_text(raw_thread_text)
 
-        except ValueError as error:
-            # Raised by ThreadParserService._validate_thread_text()
-            return {
-                "status":     "error",
-                "error_code": "INVALID_THREAD",
-                "message":    str(error)
-            }, 400
+        result = _controller.submit_thread(
+            session_id      = session_id,
+            raw_thread_text = raw_thread_text,
+            user_id         = user_id,
+            source          = source
+        )
 
-        except Exception as error:
-            error = InternalServerException(details=str(error))
-            return error.to_dict(), error.status_code
+        return _success(result, 202)
 
 
 
 # ── GET / DELETE /bot/thread/<session_id> ─────────────────────────────────────
 @bot_namespace.route("/thread/<session_id>")
-class ThreadBySession(Resource):
+class ThreadBySession(BotResource):
     """Get or remove the active email thread for a session."""
 
     def get(self, session_id):
@@ -433,12 +630,8 @@ class ThreadBySession(Resource):
         }
         """
 
-        try:
-            result = BotController().get_thread(session_id = session_id)
-            return {"status": "success", "data": result}, 200
-
-        except Exception as error:
-            return {"status": "error", "message": str(error)}, 500
+        result = _controller.get_thread(session_id = session_id)
+        return _success(result)
 
 
     def delete(self, session_id):
@@ -458,12 +651,5 @@ class ThreadBySession(Resource):
         }
         """
 
-        try:
-            deactivated = BotController().delete_thread(session_id = session_id)
-            return {
-                "status": "success",
-                "data":   {"session_id": session_id, "deactivated": deactivated}
-            }, 200
-
-        except Exception as error:
-            return {"status": "error", "message": str(error)}, 500
+        deactivated = _controller.delete_thread(session_id = session_id)
+        return _success({"session_id": session_id, "deactivated": deactivated})
@@ -14,6 +14,7 @@ Service responsibilities:
   ContextBuilder          — Formats RAG chunks into LLM-ready context strings
   FactExtractorService    — Extracts deal facts from team member messages
   DebugService            — Development diagnostics (not for production)
+  EmbeddingBatcher        — Batches concurrent question embeddings into one API call
 """
 
 from .search_service import SearchService
@@ -26,6 +27,7 @@ from .conversation_service import ConversationService
 from .query_enhancement_service import QueryEnhancementService
 from .deal_context_service import DealContextService
 from .fact_extractor_service import FactExtractorService
+from .embedding_batcher import EmbeddingBatcher, EMBEDDING_BATCHER
 
 __all__ = [
     "SearchService",
@@ -38,4 +40,6 @@ __all__ = [
     "QueryEnhancementService",
     "DealContextService",
     "FactExtractorService",
+    "EmbeddingBatcher",
+    "EMBEDDING_BATCHER",
 ]
@@ -0,0 +1,181 @@
+"""
+Service: AnswerCache / SemanticAnswerCache
+===========================================
+Bounded, time-limited LRU caches for pipeline results of first-turn questions.
+
+A question asked at the start of a NEW session has no history, no pending
+needs_info request and no pasted thread — so its outcome depends only on the
+question text, the deal and top_k. QueryService caches that outcome here and,
+on a repeat, replays it into the new session (messages are still persisted)
+instead of re-running query enhancement, both KB searches and the LLM calls.
+
+Key   : (normalised question, deal_id, top_k, tone section, knowledge version)
+        — see AnswerCache.key()
+Value : whatever QueryService stores (an immutable snapshot of the outcome)
+
+SemanticAnswerCache additionally keeps each question's embedding, so a
+differently-worded question for the same (deal_id, top_k, tone, version) whose embedding is
+within BOT_SEMANTIC_CACHE_THRESHOLD cosine similarity reuses the outcome too.
+
+The caches are per process. Staleness is bounded three ways:
+  - the deal's knowledge version (services/knowledge_version.py) is part of
+    the key. Any process that stores team facts or processes a document
+    bumps it in the DB, so every process's entries for that deal stop
+    matching on their next lookup. clear_deal() / clear() additionally free
+    the local entries right away.
+  - the tone section is part of the key, so an edit to odp_tone_rules stops
+    old-tone answers from being replayed as soon as the tone cache reloads
+  - every entry expires after BOT_ANSWER_CACHE_TTL_SECONDS — the backstop
+    for changes that bypass the version bump (e.g. manual DB edits)
+"""
+
+# Python Packages
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+# Config
+from ..config import bot_config
+
+
+logger = logging.getLogger(__name__)
+
+
+class AnswerCache:
+    """
+    Thread-safe LRU with per-entry TTL.
+    One instance is shared by every request a QueryService handles.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = bot_config.BOT_ANSWER_CACHE_SIZE,
+        ttl_seconds: float = bot_config.BOT_ANSWER_CACHE_TTL_SECONDS
+    ):
+        self.maxsize     = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries    = OrderedDict()   # key → (expires_at, value)
+        self._lock       = threading.Lock()
+
+
+    @staticmethod
+    def key(
+        question: str,
+        deal_id: Optional[int],
+        top_k: int,
+        tone_section: str = "",
+        version: Optional[Tuple[int, int]] = None
+    ) -> Tuple:
+        """
+        Cache key — case and whitespace differences map to the same entry.
+        tone_section is the canonical (interned) text from config/tone.py;
+        version is knowledge_version(deal_id).
+        """
+        return (" ".join(question.lower().split()), deal_id, top_k, tone_section, version)
+
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """ Return the cached value for *key*, or None if absent or expired. """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """ Store *value* under *key*, evicting the least recently used entry if full. """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last = False)
+
+
+    def clear(self) -> None:
+        """ Drop every entry (e.g. after the knowledge base changed). """
+        with self._lock:
+            self._entries.clear()
+
+
+    def clear_deal(self, deal_id: int) -> None:
+        """
+        Drop the entries a change to *deal_id*'s knowledge can affect: those
+        scoped to that deal and those with no deal (they search every deal).
+        Other deals' answers stay cached.
+        """
+        with self._lock:
+            stale = [key for key in self._entries if key[1] in (deal_id, None)]
+            for key in stale:
+                del self._entries[key]
+
+
+
+class SemanticAnswerCache(AnswerCache):
+    """
+    AnswerCache whose lookups match by embedding similarity within a scope.
+    Entries are stored under an AnswerCache.key(); its (deal_id, top_k, tone,
+    version) tail is the scope, so a hit never crosses deals, top_k settings,
+    tones or knowledge-base versions.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = bot_config.BOT_SEMANTIC_CACHE_SIZE,
+        ttl_seconds: float = bot_config.BOT_ANSWER_CACHE_TTL_SECONDS,
+        threshold: float = bot_config.BOT_SEMANTIC_CACHE_THRESHOLD
+    ):
+        super().__init__(maxsize = maxsize, ttl_seconds = ttl_seconds)
+        self.threshold = threshold
+
+
+    @staticmethod
+    def _unit(embedding: List[float]) -> np.ndarray:
+        """ Embedding as float32 scaled to length 1, so cosine similarity is a dot product. """
+        vector = np.asarray(embedding, dtype = np.float32)
+        norm   = float(np.linalg.norm(vector)) or 1.0
+        return vector / norm
+
+
+    def add(self, key: Tuple, embedding: List[float], value: Any) -> None:
+        """ Store *value* for the question behind *key* with its embedding. """
+        self.set(key, (key[1:], self._unit(embedding), value))
+
+
+    def nearest(self, key: Tuple, embedding: List[float]) -> Optional[Any]:
+        """
+        Return the value of the most similar cached question in *key*'s scope,
+        or None if none reaches the threshold.
+        """
+        scope = key[1:]
+        query = self._unit(embedding)
+        now   = time.monotonic()
+
+        with self._lock:
+            candidates = [
+                (entry_key, unit, value)
+                for entry_key, (expires_at, (entry_scope, unit, value)) in self._entries.items()
+                if entry_scope == scope and expires_at >= now
+            ]
+
+        if not candidates:
+            return None
+
+        # Every candidate scored in one matrix-vector product
+        scores = np.stack([unit for _, unit, _ in candidates]) @ query
+        best   = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+
+        best_key, _, best_value = candidates[best]
+        logger.debug("🧠 Semantic cache match (similarity=%.3f)", scores[best])
+        self.get(best_key)   # refresh LRU position
+        return best_value
@@ -29,21 +29,32 @@ It enforces three rules:
   (b) No random tone variation between paragraphs.
   (c) Progressive adaptation to match historical email/conversation style.
 
-The tone block is placed AFTER the tone rules and BEFORE task instructions
-so the LLM treats tone as a hard constraint that task logic works within.
+Prompt order is static-first for provider prompt caching: identity → task
+instructions → tone block → DB tone rules LAST. The tone block tells the LLM
+the rules below it are a hard constraint that task logic works within.
 
 All tone comes from odp_tone_rules via the tone_rules parameter.
 Zero hardcoded tone or figures in this file — everything is in config/.
 """
 
 # Python Packages
-from typing import List, Dict, Optional
+import logging
+import random
+from typing import Callable, List, Dict, Optional
 
 # Vendors
 from ...vendors import ChatService
 
 # Config
-from ..config import prompts, llm_config, thresholds
+from ..config import keywords, prompts, llm_config, thresholds, tone
+
+
+# Progress lines go through logging (lazy %-formatting, no stdout flush per
+# call) — this module runs on every request, often on several threads at once
+logger = logging.getLogger(__name__)
+
+# Answer-prompt section used when both KB tiers came back empty
+_NO_KB_SECTION = (prompts.ANSWER_SECTION_NO_KB, prompts.ANSWER_NO_KB_MESSAGE, "")
 
 
 class AnswerGenerator:
@@ -61,13 +72,20 @@ class AnswerGenerator:
         """
         Generate a natural, warm greeting (1–2 sentences).
         No RAG context needed. Tone from DB via tone_rules.
+
+        Common greetings ("hi", "thanks", "ok") get a canned reply from
+        prompts.GREETING_CANNED_REPLIES instead of an LLM call.
         """
-        print("👋 Generating greeting reply...")
+        text     = " ".join(keywords.GREETING_PUNCTUATION_RE.sub(" ", question.lower()).split())
+        category = keywords.GREETING_REPLY_CATEGORY.get(text)
+        replies  = prompts.GREETING_CANNED_REPLIES.get(category)
+        if replies:
+            logger.debug("👋 Canned greeting reply (%s)", category)
+            return random.choice(replies)
 
-        system_prompt = prompts.GREETING_SYSTEM_PROMPT.format(
-            tone_section           = self._resolve_tone(tone_rules),
-            tone_consistency_block = prompts.TONE_CONSISTENCY_BLOCK
-        )
+        logger.debug("👋 Generating greeting reply...")
+
+        system_prompt = prompts.build_greeting_system_prompt(self._resolve_tone(tone_rules))
 
         messages = [
             {"role": "system", "content": system_prompt},
@@ -76,8 +94,8 @@ class AnswerGenerator:
 
         return self.chat_service.generate_response(
             messages    = messages,
-            temperature = llm_config.LLM_GREETING_TEMPERATURE,
-            max_tokens  = llm_config.LLM_GREETING_MAX_TOKENS
+            temperature = llm_config.GREETING.temperature,
+            max_tokens  = llm_config.GREETING.max_tokens
         ).strip()
 
 
@@ -89,7 +107,10 @@ class AnswerGenerator:
         tone_rules: str = None,
         deal_context: str = None,
         thread_context: str = None,
-        history_messages: Optional[List[Dict]] = None
+        history_messages: Optional[List[Dict]] = None,
+        max_tokens: Optional[int] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        cache_key: Optional[str] = None
     ) -> str:
         """
         Generate a RAG answer from the provided context.
@@ -99,10 +120,15 @@ class AnswerGenerator:
         Thread context (if provided) is injected before KB so the LLM knows
         the investor's situation before reading documents.
         NEVER invents figures not present in context.
+        max_tokens overrides llm_config.ANSWER.max_tokens (e.g. SHORT_ANSWER tier).
+        on_token, if given, receives each text piece as it streams from the LLM;
+        the full answer is still returned.
+        cache_key (the session id) keeps one conversation's turns on the same
+        provider prompt cache — see _complete().
         """
-        print("🤖 Generating answer...")
+        logger.debug("🤖 Generating answer...")
 
-        system_prompt = self._build_system_prompt(tone_rules=tone_rules, mode="answer")
+        system_prompt = self._build_system_prompt(tone_rules=tone_rules, mode=prompts.PromptMode.ANSWER)
         messages      = [{"role": "system", "content": system_prompt}]
 
         if history_messages:
@@ -110,17 +136,19 @@ class AnswerGenerator:
                 role, content = msg.get("role", "user"), msg.get("content", "")
                 if role in ("user", "assistant") and content:
                     messages.append({"role": role, "content": content})
-            print(f"   📜 Injected {len(history_messages)} history turns")
+            logger.debug("   📜 Injected %d history turns", len(history_messages))
 
         messages.append({
             "role":    "user",
             "content": self._format_answer_prompt(question, context, deal_context, thread_context)
         })
 
-        return self.chat_service.generate_response(
-            messages    = messages,
-            temperature = llm_config.LLM_ANSWER_TEMPERATURE,
-            max_tokens  = llm_config.LLM_ANSWER_MAX_TOKENS
+        return self._complete(
+            messages,
+            temperature = llm_config.ANSWER.temperature,
+            max_tokens  = max_tokens or llm_config.ANSWER.max_tokens,
+            on_token    = on_token,
+            cache_key   = cache_key
         )
 
 
@@ -131,7 +159,9 @@ class AnswerGenerator:
         partial_answer: str,
         tone_rules: str = None,
         thread_context: str = None,
-        history_messages: Optional[List[Dict]] = None
+        history_messages: Optional[List[Dict]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        cache_key: Optional[str] = None
     ) -> str:
         """
         Ask the team ONLY for facts that could NOT be confirmed.
@@ -139,10 +169,11 @@ class AnswerGenerator:
         Receives partial_answer so the LLM sees what was already confirmed
         and does NOT re-ask for those items.
         Thread context is included so the LLM can reference the investor by name.
+        on_token and cache_key work as for generate_answer().
         """
-        print("📋 Generating info request (gaps only)...")
+        logger.debug("📋 Generating info request (gaps only)...")
 
-        system_prompt = self._build_system_prompt(tone_rules=tone_rules, mode="ask")
+        system_prompt = self._build_system_prompt(tone_rules=tone_rules, mode=prompts.PromptMode.ASK)
         messages      = [{"role": "system", "content": system_prompt}]
 
         if history_messages:
@@ -156,16 +187,18 @@ class AnswerGenerator:
         if thread_context and thread_context.strip():
             user_prompt += thread_context.strip() + "\n\n"
 
-        user_prompt += prompts.INFO_REQUEST_USER_PROMPT.format(
+        user_prompt += prompts.INFO_REQUEST_USER_RENDER(
             original_question = original_question,
             partial_answer    = partial_answer
         )
         messages.append({"role": "user", "content": user_prompt})
 
-        return self.chat_service.generate_response(
-            messages    = messages,
-            temperature = llm_config.LLM_INFO_REQUEST_TEMPERATURE,
-            max_tokens  = llm_config.LLM_INFO_REQUEST_MAX_TOKENS
+        return self._complete(
+            messages,
+            temperature = llm_config.INFO_REQUEST.temperature,
+            max_tokens  = llm_config.INFO_REQUEST.max_tokens,
+            on_token    = on_token,
+            cache_key   = cache_key
         )
 
 
@@ -178,17 +211,18 @@ class AnswerGenerator:
         deal_context: str = None,
         doc_context: str = None,
         thread_context: str = None,
-        history_messages: Optional[List[Dict]] = None
+        history_messages: Optional[List[Dict]] = None,
+        cache_key: Optional[str] = None
     ) -> str:
         """
         Draft a reply email to an investor.
         Uses team-supplied info, dynamic KB (team corrections), and static KB.
         Thread context (when available) lets the LLM match the investor's style.
-        Tone from DB. No hardcoded figures.
+        Tone from DB. No hardcoded figures. cache_key as for generate_answer().
         """
-        print("✉️  Generating draft email...")
+        logger.debug("✉️  Generating draft email...")
 
-        system_prompt = self._build_system_prompt(tone_rules=tone_rules, mode="draft")
+        system_prompt = self._build_system_prompt(tone_rules=tone_rules, mode=prompts.PromptMode.DRAFT)
         messages      = [{"role": "system", "content": system_prompt}]
 
         if history_messages:
@@ -205,39 +239,79 @@ class AnswerGenerator:
             )
         })
 
-        return self.chat_service.generate_response(
-            messages    = messages,
-            temperature = llm_config.LLM_DRAFT_TEMPERATURE,
-            max_tokens  = llm_config.LLM_DRAFT_MAX_TOKENS
+        return self._complete(
+            messages,
+            temperature = llm_config.DRAFT.temperature,
+            max_tokens  = llm_config.DRAFT.max_tokens,
+            cache_key   = cache_key
         )
 
 
+    # ── Private: LLM Call ─────────────────────────────────────────────────────
+    def _complete(
+        self,
+        messages: List[Dict],
+        temperature: float,
+        max_tokens: int,
+        on_token: Optional[Callable[[str], None]] = None,
+        cache_key: Optional[str] = None
+    ) -> str:
+        """
+        Run one chat completion. With on_token the response is streamed and
+        each text piece is handed to on_token as it arrives; the full text is
+        returned either way.
+
+        History is re-sent on every turn (the provider keeps no state), so its
+        cost is paid in prompt-cache reads: Anthropic via the breakpoints the
+        ChatService marks, OpenAI via prompt_cache_key=cache_key.
+        """
+        if on_token is None:
+            return self.chat_service.generate_response(
+                messages    = messages,
+                temperature = temperature,
+                max_tokens  = max_tokens,
+                cache_key   = cache_key
+            )
+
+        pieces = []
+        for piece in self.chat_service.generate_response_stream(
+            messages    = messages,
+            temperature = temperature,
+            max_tokens  = max_tokens,
+            cache_key   = cache_key
+        ):
+            pieces.append(piece)
+            on_token(piece)
+        return "".join(pieces)
+
+
     # ── Private: System Prompt Builder ────────────────────────────────────────
     def _resolve_tone(self, tone_rules: str = None) -> str:
-        """Return tone section from DB if available, fallback otherwise."""
-        if tone_rules and tone_rules.strip():
-            return tone_rules.strip()
-        print("⚠️  No tone rules in DB — using fallback.")
-        return prompts.DEFAULT_TONE_RULES
+        """
+        Return tone section from DB if available, fallback otherwise.
+
+        Normalised by tone.canonical_tone() (a no-op for text that already
+        came through the tone cache), so cosmetic DB edits still render a
+        byte-identical prompt.
+        """
+        if not tone_rules or not tone_rules.strip():
+            logger.warning("⚠️  No tone rules in DB — using fallback.")
+        return tone.canonical_tone(tone_rules)
 
-    def _build_system_prompt(self, tone_rules: str = None, mode: str = "answer") -> str:
+    def _build_system_prompt(
+        self,
+        tone_rules: str = None,
+        mode: prompts.PromptMode = prompts.PromptMode.ANSWER
+    ) -> str:
         """
         Assemble system prompt for the given mode.
 
-        Order: role → tone rules → tone consistency block → task instructions.
-        Tone is always declared before task so it acts as a hard constraint.
+        Order: role → task instructions → tone consistency block → tone rules.
+        Everything before the tone rules is static per mode, so it forms a
+        cacheable prompt prefix; the block makes tone a hard constraint.
+        Rendered prompts are memoised per (mode, tone) in prompts.py.
         """
-        mode_map = {
-            "ask":   prompts.ASK_MODE_INSTRUCTIONS,
-            "draft": prompts.DRAFT_MODE_INSTRUCTIONS,
-        }
-        mode_instructions = mode_map.get(mode, prompts.ANSWER_MODE_INSTRUCTIONS)
-
-        return prompts.SYSTEM_PROMPT_TEMPLATE.format(
-            tone_section           = self._resolve_tone(tone_rules),
-            tone_consistency_block = prompts.TONE_CONSISTENCY_BLOCK,
-            mode_instructions      = mode_instructions
-        )
+        return prompts.build_system_prompt(mode, self._resolve_tone(tone_rules))
 
 
     # ── Private: Prompt Formatters ─────────────────────────────────────────────
@@ -257,21 +331,25 @@ class AnswerGenerator:
           3. KB context (dynamic facts first, static KB second)
           4. Question footer
         """
-        parts = []
+        # Each context is stripped once; parts is joined once at the end
+        thread_context = thread_context.strip() if thread_context else ""
+        deal_context   = deal_context.strip() if deal_context else ""
+        doc_context    = doc_context.strip() if doc_context else ""
+        parts          = []
 
         # Thread context FIRST — investor context before any KB content
-        if thread_context and thread_context.strip():
-            parts += [thread_context.strip(), ""]
+        if thread_context:
+            parts.extend((thread_context, ""))
 
-        if deal_context and deal_context.strip():
-            parts += [prompts.ANSWER_SECTION_DEAL, deal_context.strip(), ""]
+        if deal_context:
+            parts.extend((prompts.ANSWER_SECTION_DEAL, deal_context, ""))
 
-        if doc_context and doc_context.strip():
-            parts += [prompts.ANSWER_SECTION_KB, doc_context.strip(), ""]
+        if doc_context:
+            parts.extend((prompts.ANSWER_SECTION_KB, doc_context, ""))
         else:
-            parts += [prompts.ANSWER_SECTION_NO_KB, prompts.ANSWER_NO_KB_MESSAGE, ""]
+            parts.extend(_NO_KB_SECTION)
 
-        parts.append(prompts.ANSWER_FOOTER_TEMPLATE.format(question=question))
+        parts.append(prompts.ANSWER_FOOTER_RENDER(question=question))
         return "\n".join(parts)
 
     def _format_draft_prompt(
@@ -293,26 +371,29 @@ class AnswerGenerator:
           5. KB context
           6. Draft instruction footer
         """
-        parts = []
+        thread_context = thread_context.strip() if thread_context else ""
+        deal_context   = deal_context.strip() if deal_context else ""
+        doc_context    = doc_context.strip() if doc_context else ""
+        parts          = []
 
         # Thread context FIRST — style reference before any content
-        if thread_context and thread_context.strip():
-            parts += [thread_context.strip(), ""]
+        if thread_context:
+            parts.extend((thread_context, ""))
 
-        parts += [
+        parts.extend((
             prompts.DRAFT_SECTION_QUESTION,
             investor_question.strip(),
             "",
             prompts.DRAFT_SECTION_TEAM_INFO,
             user_info.strip() if user_info else "(none provided)",
             "",
-        ]
+        ))
 
-        if deal_context and deal_context.strip():
-            parts += [prompts.DRAFT_SECTION_DEAL, deal_context.strip(), ""]
+        if deal_context:
+            parts.extend((prompts.DRAFT_SECTION_DEAL, deal_context, ""))
 
-        if doc_context and doc_context.strip():
-            parts += [prompts.DRAFT_SECTION_KB, doc_context.strip(), ""]
+        if doc_context:
+            parts.extend((prompts.DRAFT_SECTION_KB, doc_context, ""))
 
         parts.append(prompts.DRAFT_FOOTER)
         return "\n".join(parts)
@@ -10,7 +10,7 @@ Core rule:
 """
 
 # Python Packages
-from typing import List
+from typing import List, Optional
 
 # Vendors
 from ...vendors import ChatService
@@ -34,7 +34,8 @@ class ClarificationService:
         question: str,
         chunks_found: int,
         confidence: str,
-        has_deal_context: bool = False
+        has_deal_context: bool = False,
+        question_lower: Optional[str] = None
     ) -> bool:
         """
         Determine if we need to ask "which deal?" before answering.
@@ -44,23 +45,23 @@ class ClarificationService:
             2. No deal context + general/greeting question → answer (no deal needed)
             3. No deal context + deal-specific question → MUST clarify
             4. No deal context + truly vague → clarify
+
+        question_lower: question.lower(), if the caller already has it.
         """
         # Rule 1: Deal context established — proceed
         if has_deal_context:
             return False
 
-        question_lower = question.lower().strip()
+        question_lower = (question_lower if question_lower is not None else question.lower()).strip()
 
         # Rule 2: General questions don't need a deal
-        for pattern in keywords.GENERAL_KEYWORDS:
-            if pattern in question_lower:
-                return False
+        if keywords.GENERAL_MATCHER.search(question_lower):
+            return False
 
         # Rule 3: Deal-specific question WITHOUT known deal → must clarify
-        for kw in keywords.DEAL_SPECIFIC_KEYWORDS:
-            if kw in question_lower:
-                print("⚠️  Deal-specific question with no deal context — must clarify")
-                return True
+        if keywords.DEAL_SPECIFIC_MATCHER.search(question_lower):
+            print("⚠️  Deal-specific question with no deal context — must clarify")
+            return True
 
         # Rule 4: Vague question with no deal context → clarify
         return True
@@ -70,7 +71,8 @@ class ClarificationService:
         self,
         question: str,
         available_documents: List[str],
-        available_deals: List[str] = None
+        available_deals: List[str] = None,
+        question_lower: Optional[str] = None
     ) -> str:
         """
         Generate a short, warm clarifying question.
@@ -83,15 +85,15 @@ class ClarificationService:
             deal_prompt = "Could you let me know which deal you're asking about?"
 
         # Fast path: deal-specific keyword → return directly without LLM call
-        question_lower = question.lower()
-        for kw in keywords.DEAL_SPECIFIC_KEYWORDS:
-            if kw in question_lower:
-                return f"Happy to help! {deal_prompt}"
+        if question_lower is None:
+            question_lower = question.lower()
+        if keywords.DEAL_SPECIFIC_MATCHER.search(question_lower):
+            return f"Happy to help! {deal_prompt}"
 
         # Vague question → use LLM for a more natural response
         deals_text    = " and ".join(available_deals) if available_deals else "our current investment opportunities"
-        system_prompt = prompts.CLARIFICATION_SYSTEM_PROMPT.format(deals_text=deals_text)
-        user_prompt   = prompts.CLARIFICATION_USER_PROMPT.format(question=question)
+        system_prompt = prompts.CLARIFICATION_SYSTEM_RENDER(deals_text=deals_text)
+        user_prompt   = prompts.CLARIFICATION_USER_RENDER(question=question)
 
         messages = [
             {"role": "system", "content": system_prompt},
@@ -100,6 +102,6 @@ class ClarificationService:
 
         return self.chat_service.generate_response(
             messages    = messages,
-            temperature = llm_config.LLM_CLARIFICATION_TEMPERATURE,
-            max_tokens  = llm_config.LLM_CLARIFICATION_MAX_TOKENS
+            temperature = llm_config.CLARIFICATION.temperature,
+            max_tokens  = llm_config.CLARIFICATION.max_tokens
         ).strip()
@@ -15,12 +15,17 @@ Chunk tuple layout (7 values — matches SearchService output):
 """
 
 # Python Packages
+import hashlib
+import logging
 from typing import List, Tuple, Dict
 
 # Config
 from ..config import thresholds
 
 
+logger = logging.getLogger(__name__)
+
+
 class ContextBuilder:
     """
     Formats chunk tuples for LLM consumption and confidence scoring.
@@ -31,13 +36,23 @@ class ContextBuilder:
         """
         Build a formatted context string from retrieved chunks.
         Returns "" if chunks is empty.
+
+        A chunk whose text (ignoring case and whitespace) repeats an earlier,
+        higher-ranked one — the same passage in two uploads of a document —
+        is left out, so it is not paid for twice in the prompt.
         """
         if not chunks:
             return ""
 
         parts = []
-        for i, chunk in enumerate(chunks, 1):
-            chunk_text  = chunk[0]
+        seen  = set()
+        for chunk in chunks:
+            chunk_text = chunk[0]
+            digest     = self._text_digest(chunk_text)
+            if digest in seen:
+                continue
+            seen.add(digest)
+
             doc_name    = chunk[1]
             similarity  = chunk[2]
             page_number = chunk[5] if len(chunk) > 5 else None
@@ -47,11 +62,20 @@ class ContextBuilder:
                 source_info += f", Page {page_number}"
             source_info += f", Relevance: {similarity:.2%}]"
 
-            parts.append(f"Document {i}:\n{source_info}\n{chunk_text}\n")
+            parts.append(f"Document {len(parts) + 1}:\n{source_info}\n{chunk_text}\n")
+
+        if len(parts) < len(chunks):
+            logger.debug("🧹 Dropped %d duplicate chunk(s) from context", len(chunks) - len(parts))
 
         return "\n---\n".join(parts)
 
 
+    @staticmethod
+    def _text_digest(text: str) -> bytes:
+        """ 8-byte digest of *text* with case and whitespace normalised. """
+        return hashlib.blake2b(" ".join(text.lower().split()).encode(), digest_size = 8).digest()
+
+
     def extract_sources(self, chunks: List[Tuple]) -> List[Dict]:
         """
         Build a de-duplicated list of source references for the API response.
@@ -141,13 +141,18 @@ class ConversationService:
         """
 
         try:
-            conversation = Conversation.query.filter_by(session_id = session_id).first()
-            if not conversation:
-                return []
-
-            messages = (
-                ConversationMessage.query
-                .filter_by(conversation_id = conversation.conversation_id)
+            # One round trip (join on session_id) and plain column rows —
+            # this runs on every /ask, so no ORM objects are built
+            rows = (
+                db.session.query(
+                    ConversationMessage.role,
+                    ConversationMessage.content,
+                    ConversationMessage.deal_id,
+                    ConversationMessage.message_metadata,
+                    ConversationMessage.created_at
+                )
+                .join(Conversation, Conversation.conversation_id == ConversationMessage.conversation_id)
+                .filter(Conversation.session_id == session_id)
                 .order_by(ConversationMessage.created_at.desc())
                 .limit(limit)
                 .all()
@@ -156,13 +161,13 @@ class ConversationService:
             # Reverse so the LLM receives oldest → newest
             return [
                 {
-                    "role":       msg.role,
-                    "content":    msg.content,
-                    "deal_id":    msg.deal_id,
-                    "metadata":   msg.message_metadata,
-                    "created_at": msg.created_at.isoformat()
+                    "role":       role,
+                    "content":    content,
+                    "deal_id":    deal_id,
+                    "metadata":   metadata,
+                    "created_at": created_at.isoformat()
                 }
-                for msg in reversed(messages)
+                for role, content, deal_id, metadata, created_at in reversed(rows)
             ]
 
         except Exception as exc:
@@ -37,7 +37,9 @@ Design decisions
 """
 
 # Python Packages
-from typing import List, Dict, Optional
+import logging
+import re
+from typing import List, Dict, Optional, Sequence
 
 # Database
 from sqlalchemy import text as sql_text
@@ -53,11 +55,51 @@ from ...vendors.openai import EmbeddingService
 
 # Config
 from ..config import bot_config
-from ..config import prompts
 from ..config import fact_patterns
+from ..config import tone
 
+# Services
+from .search_service import vector_literal, widen_index_scan
 
 
+logger = logging.getLogger(__name__)
+
+
+
+
+
+# Dynamic KB Q&A vector search, built once at import. Like SearchService, the
+# nearest top_k approved Q&A records are taken first (distance computed once
+# per row) and the similarity threshold is applied afterwards.
+_QA_SEARCH_SQL = """
+    SELECT question, answer, 1 - distance AS similarity
+    FROM (
+        SELECT question, answer,
+               embedding <=> CAST(:emb AS vector) AS distance
+        FROM odp_deal_dynamic_facts
+        WHERE approval_status = 'approved'
+          AND embedding IS NOT NULL
+          AND question IS NOT NULL{deal_filter}
+        ORDER BY distance
+        LIMIT :top_k
+    ) AS nearest
+    WHERE distance <= 1 - :threshold
+    ORDER BY distance
+"""
+
+_QA_IN_DEAL_SQL   = sql_text(_QA_SEARCH_SQL.format(deal_filter = "\n          AND deal_id = :deal_id"))
+_QA_ALL_DEALS_SQL = sql_text(_QA_SEARCH_SQL.format(deal_filter = ""))
+
+
+# _derive_fact_key() fallback: punctuation is stripped and these words are
+# dropped before the first three remaining words become the key.
+_PUNCTUATION_RE     = re.compile(r"[^\w\s]")
+_FACT_KEY_STOPWORDS = frozenset({
+    "what", "whats", "is", "the", "are", "how", "much", "many",
+    "long", "do", "you", "have", "can", "tell", "me", "about",
+    "for", "of", "a", "an", "now", "current", "currently", "any"
+})
+
 
 
 class DealContextService:
@@ -90,10 +132,13 @@ class DealContextService:
             return []
 
 
-    def detect_deal_in_text(self, text: str, all_deals: List[Dict]) -> Optional[int]:
+    def detect_deal_in_text(
+        self, text: str, all_deals: List[Dict], text_lower: Optional[str] = None
+    ) -> Optional[int]:
         """Return deal_id if any deal name/code appears in text (case-insensitive)."""
 
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         for deal in all_deals:
             if (deal["deal_name"].lower() in text_lower or
                     deal["deal_code"].lower() in text_lower):
@@ -140,8 +185,15 @@ class DealContextService:
         """
         Load tone and compliance rules from odp_tone_rules.
         Global rules always loaded; deal-specific rules added when deal_id given.
-        Falls back to minimal hardcoded default if table is empty.
+        Falls back to DEFAULT_TONE_RULES if the table is empty, and to
+        tone.TONE_LOAD_FAILED_FALLBACK if the DB fails.
+
+        Cached per deal for tone.TONE_CACHE_TTL_SECONDS — see config/tone.py.
         """
+        return tone.get_tone_section(deal_id, lambda: self._load_tone_rules(deal_id))
+
+    def _load_tone_rules(self, deal_id: Optional[int]) -> str:
+        """ Query odp_tone_rules and render one "- [TYPE] text" line per rule ("" if none). """
         try:
             global_rules = (
                 ToneRule.query
@@ -161,14 +213,13 @@ class DealContextService:
             all_rules = global_rules + deal_rules
             if not all_rules:
                 print("⚠️  No tone rules in DB — using minimal fallback.")
-                return prompts.DEFAULT_TONE_RULES
+                return ""
 
             return "\n".join(f"- [{r.rule_type.upper()}] {r.rule_text}" for r in all_rules)
 
-        except Exception as exc:
+        except Exception:
             db.session.rollback()
-            print(f"⚠️  get_tone_rules failed: {exc}")
-            return "- Be direct, warm, and helpful."
+            raise
 
 
 
@@ -178,10 +229,15 @@ class DealContextService:
         question: str,
         deal_id: Optional[int] = None,
         top_k: int = 5,
-        similarity_threshold: float = bot_config.BOT_SIMILARITY_THRESHOLD
+        similarity_threshold: float = bot_config.BOT_SIMILARITY_THRESHOLD,
+        embedding: Optional[List[float]] = None,
+        more_embeddings: Sequence[List[float]] = ()
     ) -> str:
         """
         Search odp_deal_dynamic_facts for entries that match *question*.
+        Pass *embedding* when the question was already embedded, and
+        *more_embeddings* to also match further questions answered in the
+        same prompt (each Q&A record is listed once).
 
         Two passes:
           1. Vector similarity on embedding (Q&A records with embeddings)
@@ -196,47 +252,27 @@ class DealContextService:
 
         # ── Pass 1: Vector similarity over Q&A records ─────────────────────────
         try:
-            embedding = self.embedding_service.generate_embedding(question)
-            emb_str   = "[" + ",".join(map(str, embedding)) + "]"
-
+            if embedding is None:
+                embedding = self.embedding_service.generate_embedding(question)
             if deal_id:
-                sql = sql_text("""
-                    SELECT question, answer,
-                           1 - (embedding <=> CAST(:emb AS vector)) AS similarity
-                    FROM odp_deal_dynamic_facts
-                    WHERE deal_id = :deal_id
-                      AND approval_status = 'approved'
-                      AND embedding IS NOT NULL
-                      AND question IS NOT NULL
-                      AND (1 - (embedding <=> CAST(:emb AS vector))) >= :threshold
-                    ORDER BY embedding <=> CAST(:emb AS vector)
-                    LIMIT :top_k
-                """)
-                qa_rows = db.session.execute(sql, {
-                    "emb": emb_str, "deal_id": deal_id,
-                    "threshold": similarity_threshold, "top_k": top_k
-                }).fetchall()
-            else:
-                sql = sql_text("""
-                    SELECT question, answer,
-                           1 - (embedding <=> CAST(:emb AS vector)) AS similarity
-                    FROM odp_deal_dynamic_facts
-                    WHERE approval_status = 'approved'
-                      AND embedding IS NOT NULL
-                      AND question IS NOT NULL
-                      AND (1 - (embedding <=> CAST(:emb AS vector))) >= :threshold
-                    ORDER BY embedding <=> CAST(:emb AS vector)
-                    LIMIT :top_k
-                """)
-                qa_rows = db.session.execute(sql, {
-                    "emb": emb_str,
-                    "threshold": similarity_threshold,
-                    "top_k": top_k
-                }).fetchall()
+                widen_index_scan()
+
+            qa_rows = []
+            seen_qa = set()   # (question, answer)
+            for vector in [embedding, *more_embeddings]:
+                params = {"emb": vector_literal(vector), "threshold": similarity_threshold, "top_k": top_k}
+                if deal_id:
+                    rows = db.session.execute(_QA_IN_DEAL_SQL, {**params, "deal_id": deal_id}).fetchall()
+                else:
+                    rows = db.session.execute(_QA_ALL_DEALS_SQL, params).fetchall()
+                for row in rows:
+                    if (row[0], row[1]) not in seen_qa:
+                        seen_qa.add((row[0], row[1]))
+                        qa_rows.append(row)
 
             if qa_rows:
                 print(f"📚 Dynamic KB Q&A: {len(qa_rows)} entries matched")
-                parts.append("── TEAM-SUPPLIED FACTS (override document values below) ──")
+                parts.append("### TEAM-SUPPLIED FACTS (override document values below)")
                 for row in qa_rows:
                     parts.append(f"Q: {row[0]}")
                     parts.append(f"A: {row[1]}")
@@ -261,7 +297,7 @@ class DealContextService:
             if fact_rows:
                 print(f"📚 Dynamic KB facts: {len(fact_rows)} structured facts")
                 if not parts:
-                    parts.append("── TEAM-SUPPLIED FACTS (override document values below) ──")
+                    parts.append("### TEAM-SUPPLIED FACTS (override document values below)")
                 for f in fact_rows:
                     label = f.fact_key.replace("_", " ").title()
                     parts.append(f"{label}: {f.fact_value}")
@@ -316,6 +352,51 @@ class DealContextService:
             traceback.print_exc()
             return None
 
+    def _store_qa_records(
+        self,
+        deal_id: int,
+        pairs: List[tuple],
+        created_by: str
+    ) -> List[DealDynamicFact]:
+        """
+        Persist several (question, answer) pairs like store_dynamic_kb(), but
+        embed them in ONE batched API call and commit them together. If the
+        batch fails, falls back to storing each pair on its own.
+        Returns the records actually stored.
+        """
+        if not pairs:
+            return []
+
+        try:
+            embeddings = self.embedding_service.generate_embeddings_batch(
+                [f"{question} {answer}" for question, answer in pairs]
+            )
+            entries = [
+                DealDynamicFact(
+                    deal_id         = deal_id,
+                    question        = question,
+                    answer          = answer,
+                    embedding       = embedding,
+                    approval_status = "approved"
+                )
+                for (question, answer), embedding in zip(pairs, embeddings)
+            ]
+            db.session.add_all(entries)
+            db.session.commit()
+
+            logger.info("✅ Saved %d record(s) to odp_deal_dynamic_facts | deal_id=%s", len(entries), deal_id)
+            return entries
+
+        except Exception as exc:
+            db.session.rollback()
+            logger.warning("❌ _store_qa_records batch FAILED (deal_id=%s): %s — storing one by one", deal_id, exc)
+
+        stored = [
+            self.store_dynamic_kb(deal_id, question, answer, created_by)
+            for question, answer in pairs
+        ]
+        return [entry for entry in stored if entry is not None]
+
     # ── Dynamic KB — Store with Decomposition ─────────────────────────────────
 
     def store_dynamic_kb_with_decomposition(
@@ -348,19 +429,10 @@ class DealContextService:
             user_answer:       The team member's reply.
             created_by:        user_id of the team member.
         """
-        import re as _re
         print(f"\n📦 Storing to Dynamic KB | deal_id={deal_id}")
         print(f"   Q: {investor_question[:100]}")
         print(f"   A: {user_answer[:100]}")
 
-        # 1. Full Q&A record
-        self.store_dynamic_kb(
-            deal_id    = deal_id,
-            question   = investor_question,
-            answer     = user_answer,
-            created_by = created_by
-        )
-
         # 2. Atomic facts
         atomic_facts = self._extract_atomic_facts(
             investor_question = investor_question,
@@ -368,15 +440,13 @@ class DealContextService:
             deal_id           = deal_id
         )
 
+        # 1. Full Q&A record — committed on its own, so a failure below never loses it
+        self.store_dynamic_kb(deal_id, investor_question, user_answer, created_by)
+
         if atomic_facts:
-            for fact_question, fact_answer in atomic_facts:
-                self.store_dynamic_kb(
-                    deal_id    = deal_id,
-                    question   = fact_question,
-                    answer     = fact_answer,
-                    created_by = created_by
-                )
-                print(f"⚛️  Atomic stored: Q=\"{fact_question}\" A=\"{fact_answer}\"")
+            # 2. Every atomic fact — one embedding call, one commit
+            for entry in self._store_qa_records(deal_id, atomic_facts, created_by):
+                print(f"⚛️  Atomic stored: Q=\"{entry.question}\" A=\"{entry.answer}\"")
         else:
             # 3. Fallback: fact_key / fact_value record
             fact_key = self._derive_fact_key(investor_question)
@@ -412,22 +482,20 @@ class DealContextService:
           "What is the IRR?"                → "irr"
           "How long is the lock-up?"        → "lockup_period"
         """
-        import re as _re
         q = question.lower().strip()
 
         # KEY_MAPPINGS lives in config/fact_patterns.py — edit it there.
-        for phrases, key in fact_patterns.KEY_MAPPINGS:
-            if any(kw in q for kw in phrases):
-                return key
+        # One scan collects every trigger hit; the lowest group rank wins.
+        hits = [
+            fact_patterns.TRIGGER_TO_KEY[match.group(1)]
+            for match in fact_patterns.KEY_TRIGGER_MATCHER.finditer(q)
+        ]
+        if hits:
+            return min(hits)[1]
 
         # Generic fallback: extract meaningful words
-        stopwords = {
-            "what", "whats", "is", "the", "are", "how", "much", "many",
-            "long", "do", "you", "have", "can", "tell", "me", "about",
-            "for", "of", "a", "an", "now", "current", "currently", "any"
-        }
-        words = _re.sub(r"[^\w\s]", " ", q).split()
-        meaningful = [w for w in words if w not in stopwords and len(w) > 2]
+        words = _PUNCTUATION_RE.sub(" ", q).split()
+        meaningful = [w for w in words if w not in _FACT_KEY_STOPWORDS and len(w) > 2]
         if meaningful:
             return "_".join(meaningful[:3])
 
@@ -455,7 +523,6 @@ class DealContextService:
             List of (question_str, value_str) tuples.
             Empty list if no atomic facts could be extracted.
         """
-        deal_name = self.get_deal_name(deal_id) or "the deal"
         q_lower   = investor_question.lower()
         a_lower   = user_answer.lower()
         facts     = []
@@ -463,11 +530,19 @@ class DealContextService:
         # FACT_PATTERNS lives in config/fact_patterns.py — edit it there.
         # Each entry: (topic_keywords, answer_signals, question_template)
         # question_template uses {deal_name} placeholder.
-        for topic_keywords, answer_signals, question_template in fact_patterns.FACT_PATTERNS:
-            # Check that this topic was part of the original investor question
-            topic_relevant = any(kw in q_lower for kw in topic_keywords)
-            if not topic_relevant:
-                continue
+        # The scanners return, in one pass each, the FACT_PATTERNS_LC indexes
+        # whose topic appears in the question / whose signal appears in the answer.
+        candidates = (
+            fact_patterns.FACT_TOPIC_SCANNER.scan(q_lower)
+            & fact_patterns.FACT_SIGNAL_SCANNER.scan(a_lower)
+        )
+        if not candidates:
+            return facts
+
+        deal_name = self.get_deal_name(deal_id) or "the deal"
+
+        for index in sorted(candidates):
+            _, answer_signals, question_template = fact_patterns.FACT_PATTERNS_LC[index]
 
             # Resolve deal_name placeholder in template
             resolved_question = question_template.format(deal_name=deal_name)
@@ -483,7 +558,7 @@ class DealContextService:
         self,
         answer_lower: str,
         answer_original: str,
-        signals: List[str]
+        signals: Sequence[str]
     ) -> Optional[str]:
         """
         Find the first signal phrase in answer_lower, then return the following
@@ -19,6 +19,9 @@ from ...config.database import db
 from ...models.odp_deal_document_chunks import DealDocumentChunk
 from ...models.odp_deal_document import DealDocument
 
+# Services
+from .search_service import vector_literal
+
 
 class DebugService:
     """
@@ -138,7 +141,7 @@ class DebugService:
 
             search = SearchService()
             embedding = search.embedding_service.generate_embedding(question)
-            emb_str = "[" + ",".join(map(str, embedding)) + "]"
+            emb_str = vector_literal(embedding)
 
             rows = db.session.execute(
                 text("""
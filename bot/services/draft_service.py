@@ -6,7 +6,7 @@ Manages both manual draft generation and automatic draft creation after needs_in
 """
 
 # Python Packages
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Services
 from .search_service import SearchService
@@ -16,6 +16,8 @@ from .conversation_service import ConversationService
 from .deal_context_service import DealContextService
 from .query_helper_service import QueryHelper
 from .thread_parser_service import ThreadParserService
+from .io_pool import IO_POOL
+from .embedding_batcher import EMBEDDING_BATCHER
 
 # Database
 from ...config.database import db
@@ -25,7 +27,7 @@ from ...util.exceptions import ServiceException
 from ...util import messages
 
 # Config
-from ..config import bot_config
+from ..config import bot_config, prompts, thresholds
 
 
 class DraftService:
@@ -93,44 +95,73 @@ class DraftService:
                     message="No investor question found in conversation history."
                 )
 
+            # Other questions still waiting on the team — answered in the same draft
+            pending = self.helper.get_pending_questions(history, primary_question=investor_question)
+            if pending:
+                print(f"📋 Batching {len(pending)} more pending question(s) into the draft")
+
             active_deal_id = self.helper.get_deal_from_history(history)
 
+            # Embed every question the draft answers in one batched call, in
+            # the background — both KB searches reuse the vectors, and the API
+            # round trip overlaps the DB reads below
+            questions        = [investor_question] + pending
+            embedding_future = IO_POOL.submit(EMBEDDING_BATCHER.embed_many, questions)
+
+            deal_context     = self.deal_context_service.build_deal_context(active_deal_id) if active_deal_id else ""
+            tone_rules       = self.deal_context_service.get_tone_rules(deal_id=active_deal_id)
+            history_messages = self.helper.build_history_messages(
+                history,
+                max_messages=thresholds.HISTORY_MESSAGES_FOR_DRAFT,
+                max_tokens=thresholds.HISTORY_TOKENS_FOR_DRAFT
+            )
+            summary          = self.helper.build_conversation_summary(history)
+
+            # Thread context — enriches draft with investor's style when available
+            thread_context = self.thread_parser_service.get_thread_context(
+                session_id=conversation.session_id
+            )
+            if thread_context:
+                print("📧 Thread context injected into draft prompt")
+
+            try:
+                embeddings = embedding_future.result()
+            except Exception as exc:
+                print(f"⚠️  Question embedding failed: {exc}")
+                embeddings = [None]   # primary question only — each search embeds it on its own
+
             # Dynamic KB first, then static — same priority order as main flow
             dynamic_context = self.deal_context_service.search_dynamic_kb(
                 question=investor_question,
                 deal_id=active_deal_id,
                 top_k=5,
-                similarity_threshold=similarity_threshold
+                similarity_threshold=similarity_threshold,
+                embedding=embeddings[0],
+                more_embeddings=embeddings[1:]
             )
-            chunks      = self.search_service.search_similar_chunks(
-                question=investor_question,
+            chunks       = self._search_chunks(
+                questions=questions[:len(embeddings)],
+                embeddings=embeddings,
                 deal_id=active_deal_id,
                 top_k=top_k,
                 similarity_threshold=similarity_threshold
             )
             doc_context  = self.context_builder.build_context(chunks)
-            full_context = self.helper.merge_context(dynamic_context, doc_context)
-
-            deal_context     = self.deal_context_service.build_deal_context(active_deal_id) if active_deal_id else ""
-            tone_rules       = self.deal_context_service.get_tone_rules(deal_id=active_deal_id)
-            history_messages = self.helper.build_history_messages(history, max_messages=10)
-            summary          = self.helper.build_conversation_summary(history)
-
-            # Thread context — enriches draft with investor's style when available
-            thread_context = self.thread_parser_service.get_thread_context(
-                session_id=conversation.session_id
+            full_context = self.helper.merge_context(
+                dynamic_context,
+                doc_context,
+                max_tokens=self.helper.kb_context_budget(prompts.PromptMode.DRAFT, tone_rules, history_messages)
             )
-            if thread_context:
-                print("📧 Thread context injected into draft prompt")
 
             draft = self.answer_generator.generate_draft_email(
-                original_investor_question = investor_question,
+                original_investor_question = self.helper.format_question_batch(investor_question, pending),
                 user_supplied_info         = summary,
                 tone_rules                 = tone_rules,
                 deal_context               = deal_context,
                 doc_context                = full_context,
                 thread_context             = thread_context,
-                history_messages           = history_messages
+                history_messages           = history_messages,
+                cache_key                  = conversation.session_id
             )
 
             self.conversation_service.add_message(
@@ -161,6 +192,31 @@ class DraftService:
                 details=str(error)
             )
 
+    def _search_chunks(
+        self,
+        questions: List[str],
+        embeddings: List[Optional[List[float]]],
+        deal_id: Optional[int],
+        top_k: int,
+        similarity_threshold: float
+    ) -> List[Tuple]:
+        """
+        Static KB chunks for every question in a batched draft, merged: each
+        chunk once (at its best similarity), most similar first.
+        """
+        best = {}   # chunk_id → chunk tuple
+        for question, embedding in zip(questions, embeddings):
+            for chunk in self.search_service.search_similar_chunks(
+                question=question,
+                deal_id=deal_id,
+                top_k=top_k,
+                similarity_threshold=similarity_threshold,
+                embedding=embedding
+            ):
+                if chunk[3] not in best or chunk[2] > best[chunk[3]][2]:
+                    best[chunk[3]] = chunk
+        return sorted(best.values(), key=lambda chunk: chunk[2], reverse=True)
+
     # ── User-Supplied Answer Handler ───────────────────────────────────────────
 
     def handle_user_supplied_answer(
@@ -199,6 +255,10 @@ class DraftService:
         """
         print(f"💾 User supplied answer | pending Q: \"{pending_question[:60]}...\"")
 
+        # The question embedding for both re-searches below is fetched while
+        # the answer is being stored
+        embedding_future = IO_POOL.submit(EMBEDDING_BATCHER.embed, pending_question)
+
         # Store the answer — decomposed into individual facts for precise retrieval
         self.deal_context_service.store_dynamic_kb_with_decomposition(
             deal_id           = active_deal_id,
@@ -207,25 +267,41 @@ class DraftService:
             created_by        = user_id
         )
 
-        # Re-run both tiers for draft context (Dynamic first)
+        # Re-run both tiers for draft context (Dynamic first) — one question embedding for both
+        try:
+            embedding = embedding_future.result()
+        except Exception as exc:
+            print(f"⚠️  Question embedding failed: {exc}")
+            embedding = None   # each search embeds on its own
+
         dynamic_context = self.deal_context_service.search_dynamic_kb(
             question=pending_question,
             deal_id=active_deal_id,
             top_k=5,
-            similarity_threshold=similarity_threshold
+            similarity_threshold=similarity_threshold,
+            embedding=embedding
         )
         chunks      = self.search_service.search_similar_chunks(
             question=pending_question,
             deal_id=active_deal_id,
             top_k=top_k,
-            similarity_threshold=similarity_threshold
+            similarity_threshold=similarity_threshold,
+            embedding=embedding
         )
-        doc_context  = self.context_builder.build_context(chunks)
-        full_context = self.helper.merge_context(dynamic_context, doc_context)
-
         deal_context     = self.deal_context_service.build_deal_context(active_deal_id)
         tone_rules       = self.deal_context_service.get_tone_rules(deal_id=active_deal_id)
-        history_messages = self.helper.build_history_messages(history, max_messages=10)
+        history_messages = self.helper.build_history_messages(
+            history,
+            max_messages=thresholds.HISTORY_MESSAGES_FOR_DRAFT,
+            max_tokens=thresholds.HISTORY_TOKENS_FOR_DRAFT
+        )
+
+        doc_context  = self.context_builder.build_context(chunks)
+        full_context = self.helper.merge_context(
+            dynamic_context,
+            doc_context,
+            max_tokens=self.helper.kb_context_budget(prompts.PromptMode.DRAFT, tone_rules, history_messages)
+        )
         summary          = self.helper.build_conversation_summary(history, user_answer)
 
         # Thread context — enriches draft with investor's style when available
@@ -240,7 +316,8 @@ class DraftService:
             deal_context               = deal_context,
             doc_context                = full_context,
             thread_context             = thread_context,
-            history_messages           = history_messages
+            history_messages           = history_messages,
+            cache_key                  = conversation.session_id
         )
 
         self.conversation_service.add_message(
@@ -0,0 +1,137 @@
+"""
+Service: EmbeddingBatcher
+=========================
+Coalesces question embeddings from concurrent requests into one API call.
+
+Every /ask embeds exactly one short question. When several requests do so at
+the same moment (threaded workers), each pays its own HTTPS round trip. The
+batcher instead queues the texts; a background thread waits up to
+BOT_EMBED_BATCH_WINDOW_MS after the first one arrives, then sends everything
+queued (up to BOT_EMBED_BATCH_MAX texts, duplicates once) in a single
+embeddings request and hands each caller its vector.
+
+Usage:
+    from .embedding_batcher import EMBEDDING_BATCHER
+    vector  = EMBEDDING_BATCHER.embed(question)         # blocks until the batch returns
+    vectors = EMBEDDING_BATCHER.embed_many(questions)   # several texts, one call
+
+A single request alone waits at most the window (a few ms) extra. Errors from
+the API are re-raised in every caller of that batch. A caller still waiting
+after BOT_EMBED_BATCH_TIMEOUT_SECONDS stops waiting and calls the API itself,
+so a stuck batch never blocks a request for good.
+"""
+
+# Python Packages
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import List
+
+# Vendors
+from ...vendors import EmbeddingService
+
+# Config
+from ..config import bot_config
+
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    Thread-safe embedding front end with a short coalescing window.
+    The worker thread and the EmbeddingService client start on first use.
+    """
+
+    def __init__(
+        self,
+        window_ms: float = bot_config.BOT_EMBED_BATCH_WINDOW_MS,
+        max_batch: int = bot_config.BOT_EMBED_BATCH_MAX,
+        timeout: float = bot_config.BOT_EMBED_BATCH_TIMEOUT_SECONDS
+    ):
+        self.window    = window_ms / 1000
+        self.max_batch = max_batch
+        self.timeout   = timeout
+        self._pending  = queue.SimpleQueue()   # (text, Future)
+        self._service  = None
+        self._lock     = threading.Lock()
+
+
+    def embed(self, text: str) -> List[float]:
+        """ Return the embedding of *text*, batched with any concurrent callers. """
+        return self.embed_many([text])[0]
+
+
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """ Embeddings of *texts*, in order — queued together, so they share one API call. """
+        self._start()
+        futures = [Future() for _ in texts]
+        for text, future in zip(texts, futures):
+            self._pending.put((text, future))
+
+        deadline = time.monotonic() + self.timeout
+        try:
+            return [future.result(timeout = max(0.0, deadline - time.monotonic())) for future in futures]
+        except FutureTimeout:
+            logger.warning("⚠️  Embedding batch timed out after %ss — embedding %d text(s) directly", self.timeout, len(texts))
+            return self._service.generate_embeddings_batch(texts, batch_size = self.max_batch)
+
+
+    # ── Private ────────────────────────────────────────────────────────────────
+    def _start(self) -> None:
+        """ Create the client and the worker thread once per process. """
+        if self._service is not None:
+            return
+        with self._lock:
+            if self._service is None:
+                service = EmbeddingService()
+                threading.Thread(target = self._run, name = "embedding-batcher", daemon = True).start()
+                self._service = service
+
+
+    def _run(self) -> None:
+        """
+        Worker loop: collect one window's worth of texts, embed them in one call.
+        Any failure is handed to the batch's waiting callers — the loop itself
+        never dies, or every later embed() would wait for nothing.
+        """
+        while True:
+            batch = [self._pending.get()]
+            try:
+                self._fill(batch)
+
+                unique  = list(dict.fromkeys(text for text, _ in batch))
+                vectors = dict(zip(unique, self._service.generate_embeddings_batch(
+                    unique, batch_size = self.max_batch
+                )))
+
+                if len(batch) > 1:
+                    logger.debug("🧮 Embedded %d questions in one call", len(batch))
+                for text, future in batch:
+                    future.set_result(vectors[text])
+
+            except Exception as exc:
+                logger.warning("⚠️  Embedding batch of %d failed: %s", len(batch), exc)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+
+    def _fill(self, batch: list) -> None:
+        """ Add texts queued within the window after batch[0] (up to max_batch). """
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                return
+            try:
+                batch.append(self._pending.get(timeout = timeout))
+            except queue.Empty:
+                return
+
+
+
+# One batcher per process — shared by every service that embeds questions.
+EMBEDDING_BATCHER = EmbeddingBatcher()
@@ -12,14 +12,15 @@ Effect:
 Design:
   - The extraction prompt lives in config/prompts.py (FACT_EXTRACTOR_SYSTEM_PROMPT).
   - LLM settings live in config/llm_config.py.
-  - Uses the LLM to extract structured JSON from the user's message.
+  - Uses the LLM to extract structured JSON from the user's message; the
+    shape is enforced by the provider (FACT_EXTRACTOR_SCHEMA), not parsed
+    out of free text.
   - Stores with approval_status='approved' immediately (team = trusted source).
   - If fact_key already exists for the deal → updates value (upsert).
   - Skips greetings, questions, and messages with no clear factual value.
 """
 
 # Python Packages
-import json
 from datetime import date, datetime
 from typing import Optional, Dict
 
@@ -73,8 +74,8 @@ class FactExtractorService:
         if not extracted or not extracted.get("is_fact"):
             return None
 
-        fact_key   = extracted.get("fact_key", "").strip().lower().replace(" ", "_")
-        fact_value = extracted.get("fact_value", "").strip()
+        fact_key   = (extracted.get("fact_key") or "").strip().lower().replace(" ", "_")
+        fact_value = (extracted.get("fact_value") or "").strip()
 
         if not fact_key or not fact_value:
             return None
@@ -100,7 +101,7 @@ class FactExtractorService:
             return True
 
         # FACT_EXTRACTOR_SKIP_STARTERS lives in config/keywords.py — edit it there.
-        if any(text.startswith(g) for g in keywords.FACT_EXTRACTOR_SKIP_STARTERS) and len(text) < 30:
+        if text.startswith(keywords.FACT_EXTRACTOR_SKIP_STARTERS) and len(text) < 30:
             return True
 
         return False
@@ -108,7 +109,7 @@ class FactExtractorService:
     def _extract_via_llm(self, message: str, conversation_context: str = "") -> Optional[Dict]:
         """
         Call the LLM to extract a structured fact from *message*.
-        The system prompt is defined in config/prompts.py.
+        The system prompt and output schema are defined in config/prompts.py.
         """
         try:
             user_content = message
@@ -118,18 +119,17 @@ class FactExtractorService:
                     f"Team member replied:\n{message}"
                 )
 
-            response = self.chat_service.generate_response(
+            return self.chat_service.generate_json(
                 messages=[
                     {"role": "system", "content": prompts.FACT_EXTRACTOR_SYSTEM_PROMPT},
                     {"role": "user",   "content": user_content}
                 ],
-                temperature = llm_config.LLM_FACT_EXTRACTOR_TEMPERATURE,
-                max_tokens  = llm_config.LLM_FACT_EXTRACTOR_MAX_TOKENS
+                schema      = prompts.FACT_EXTRACTOR_SCHEMA,
+                schema_name = prompts.FACT_EXTRACTOR_SCHEMA_NAME,
+                temperature = llm_config.FACT_EXTRACTOR.temperature,
+                max_tokens  = llm_config.FACT_EXTRACTOR.max_tokens
             )
 
-            clean = response.strip().strip("```json").strip("```").strip()
-            return json.loads(clean)
-
         except Exception as exc:
             print(f"⚠️  FactExtractor LLM call failed: {exc}")
             return None
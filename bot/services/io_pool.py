@@ -0,0 +1,19 @@
+"""
+Service: IO_POOL
+================
+One process-wide thread pool for network-only work (embedding API calls)
+that the bot pipelines overlap with their own DB reads.
+
+Rules for anything submitted here:
+  - no db.session access — the session is bound to the request's app context
+  - no Flask request / g access — workers run outside the request
+  - catch your own errors, or call .result() in a try block
+"""
+
+# Python Packages
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Sized for a few concurrent requests per worker process; each request
+# submits at most one job at a time.
+IO_POOL = ThreadPoolExecutor(max_workers = 8, thread_name_prefix = "bot-io")
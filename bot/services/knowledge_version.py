@@ -0,0 +1,83 @@
+"""
+Service: Knowledge Version
+==========================
+Cross-process invalidation for the first-turn answer caches.
+
+AnswerCache / SemanticAnswerCache live in each worker process, so clearing
+them only helps the process that learned about the change. Every change to a
+deal's knowledge therefore also bumps that deal's counter in
+odp_knowledge_versions (see models/odp_knowledge_version.py), and the cache
+key carries the counters — once any process bumps, every process misses
+and recomputes.
+
+    bump_knowledge_version(deal_id)   after new chunks / team facts are committed
+    bump_knowledge_version(None)      invalidate every deal
+    knowledge_version(deal_id)        part of AnswerCache.key()
+
+Both run on the caller's db.session, inside its app context.
+"""
+
+# Python Packages
+import logging
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+
+# Database
+from ...config.database import db
+
+
+logger = logging.getLogger(__name__)
+
+# Reserved rows — see models/odp_knowledge_version.py
+ANY_DEAL   = 0    # bumped with every deal; versions all-deal answers
+FULL_FLUSH = -1   # bumped by a full flush; part of every key
+
+_BUMP_SQL = text("""
+    INSERT INTO odp_knowledge_versions (deal_id, version)
+    SELECT scope, 1 FROM unnest(CAST(:scopes AS integer[])) AS scope
+    ON CONFLICT (deal_id) DO UPDATE
+    SET version    = odp_knowledge_versions.version + 1,
+        updated_at = now()
+""")
+
+_READ_SQL = text("""
+    SELECT deal_id, version
+    FROM odp_knowledge_versions
+    WHERE deal_id IN (:scope, :full_flush)
+""")
+
+
+
+
+
+def bump_knowledge_version(deal_id: Optional[int]) -> None:
+    """
+    Mark *deal_id*'s knowledge (or, with None, every deal's) as changed, and
+    commit. Never raises — a failed bump is logged, and cached answers then
+    fall back to expiring after BOT_ANSWER_CACHE_TTL_SECONDS.
+    """
+    scopes = [FULL_FLUSH] if deal_id is None else [deal_id, ANY_DEAL]
+    try:
+        db.session.execute(_BUMP_SQL, {"scopes": scopes})
+        db.session.commit()
+    except Exception as exc:
+        db.session.rollback()
+        logger.warning("⚠️  Knowledge version bump failed (deal_id=%s): %s", deal_id, exc)
+
+
+
+def knowledge_version(deal_id: Optional[int]) -> Optional[Tuple[int, int]]:
+    """
+    (scope version, full-flush version) for *deal_id* — ANY_DEAL's counter
+    when deal_id is None. Missing rows count as 0. None if the read fails,
+    in which case the caller should not use its cache for this request.
+    """
+    scope = ANY_DEAL if deal_id is None else deal_id
+    try:
+        versions = dict(db.session.execute(_READ_SQL, {"scope": scope, "full_flush": FULL_FLUSH}).all())
+    except Exception as exc:
+        db.session.rollback()
+        logger.warning("⚠️  Knowledge version read failed (deal_id=%s): %s", deal_id, exc)
+        return None
+    return versions.get(scope, 0), versions.get(FULL_FLUSH, 0)
@@ -10,17 +10,31 @@ Examples:
   Enhanced: "What is the revenue of SpaceX?"
 
 The LLM is only called when the question contains vague indicators (pronouns,
-short metric-only queries). Clear questions pass through unchanged.
+short metric-only queries). Clear questions pass through unchanged, and the
+trivial cases — a lone "the company"/"its" reference or a bare metric — are
+resolved by rule against the company named in the latest exchange, with no
+LLM call.
 """
 
 # Python Packages
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional, Pattern, Sequence, Tuple
 
 # Vendors
 from ...vendors import ChatService
 
 # Config
 from ..config import prompts, llm_config, keywords
+from ..config.matchers import compile_phrases
+
+
+
+@lru_cache(maxsize = 8)   # the active-deal list rarely changes
+def _company_matcher(deal_names: Tuple[str, ...]) -> Pattern:
+    """ keywords.COMPANY_NAME_MATCHER widened with the (lowercased) active deal names. """
+    if not deal_names:
+        return keywords.COMPANY_NAME_MATCHER
+    return compile_phrases(keywords.COMPANY_NAMES | set(deal_names))
 
 
 class QueryEnhancementService:
@@ -33,9 +47,16 @@ class QueryEnhancementService:
         self.chat_service = ChatService()
 
 
-    def enhance_query(self, current_question: str, conversation_history: List[Dict]) -> str:
+    def enhance_query(
+        self,
+        current_question: str,
+        conversation_history: List[Dict],
+        deal_names: Sequence[str] = ()
+    ) -> str:
         """
         Rewrite *current_question* to be self-contained using history context.
+        *deal_names* (the active deals) extend the companies the rule-based
+        rewrite recognises.
 
         Returns the original question unchanged if:
           - history is too short to help
@@ -48,9 +69,15 @@ class QueryEnhancementService:
         if not self._needs_enhancement(current_question):
             return current_question
 
+        # Trivial references are resolved by rule — no LLM round-trip
+        rewritten = self._rewrite_deterministic(current_question, conversation_history, deal_names)
+        if rewritten:
+            print(f"🔄 Enhanced (rule-based): '{current_question}' → '{rewritten}'")
+            return rewritten
+
         history_text = self._build_history_text(conversation_history)
 
-        user_prompt = prompts.QUERY_REWRITER_USER_TEMPLATE.format(
+        user_prompt = prompts.QUERY_REWRITER_USER_RENDER(
             history_text     = history_text,
             current_question = current_question
         )
@@ -63,8 +90,8 @@ class QueryEnhancementService:
         try:
             enhanced = self.chat_service.generate_response(
                 messages    = messages,
-                temperature = llm_config.LLM_QUERY_REWRITER_TEMPERATURE,
-                max_tokens  = llm_config.LLM_QUERY_REWRITER_MAX_TOKENS
+                temperature = llm_config.QUERY_REWRITER.temperature,
+                max_tokens  = llm_config.QUERY_REWRITER.max_tokens
             ).strip().strip('"').strip("'")
         except Exception as exc:
             print(f"⚠️  QueryEnhancement LLM call failed: {exc}")
@@ -89,23 +116,93 @@ class QueryEnhancementService:
         """
         question_lower = question.lower()
 
-        for word in keywords.VAGUE_WORDS:
-            if word in question_lower:
-                return True
+        # Each phrase list is one precompiled whole-word scan (see keywords.py)
+        if keywords.VAGUE_WORD_MATCHER.search(question_lower):
+            return True
 
         words = question.split()
+        if len(words) > 5:
+            return False
+
+        if keywords.COMPANY_NAME_MATCHER.search(question_lower):
+            return False
 
         if len(words) < 4:
-            if not any(c in question_lower for c in keywords.COMPANY_NAMES):
-                return True
+            return True
+
+        return keywords.METRIC_WORD_MATCHER.search(question_lower) is not None
 
-        if len(words) <= 5:
-            for metric in keywords.METRIC_ONLY_PATTERNS:
-                if metric in question_lower:
-                    if not any(c in question_lower for c in keywords.COMPANY_NAMES):
-                        return True
+    def _rewrite_deterministic(
+        self,
+        question: str,
+        history: List[Dict],
+        deal_names: Sequence[str] = ()
+    ) -> Optional[str]:
+        """
+        Resolve the mechanical follow-ups without the LLM.
+
+          Latest exchange names SpaceX:
+            "What about revenue?"        → "What is the revenue of SpaceX?"
+            "When does the deal close?"  → "When does SpaceX close?"
+            "What is its valuation?"     → "What is SpaceX's valuation?"
 
-        return False
+        Returns None — the caller falls back to the LLM — whenever the rules
+        cannot resolve the reference unambiguously.
+        """
+        question_lower = question.lower()
+        if len(question_lower) != len(question):
+            return None   # spans below index both strings
+        companies = _company_matcher(tuple(sorted({n.strip().lower() for n in deal_names if n and n.strip()})))
+        if companies.search(question_lower):
+            return None
+
+        entity = self._last_named_company(history, companies)
+        if not entity:
+            return None
+
+        vague = list(keywords.VAGUE_WORD_MATCHER.finditer(question_lower))
+
+        # Exactly one reference to "the company under discussion" → substitute it
+        if vague:
+            if len(vague) != 1:
+                return None
+            reference = vague[0].group(0)
+            if reference in keywords.ENTITY_POSSESSIVES:
+                replacement = f"{entity}'s"
+            elif reference in keywords.ENTITY_REFERENCES:
+                replacement = entity
+            else:
+                return None
+            start, end = vague[0].span()
+            return question[:start] + replacement + question[end:]
+
+        # Bare metric follow-up ("revenue?", "what about growth?")
+        if len(question.split()) <= 3:
+            metrics = {m.group(0) for m in keywords.METRIC_WORD_MATCHER.finditer(question_lower)}
+            if len(metrics) == 1:
+                return f"What is the {metrics.pop()} of {entity}?"
+
+        return None
+
+    def _last_named_company(self, history: List[Dict], companies: Pattern) -> Optional[str]:
+        """
+        Return the company named in the latest user/assistant exchange (the
+        newest message that names one), as written there. None if that
+        exchange names no company *companies* knows — an older mention may be
+        stale, so the LLM rewriter reads the whole history instead — or if the
+        message names several.
+        """
+        for msg in reversed(history[-2:]):
+            content = msg.get("content") or ""
+            lower   = content.lower()
+            matches = list(companies.finditer(lower))
+            if not matches:
+                continue
+            if len({m.group(0) for m in matches}) > 1:
+                return None
+            last = matches[-1]
+            return content[last.start():last.end()] if len(lower) == len(content) else last.group(0)
+        return None
 
     def _build_history_text(self, history: List[Dict]) -> str:
         """
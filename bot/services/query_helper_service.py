@@ -13,7 +13,7 @@ from ...config.database import db
 from ...models.odp_deal_document import DealDocument
 
 # Config
-from ..config import thresholds
+from ..config import keywords, prompts, thresholds
 
 
 class QueryHelper:
@@ -22,16 +22,87 @@ class QueryHelper:
     """
 
     # ── Context Merging ────────────────────────────────────────────────────────
-    def merge_context(self, dynamic_context: str, doc_context: str) -> str:
+    def merge_context(
+        self,
+        dynamic_context: str,
+        doc_context: str,
+        max_tokens: int = thresholds.KB_CONTEXT_MAX_TOKENS
+    ) -> str:
         """
         Merge Dynamic KB and Static KB context strings.
         Dynamic KB is always placed first so the LLM gives it higher priority.
+
+        The result fits in max_tokens. Team facts keep up to
+        KB_CONTEXT_FACTS_SHARE of it no matter how long the documents are;
+        documents get whatever the facts leave. The tail — lowest-ranked
+        passages — is what gets cut.
         """
+        facts_tokens = prompts.count_tokens(dynamic_context) if dynamic_context else 0
+        doc_tokens   = prompts.count_tokens(doc_context) if doc_context else 0
+
+        total_tokens = facts_tokens + doc_tokens
+
+        if total_tokens > max_tokens:
+            facts_budget = max(int(max_tokens * thresholds.KB_CONTEXT_FACTS_SHARE), max_tokens - doc_tokens)
+            if facts_tokens > facts_budget:
+                dynamic_context = prompts.truncate_to_tokens(dynamic_context, facts_budget)
+                facts_tokens    = facts_budget
+            if doc_context:
+                doc_context = prompts.truncate_to_tokens(doc_context, max_tokens - facts_tokens)
+            print(f"✂️  KB context trimmed from {total_tokens} to {max_tokens} tokens")
+
         if dynamic_context and doc_context:
             return dynamic_context + "\n\n" + doc_context
         return dynamic_context or doc_context
 
 
+    def kb_context_budget(
+        self,
+        mode: prompts.PromptMode,
+        tone_rules: str,
+        history_messages: List[Dict]
+    ) -> int:
+        """
+        Token budget for merge_context(): KB_CONTEXT_MAX_TOKENS, or less when
+        the system prompt for *mode* (static part precounted in prompts.py)
+        and the history turns leave less of PROMPT_INPUT_MAX_TOKENS.
+        """
+        reserved = prompts.system_prompt_tokens(mode, tone_rules or "") + sum(
+            prompts.count_tokens(msg["content"]) for msg in history_messages
+        )
+        return max(0, min(thresholds.KB_CONTEXT_MAX_TOKENS, thresholds.PROMPT_INPUT_MAX_TOKENS - reserved))
+
+
+    # ── Question Compression ───────────────────────────────────────────────────
+    def compress_question(self, question: str) -> str:
+        """
+        Trim prompt tokens from a user question without changing its meaning.
+
+          - collapses whitespace
+          - drops a leading greeting ("Hi team, what is the fee?" → "what is the fee?"),
+            but only when business words follow it
+          - drops HEDGE_WORDS ("kindly", "basically", ...)
+          - keeps at most QUESTION_MAX_WORDS words
+
+        Original casing is kept — only the matching is case-insensitive.
+        """
+        words = question.split()
+        bare  = [w.strip(",.!?;:-–—").lower() for w in words]
+
+        # Leading greeting + social filler, e.g. "Hello bot, good morning —"
+        start = 0
+        if bare and bare[0] in keywords.GREETING_STARTERS:
+            while start < len(words) and (not bare[start] or bare[start] in keywords.SOCIAL_FILLER_WORDS):
+                if " ".join(bare[start:start + 2]) in keywords.BUSINESS_KEYWORDS:
+                    break   # "how much", "is there" ... — the question itself starts here
+                start += 1
+            if start == len(words) or keywords.BUSINESS_MATCHER.search(" ".join(bare[start:])) is None:
+                start = 0   # nothing business-like follows — keep the message as is
+
+        kept = [w for w, b in zip(words[start:], bare[start:]) if b not in keywords.HEDGE_WORDS]
+        return " ".join(kept[:thresholds.QUESTION_MAX_WORDS]) or question.strip()
+
+
     # ── Pending Question Detection ─────────────────────────────────────────────
     def get_pending_question(self, history: List[Dict]) -> Optional[Dict]:
         """
@@ -57,6 +128,51 @@ class QueryHelper:
         return None
 
 
+    def get_pending_questions(self, history: List[Dict], primary_question: str = "") -> List[str]:
+        """
+        Investor questions the bot asked the team about (needs_info) that no
+        draft has answered yet, oldest first, without duplicates or
+        *primary_question* itself.
+
+        A needs_info followed by a draft_email is settled — the team's answer
+        (or the Generate Draft button) already produced that draft.
+
+        Used by draft generation so all open items are answered in ONE email
+        (one LLM call) instead of only the most recent one.
+        """
+        seen    = {" ".join(primary_question.lower().split())}
+        pending = []
+        drafted = False
+        for msg in reversed(history or []):
+            if msg.get("role") != "assistant":
+                continue
+            meta = msg.get("metadata") or {}
+            if meta.get("type") == "draft_email":
+                drafted = True
+                continue
+            if meta.get("type") != "needs_info" or drafted:
+                continue
+            question = (meta.get("investor_question") or "").strip()
+            key      = " ".join(question.lower().split())
+            if question and key not in seen:
+                seen.add(key)
+                pending.append(question)
+        return pending[::-1]
+
+
+    def format_question_batch(self, primary_question: str, pending: List[str]) -> str:
+        """
+        Fold the primary question and the other pending ones into a numbered
+        list, so a single draft prompt covers all of them.
+        """
+        if not pending:
+            return primary_question
+        questions = [primary_question] + pending
+        lines     = [f"{i}) {q}" for i, q in enumerate(questions, 1)]
+        lines.append("\nAnswer every numbered question above in the same email.")
+        return "\n".join(lines)
+
+
     # ── Investor Question Resolution ───────────────────────────────────────────
     def resolve_investor_question(self, history: List[Dict], current_question: str = "") -> str:
         """
@@ -122,10 +238,16 @@ class QueryHelper:
 
 
     # ── History Processing ─────────────────────────────────────────────────────
-    def build_history_messages(self, history: List[Dict], max_messages: int = 6) -> List[Dict]:
+    def build_history_messages(
+        self,
+        history: List[Dict],
+        max_messages: int = thresholds.HISTORY_MESSAGES_FOR_ANSWER,
+        max_tokens: int = thresholds.HISTORY_TOKENS_FOR_ANSWER
+    ) -> List[Dict]:
         """
         Convert DB history to LLM turn dicts.
-        Truncates long assistant messages to keep prompts manageable.
+        Truncates long assistant messages to keep prompts manageable, and
+        keeps only the newest turns that fit within max_tokens.
         """
         if not history:
             return []
@@ -141,6 +263,15 @@ class QueryHelper:
                     content = content[:thresholds.ASSISTANT_MESSAGE_TRUNCATE_LENGTH] + "..."
                 result.append({"role": role, "content": content})
 
+        # Newest first until the budget is spent — a run of long pasted
+        # messages can no longer push the prompt past max_tokens
+        used = 0
+        for index in range(len(result) - 1, -1, -1):
+            used += prompts.count_tokens(result[index]["content"])
+            if used > max_tokens:
+                print(f"✂️  History trimmed to {len(result) - index - 1} of {len(result)} turns (token budget)")
+                return result[index + 1:]
+
         return result
 
 
@@ -28,7 +28,7 @@ draft_email   Team replied → KB updated → draft ready to send
 """
 
 # Python Packages
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 # Services
 from .query_enhancement_service import QueryEnhancementService
@@ -42,6 +42,10 @@ from .draft_service import DraftService
 from .question_analyzer_service import QuestionAnalyzerService
 from .query_helper_service import QueryHelper
 from .thread_parser_service import ThreadParserService
+from .answer_cache import AnswerCache, SemanticAnswerCache
+from .knowledge_version import bump_knowledge_version, knowledge_version
+from .io_pool import IO_POOL
+from .embedding_batcher import EMBEDDING_BATCHER
 
 # Database
 from ...config.database import db
@@ -51,7 +55,12 @@ from ...util.exceptions import ServiceException
 from ...util import messages
 
 # Config
-from ..config import bot_config, thresholds
+from ..config import bot_config, llm_config, prompts, thresholds
+
+
+# Joins a needs_info partial answer and its info request — in the stored
+# message and in the streamed text alike
+_INFO_REQUEST_SEPARATOR = "\n\n---\n"
 
 
 
@@ -85,6 +94,8 @@ class QueryService:
         self.question_analyzer         = QuestionAnalyzerService()
         self.helper                    = QueryHelper()
         self.thread_parser_service     = ThreadParserService()
+        self.answer_cache              = AnswerCache()
+        self.semantic_cache            = SemanticAnswerCache()
 
 
 
@@ -96,7 +107,8 @@ class QueryService:
         deal_id: Optional[int] = None,
         session_id: Optional[str] = None,
         top_k: int = bot_config.BOT_DEFAULT_TOP_K,
-        similarity_threshold: float = bot_config.BOT_SIMILARITY_THRESHOLD
+        similarity_threshold: float = bot_config.BOT_SIMILARITY_THRESHOLD,
+        on_token: Optional[Callable[[str], None]] = None
     ) -> Dict:
         """
         Process one user message through the full RAG pipeline.
@@ -108,6 +120,11 @@ class QueryService:
             session_id:           Existing session UUID, or None for new session.
             top_k:                Max chunks per search tier.
             similarity_threshold: Min cosine similarity for chunk inclusion.
+            on_token:             Optional callback fed the Step 15 answer text
+                                  as it streams — followed, for needs_info, by
+                                  the "---" separator and the Step 16 info
+                                  request. The returned dict is always the
+                                  final word.
 
         Returns:
             Response dict with "response_type" and "session_id".
@@ -121,13 +138,19 @@ class QueryService:
             print(f"❓ Question: {question}")
             print(f"{'='*60}")
 
+            # Lowercased once — every keyword / deal-name check below reuses it
+            question_lower = question.lower()
+
             # ── Step 1: Session ────────────────────────────────────────────────
             conversation = self.conversation_service.get_or_create_conversation(
                 session_id = session_id, user_id = user_id
             )
 
             # ── Step 2: History ────────────────────────────────────────────────
-            history = self.conversation_service.get_conversation_history(
+            # A session created just now has no messages and no pasted thread,
+            # so its history and thread lookups are skipped outright.
+            new_session = session_id is None
+            history     = [] if new_session else self.conversation_service.get_conversation_history(
                 session_id = conversation.session_id,
                 limit = bot_config.BOT_LAST_CONVERSATION_MESSAGES_LIMIT
             )
@@ -139,14 +162,14 @@ class QueryService:
             active_deal_id = deal_id
 
             # Check thread first — if team member pasted a thread, deal may already be identified from it (highest confidence source).
-            if active_deal_id is None and conversation.session_id:
+            if active_deal_id is None and not new_session:
                 active_deal_id = self.thread_parser_service.get_thread_deal_id(
                     session_id = conversation.session_id
                 )
 
             if active_deal_id is None:
                 active_deal_id = self.deal_context_service.detect_deal_in_text(
-                    text = question, all_deals = all_deals
+                    text = question, all_deals = all_deals, text_lower = question_lower
                 )
  
             if active_deal_id is None:
@@ -163,12 +186,28 @@ class QueryService:
                 deal_id = active_deal_id
             )
 
+            # ── Step 5b: Answer cache (first message of a new session) ────────
+            # No history, thread or pending request yet → the outcome depends
+            # only on (question, deal, top_k, tone, knowledge version). Replay
+            # it into this session. Tone rules come from the tone cache; the
+            # version is one primary-key read, shared by every worker process.
+            version   = knowledge_version(active_deal_id) if new_session else None
+            cache_key = AnswerCache.key(
+                question, active_deal_id, top_k,
+                self.deal_context_service.get_tone_rules(deal_id = active_deal_id),
+                version
+            ) if version is not None else None
+            cached    = self.answer_cache.get(cache_key) if cache_key else None
+            if cached:
+                print("⚡ Answer cache hit — replaying cached outcome")
+                return self._replay(conversation, cached)
+
             # ── Step 6: Greeting short-circuit ────────────────────────────────
             # MUST run before the pending needs_info check.
             # If the user says "Hello" after a needs_info message, we should greet
             # them back — NOT treat "Hello" as the missing answer.
             # MAY BE THIS LOGIC, WE CAN REMOVE IT IN FUTURE [RAGHAV GARG] 2026-02-23
-            if self.question_analyzer.is_greeting(question):
+            if self.question_analyzer.is_greeting(question, question_lower = question_lower):
                 # Get Tone Rules
                 tone_rules = self.deal_context_service.get_tone_rules(deal_id = active_deal_id)
 
@@ -177,24 +216,16 @@ class QueryService:
                     question = question,
                     tone_rules = tone_rules
                 )
-                self.conversation_service.add_message(
-                    conversation_id = conversation.conversation_id,
-                    role = "assistant", 
-                    content = reply,
-                    deal_id = active_deal_id,
-                    metadata = {"type": "greeting"}
-                )
                 print("👋 Greeting handled — skipping RAG and pending check")
-                return {
+                return self._respond(conversation, cache_key, {
                     "response_type":     "answer",
                     "answer":            reply,
                     "sources":           [],
                     "chunks_found":      0,
                     "confidence":        "high",
-                    "session_id":        conversation.session_id,
                     "active_deal_id":    active_deal_id,
                     "show_draft_button": False
-                }
+                }, reply, active_deal_id, {"type": "greeting"})
 
             # ── Step 7: Pending needs_info check ───────────────────────────────
             # Only reaches here when the message is NOT a greeting.
@@ -206,8 +237,8 @@ class QueryService:
 
             pending = self.helper.get_pending_question(history)
 
-            if pending and active_deal_id and not self.question_analyzer.is_new_question(question):
-                return self.draft_service.handle_user_supplied_answer(
+            if pending and active_deal_id and not self.question_analyzer.is_new_question(question, question_lower = question_lower):
+                result = self.draft_service.handle_user_supplied_answer(
                     conversation         = conversation,
                     user_answer          = question,
                     pending_question     = pending["investor_question"],
@@ -217,13 +248,46 @@ class QueryService:
                     top_k                = top_k,
                     similarity_threshold = similarity_threshold
                 )
+                # The team just added facts to this deal's Dynamic KB — its cached answers may be stale
+                self.clear_answer_caches(deal_id = active_deal_id)
+                return result
+
+            # ── Step 7b: Compress the question for the LLM prompts ─────────────
+            # The stored message and the cache key keep the original text.
+            question       = self.helper.compress_question(question)
+            question_lower = question.lower()
 
             # ── Step 8: Query enhancement (resolve pronouns) ───────────────────
             enhanced_question = self.query_enhancement_service.enhance_query(
                 current_question=question,
-                conversation_history=history
+                conversation_history=history,
+                deal_names=[deal["deal_name"] for deal in all_deals]
+            )
+
+            # ── Step 8b: Embed once (shared by both KB tiers + semantic cache) ──
+            # The embedding API call runs in the background while this thread
+            # does the DB reads Step 12 needs anyway.
+            embedding_future = IO_POOL.submit(self._embed, enhanced_question)
+
+            # Thread context — "" if no thread pasted (bot works normally without it)
+            thread_context = "" if new_session else self.thread_parser_service.get_thread_context(
+                session_id=conversation.session_id
+            )
+
+            # Deal context for an already-known deal (re-read if search infers another)
+            context_deal_id = active_deal_id
+            deal_context    = (
+                self.deal_context_service.build_deal_context(active_deal_id)
+                if active_deal_id else ""
             )
 
+            question_embedding = embedding_future.result()
+
+            if cache_key and question_embedding:
+                cached = self.semantic_cache.nearest(cache_key, question_embedding)
+                if cached:
+                    return self._replay(conversation, cached)
+
             # ── Step 9: TIER 2 — Dynamic KB (ALWAYS first) ────────────────────
             # Team corrections must always override document content.
             # Searched unconditionally, before static KB.
@@ -232,7 +296,8 @@ class QueryService:
                 question = enhanced_question,
                 deal_id = active_deal_id,
                 top_k = 5,
-                similarity_threshold = similarity_threshold
+                similarity_threshold = similarity_threshold,
+                embedding = question_embedding
             )
             if dynamic_context:
                 print("✅ Dynamic KB returned results — will override static KB for same facts")
@@ -242,7 +307,8 @@ class QueryService:
                 question = enhanced_question,
                 deal_id = active_deal_id,
                 top_k = top_k,
-                similarity_threshold = similarity_threshold
+                similarity_threshold = similarity_threshold,
+                embedding = question_embedding
             )
 
             # Infer deal from search results if still unknown
@@ -259,63 +325,75 @@ class QueryService:
                 question = question,
                 chunks_found = len(chunks),
                 confidence = confidence,
-                has_deal_context = active_deal_id is not None
+                has_deal_context = active_deal_id is not None,
+                question_lower = question_lower
             ):
                 doc_names  = self.helper.get_doc_names(active_deal_id)
                 deal_names = self.deal_context_service.get_all_deal_names()
                 clarifying_q = self.clarification_service.generate_clarifying_question(
                     question = question,
                     available_documents = doc_names,
-                    available_deals = deal_names
-                )
-                self.conversation_service.add_message(
-                    conversation_id = conversation.conversation_id,
-                    role = "assistant", content = clarifying_q,
-                    metadata={
-                        "type":              "clarification",
-                        "original_question": question  # preserved for needs_info
-                    }
+                    available_deals = deal_names,
+                    question_lower = question_lower
                 )
-                return {
+                return self._respond(conversation, cache_key, {
                     "response_type":       "needs_clarification",
                     "needs_clarification": True,
                     "clarifying_question": clarifying_q,
-                    "session_id":          conversation.session_id,
                     "show_draft_button":   False
-                }
+                }, clarifying_q, None, {
+                    "type":              "clarification",
+                    "original_question": question  # preserved for needs_info
+                }, embedding = question_embedding)
+
+            # ── Step 12: Deal context + tone rules + thread context ────────────
+            # Deal and thread context were read during Step 8b; the deal
+            # context only needs re-reading if Step 10 inferred the deal.
+            if active_deal_id != context_deal_id:
+                deal_context = self.deal_context_service.build_deal_context(active_deal_id)
+            tone_rules = self.deal_context_service.get_tone_rules(deal_id = active_deal_id)
 
-            # ── Step 12: Merge context — Dynamic KB FIRST ─────────────────────
+            if thread_context:
+                print("📧 Thread context injected into answer prompt")
+
+            # ── Step 13: LLM history messages ─────────────────────────────────
+            history_messages = self.helper.build_history_messages(history, max_messages = thresholds.HISTORY_MESSAGES_FOR_ANSWER)
+
+            # ── Step 14: Merge context — Dynamic KB FIRST ─────────────────────
             # By placing dynamic_context at the top, the LLM sees team corrections
             # before document passages. Combined with system prompt instructions,
             # this ensures team-supplied values override document values.
+            # The KB gets what the system prompt and history leave of the budget.
             doc_context  = self.context_builder.build_context(chunks)
-            full_context = self.helper.merge_context(dynamic_context, doc_context)
-
-            # ── Step 13: Deal context + tone rules + thread context ────────────
-            deal_context = (
-                self.deal_context_service.build_deal_context(active_deal_id)
-                if active_deal_id else ""
+            full_context = self.helper.merge_context(
+                dynamic_context,
+                doc_context,
+                max_tokens = self.helper.kb_context_budget(prompts.PromptMode.ANSWER, tone_rules, history_messages)
             )
-            tone_rules = self.deal_context_service.get_tone_rules(deal_id = active_deal_id)
-
-            # Thread context — "" if no thread pasted (bot works normally without it)
-            thread_context = self.thread_parser_service.get_thread_context(
-                session_id=conversation.session_id
-            )
-            if thread_context:
-                print("📧 Thread context injected into answer prompt")
-
-            # ── Step 14: LLM history messages ─────────────────────────────────
-            history_messages = self.helper.build_history_messages(history, max_messages = 6)
 
             # ── Step 15: Generate answer ───────────────────────────────────────
+            # Single-fact questions get the smaller SHORT_ANSWER token budget,
+            # plain questions MEDIUM_ANSWER; only long-form ones the full budget
+            if self.question_analyzer.is_short_fact_question(question, question_lower = question_lower):
+                answer_tier = llm_config.SHORT_ANSWER
+                print(f"📏 Answer tier: short_fact (max_tokens={answer_tier.max_tokens})")
+            elif self.question_analyzer.is_long_form_question(question, question_lower = question_lower):
+                answer_tier = llm_config.ANSWER
+                print(f"📏 Answer tier: full_answer (max_tokens={answer_tier.max_tokens})")
+            else:
+                answer_tier = llm_config.MEDIUM_ANSWER
+                print(f"📏 Answer tier: medium_answer (max_tokens={answer_tier.max_tokens})")
+
             answer = self.answer_generator.generate_answer(
                 question         = question,
                 context          = full_context,
                 tone_rules       = tone_rules,
                 deal_context     = deal_context,
                 thread_context   = thread_context,
-                history_messages = history_messages
+                history_messages = history_messages,
+                max_tokens       = answer_tier.max_tokens,
+                on_token         = on_token,
+                cache_key        = conversation.session_id
             )
 
             sources = self.context_builder.extract_sources(chunks)
@@ -325,54 +403,46 @@ class QueryService:
                 original_investor_question = self.helper.resolve_investor_question(
                     history=history, current_question=question
                 )
+                # A streaming client receives exactly full_response's text
+                if on_token:
+                    on_token(_INFO_REQUEST_SEPARATOR)
                 info_request = self.answer_generator.generate_info_request(
                     original_question = original_investor_question,
                     partial_answer    = answer,
                     tone_rules        = tone_rules,
                     thread_context    = thread_context,
-                    history_messages  = history_messages
-                )
-                full_response = f"{answer}\n\n---\n{info_request}"
-                self.conversation_service.add_message(
-                    conversation_id=conversation.conversation_id,
-                    role="assistant", content=full_response,
-                    deal_id=active_deal_id,
-                    metadata={
-                        "type":              "needs_info",
-                        "investor_question": original_investor_question,
-                        "sources":           sources,
-                        "confidence":        confidence
-                    }
+                    history_messages  = history_messages,
+                    on_token          = on_token,
+                    cache_key         = conversation.session_id
                 )
+                full_response = f"{answer}{_INFO_REQUEST_SEPARATOR}{info_request}"
                 print("📋 Tier 3 — asking user for missing info")
-                return {
+                return self._respond(conversation, cache_key, {
                     "response_type":     "needs_info",
                     "needs_info":        True,
                     "partial_answer":    answer,
                     "info_request":      info_request,
-                    "session_id":        conversation.session_id,
                     "active_deal_id":    active_deal_id,
                     "show_draft_button": False
-                }
+                }, full_response, active_deal_id, {
+                    "type":              "needs_info",
+                    "investor_question": original_investor_question,
+                    "sources":           sources,
+                    "confidence":        confidence
+                }, embedding = question_embedding)
 
             # ── Step 17: Full answer ───────────────────────────────────────────
-            self.conversation_service.add_message(
-                conversation_id=conversation.conversation_id,
-                role="assistant", content=answer,
-                deal_id=active_deal_id,
-                metadata={"type": "answer", "sources": sources, "confidence": confidence}
-            )
             print(f"✅ Answer | confidence={confidence} | deal_id={active_deal_id}")
-            return {
+            return self._respond(conversation, cache_key, {
                 "response_type":     "answer",
                 "answer":            answer,
                 "sources":           sources,
                 "chunks_found":      len(chunks),
                 "confidence":        confidence,
-                "session_id":        conversation.session_id,
                 "active_deal_id":    active_deal_id,
                 "show_draft_button": True
-            }
+            }, answer, active_deal_id, {"type": "answer", "sources": sources, "confidence": confidence},
+               embedding = question_embedding)
 
         except Exception as error:
             db.session.rollback()
@@ -384,6 +454,67 @@ class QueryService:
             )
 
 
+    # ── Answer Caches ──────────────────────────────────────────────────────────
+    def clear_answer_caches(self, deal_id: Optional[int] = None) -> None:
+        """
+        Flush the exact and semantic first-turn answer caches — only the
+        entries *deal_id*'s knowledge can affect when a deal is given.
+
+        The knowledge version bump invalidates those entries in every worker
+        process; the local clear just frees this process's memory right away.
+        """
+        bump_knowledge_version(deal_id)
+        for cache in (self.answer_cache, self.semantic_cache):
+            if deal_id is None:
+                cache.clear()
+            else:
+                cache.clear_deal(deal_id)
+
+
+    # ── Private: Persist + Cache Outcome ───────────────────────────────────────
+    def _respond(
+        self,
+        conversation,
+        cache_key: Optional[tuple],
+        response: Dict,
+        content: str,
+        deal_id: Optional[int],
+        metadata: Dict,
+        embedding: Optional[List[float]] = None
+    ) -> Dict:
+        """
+        Persist the assistant message, cache the outcome when *cache_key* is
+        set (semantically too, when the question *embedding* is known), and
+        return *response* stamped with this conversation's session_id.
+        """
+        self.conversation_service.add_message(
+            conversation_id = conversation.conversation_id,
+            role = "assistant", content = content,
+            deal_id = deal_id, metadata = metadata
+        )
+        if cache_key:
+            outcome = (dict(response), content, deal_id, metadata)
+            self.answer_cache.set(cache_key, outcome)
+            if embedding:
+                self.semantic_cache.add(cache_key, embedding, outcome)
+
+        response["session_id"] = conversation.session_id
+        return response
+
+    def _replay(self, conversation, outcome: tuple) -> Dict:
+        """ Persist a cached outcome into *conversation* and return its response. """
+        response, content, deal_id, metadata = outcome
+        return self._respond(conversation, None, dict(response), content, deal_id, metadata)
+
+    def _embed(self, question: str) -> Optional[List[float]]:
+        """ Embed *question* once per request; None lets each search retry on its own. """
+        try:
+            return EMBEDDING_BATCHER.embed(question)
+        except Exception as exc:
+            print(f"⚠️  Question embedding failed: {exc}")
+            return None
+
+
     # ── Manual Draft Generation ────────────────────────────────────────────────
     def generate_draft_from_session(
         self,
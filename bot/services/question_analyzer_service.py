@@ -7,8 +7,7 @@ All keyword lists live in config/keywords.py — nothing is hardcoded here.
 """
 
 # Python Packages
-import re
-from typing import List
+from typing import List, Optional
 
 # Config
 from ..config import keywords
@@ -26,12 +25,11 @@ class QuestionAnalyzerService:
         Return True if the LLM answer signals it could not confirm some facts.
         Triggers Tier 3 (Step 16) — ask the team for missing values.
         """
-        answer_lower = answer.lower()
-        return any(signal in answer_lower for signal in keywords.MISSING_INFO_SIGNALS)
+        return keywords.MISSING_INFO_MATCHER.search(answer.lower()) is not None
 
 
     # ── New Question Detection ─────────────────────────────────────────────────
-    def is_new_question(self, question: str) -> bool:
+    def is_new_question(self, question: str, question_lower: Optional[str] = None) -> bool:
         """
         Return True if the message looks like a new question rather than a
         supplied answer to a pending needs_info request.
@@ -46,13 +44,50 @@ class QuestionAnalyzerService:
         Returns False (supplied answer):
           "Share price is ~$378"           ← statement, not a question
           "$25k minimum"                   ← value only
+
+        question_lower: question.lower(), if the caller already has it.
+        """
+        q = (question_lower if question_lower is not None else question.lower()).strip()
+        return q.startswith(keywords.QUESTION_STARTERS)
+
+
+    # ── Answer Length Tier ─────────────────────────────────────────────────────
+    def is_short_fact_question(self, question: str, question_lower: Optional[str] = None) -> bool:
+        """
+        Return True if the question asks for one fact and needs only a short answer.
+
+        Returns True  (short): "What is the minimum ticket?", "When does it close?"
+        Returns False (full):  "Explain the fee structure", "What are the risks and returns?"
+
+        question_lower: question.lower(), if the caller already has it.
+        """
+        q = (question_lower if question_lower is not None else question.lower()).strip()
+        return (
+            len(q.split()) <= keywords.SHORT_FACT_MAX_WORD_COUNT
+            and q.startswith(keywords.SHORT_FACT_STARTERS)
+            and keywords.LONG_FORM_MATCHER.search(q) is None
+        )
+
+
+    def is_long_form_question(self, question: str, question_lower: Optional[str] = None) -> bool:
+        """
+        Return True if the question needs the full answer budget: it asks for
+        an explanation, list or comparison, or is itself long.
+
+        Returns True  (full):   "Explain the fee structure", "What are the risks?"
+        Returns False (medium): "Can I invest through my IRA?"
+
+        question_lower: question.lower(), if the caller already has it.
         """
-        q = question.lower().strip()
-        return any(q.startswith(starter) for starter in keywords.QUESTION_STARTERS)
+        q = (question_lower if question_lower is not None else question.lower()).strip()
+        return (
+            len(q.split()) > keywords.MEDIUM_ANSWER_MAX_WORD_COUNT
+            or keywords.LONG_FORM_MATCHER.search(q) is not None
+        )
 
 
     # ── Greeting Detection ─────────────────────────────────────────────────────
-    def is_greeting(self, question: str) -> bool:
+    def is_greeting(self, question: str, question_lower: Optional[str] = None) -> bool:
         """
         Return True if the message is pure social/small-talk with no business intent.
 
@@ -65,27 +100,35 @@ class QuestionAnalyzerService:
 
         Returns True  (greeting):    "Hello", "Hi there", "Hello Bot, How are you?"
         Returns False (not greeting): "How much is the minimum?", "Hi, what is the fee?"
-        """
-        # Normalise: lowercase, strip punctuation
-        text = re.sub(r"[^\w\s]", " ", question.strip().lower()).strip()
-        text = re.sub(r"\s+", " ", text)
 
-        # 1. Exact match
-        if text in keywords.GREETING_PATTERNS:
+        question_lower: question.lower(), if the caller already has it.
+        """
+        if question_lower is None:
+            question_lower = question.lower()
+
+        # Normalise: punctuation → space, collapse whitespace
+        words = keywords.GREETING_PUNCTUATION_RE.sub(" ", question_lower).split()
+        if not words or words[0] not in keywords.GREETING_FIRST_TOKENS:
+            return False  # cannot be an exact greeting nor start with one
+
+        # 1. Exact match (bucketed by length — most messages have no bucket)
+        text   = " ".join(words)
+        bucket = keywords.GREETING_BY_LEN.get(len(text))
+        if bucket is not None and text in bucket:
             return True
 
-        words = text.split()
-        if not words:
-            return False
-
         # 2. Starts with a greeting word?
         if words[0] in keywords.GREETING_STARTERS:
-            remaining = [w for w in words if w not in keywords.SOCIAL_FILLER_WORDS]
+            # One tokenisation, then C-level set operations
+            remaining = set(words).difference(keywords.SOCIAL_FILLER_WORDS)
 
             if not remaining:
                 return True   # only social filler remains → pure greeting
 
-            if any(w in keywords.BUSINESS_KEYWORDS for w in remaining):
+            # One regex pass — catches multi-word phrases ("how much") too.
+            # No business keyword is social filler, so scanning the full text
+            # finds exactly the single words left in `remaining`, plus phrases.
+            if keywords.BUSINESS_MATCHER.search(text) is not None:
                 return False  # business intent detected
 
             # Short message with no business words → treat as greeting
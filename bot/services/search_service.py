@@ -28,10 +28,77 @@ from ...vendors import EmbeddingService
 from ..config import bot_config
 
 
+def vector_literal(embedding: List[float]) -> str:
+    """
+    pgvector text literal for *embedding*, e.g. "[0.0123,-0.0456,...]".
+
+    pgvector stores float4, so each value is written with 9 significant
+    digits — enough to round-trip a float32 exactly, and about a third
+    shorter than Python's float repr. The 1536-dim query vector is sent and
+    parsed on every search.
+    """
+    return "[" + ",".join(map("{:.9g}".format, embedding)) + "]"
+
+
+
+# Chunk search statements, built once at import instead of on every search
+# (text() scans the SQL for bind parameters each time it is constructed).
+# {deal_filter} narrows the scan to one deal; see SearchService for the shape.
+_CHUNK_SEARCH_SQL = """
+    SELECT
+        nearest.chunk_text,
+        dd.doc_name,
+        1 - nearest.distance AS similarity,
+        nearest.chunk_id,
+        nearest.chunk_index,
+        nearest.page_number,
+        nearest.deal_id
+    FROM (
+        SELECT
+            dc.chunk_text, dc.chunk_id, dc.chunk_index,
+            dc.page_number, dc.deal_id, dc.doc_id,
+            dc.embedding <=> CAST(:emb AS vector) AS distance
+        FROM odp_deal_document_chunks dc
+        WHERE dc.embedding IS NOT NULL{deal_filter}
+        ORDER BY distance
+        LIMIT :top_k
+    ) AS nearest
+    JOIN odp_deal_documents dd ON nearest.doc_id = dd.doc_id
+    WHERE nearest.distance <= 1 - :threshold
+    ORDER BY nearest.distance
+"""
+
+_CHUNKS_IN_DEAL_SQL   = text(_CHUNK_SEARCH_SQL.format(deal_filter = "\n          AND dc.deal_id = :deal_id"))
+_CHUNKS_ALL_DEALS_SQL = text(_CHUNK_SEARCH_SQL.format(deal_filter = ""))
+
+
+# Applies to the rest of the current transaction only (set_config is_local).
+_SET_EF_SEARCH_SQL = text("SELECT set_config('hnsw.ef_search', :ef_search, true)")
+_EF_SEARCH_PARAMS  = {"ef_search": str(bot_config.BOT_HNSW_EF_SEARCH)}
+
+
+
+def widen_index_scan() -> None:
+    """
+    Raise hnsw.ef_search for the current transaction before a deal-scoped
+    vector search. The HNSW index returns its nearest ef_search candidates
+    and the deal filter runs on those, so the default can leave a deal with
+    fewer than top_k rows once many deals share the index.
+    """
+    db.session.execute(_SET_EF_SEARCH_SQL, _EF_SEARCH_PARAMS)
+
+
+
 class SearchService:
     """
     Vector similarity search over odp_deal_document_chunks.
 
+    Queries take the top_k nearest chunks first (ORDER BY distance LIMIT —
+    the shape the pgvector index serves), computing the cosine distance once
+    per row, and only then apply the similarity threshold. That returns the
+    same rows as filtering first: every chunk above the threshold is nearer
+    than every chunk below it.
+
     Each public method is transaction-safe: exceptions are caught, the
     session is rolled back, and an empty list is returned so the caller
     can continue gracefully.
@@ -56,7 +123,8 @@ class SearchService:
         question: str,
         deal_id: Optional[int] = None,
         top_k: int = bot_config.BOT_DEFAULT_TOP_K,
-        similarity_threshold: float = bot_config.BOT_SIMILARITY_THRESHOLD
+        similarity_threshold: float = bot_config.BOT_SIMILARITY_THRESHOLD,
+        embedding: Optional[List[float]] = None
     ) -> List[Tuple]:
         """
         Find document chunks semantically similar to *question*.
@@ -66,6 +134,7 @@ class SearchService:
             deal_id:             Scope search to one deal. None = all deals.
             top_k:               Max chunks to return.
             similarity_threshold: Min cosine similarity (0–1).
+            embedding:           Precomputed embedding of *question* (skips the API call).
 
         Returns:
             List of 7-tuples:
@@ -74,9 +143,10 @@ class SearchService:
             Empty list on any error.
         """
         try:
-            print(f"🧮 Generating question embedding...")
-            embedding = self.embedding_service.generate_embedding(question)
-            embedding_str = "[" + ",".join(map(str, embedding)) + "]"
+            if embedding is None:
+                print(f"🧮 Generating question embedding...")
+                embedding = self.embedding_service.generate_embedding(question)
+            embedding_str = vector_literal(embedding)
 
             if deal_id:
                 print(f"🔍 Searching deal_id={deal_id}...")
@@ -105,25 +175,8 @@ class SearchService:
     ) -> List[Tuple]:
         """Vector search scoped to one deal. Rolls back session on failure."""
         try:
-            sql = text("""
-                SELECT
-                    dc.chunk_text,
-                    dd.doc_name,
-                    1 - (dc.embedding <=> CAST(:emb AS vector)) AS similarity,
-                    dc.chunk_id,
-                    dc.chunk_index,
-                    dc.page_number,
-                    dc.deal_id
-                FROM odp_deal_document_chunks dc
-                JOIN odp_deal_documents dd ON dc.doc_id = dd.doc_id
-                WHERE dc.deal_id = :deal_id
-                  AND dc.embedding IS NOT NULL
-                  AND (1 - (dc.embedding <=> CAST(:emb AS vector))) >= :threshold
-                ORDER BY dc.embedding <=> CAST(:emb AS vector)
-                LIMIT :top_k
-            """)
-
-            rows = db.session.execute(sql, {
+            widen_index_scan()
+            rows = db.session.execute(_CHUNKS_IN_DEAL_SQL, {
                 "emb": embedding_str,
                 "deal_id": deal_id,
                 "threshold": threshold,
@@ -146,24 +199,7 @@ class SearchService:
     ) -> List[Tuple]:
         """Vector search across all deals. Rolls back session on failure."""
         try:
-            sql = text("""
-                SELECT
-                    dc.chunk_text,
-                    dd.doc_name,
-                    1 - (dc.embedding <=> CAST(:emb AS vector)) AS similarity,
-                    dc.chunk_id,
-                    dc.chunk_index,
-                    dc.page_number,
-                    dc.deal_id
-                FROM odp_deal_document_chunks dc
-                JOIN odp_deal_documents dd ON dc.doc_id = dd.doc_id
-                WHERE dc.embedding IS NOT NULL
-                  AND (1 - (dc.embedding <=> CAST(:emb AS vector))) >= :threshold
-                ORDER BY dc.embedding <=> CAST(:emb AS vector)
-                LIMIT :top_k
-            """)
-
-            rows = db.session.execute(sql, {
+            rows = db.session.execute(_CHUNKS_ALL_DEALS_SQL, {
                 "emb": embedding_str,
                 "threshold": threshold,
                 "top_k": top_k
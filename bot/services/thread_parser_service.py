@@ -10,11 +10,16 @@ Flow
 1. Team member pastes thread via POST /bot/thread (or Gmail Extension sends it).
 2. ThreadParserService.submit_thread() is called.
    a. Validates and stores raw thread → parse_status = 'pending'.
-   b. Calls _parse_via_llm() → LLM returns structured JSON.
-   c. Updates row with parsed fields → parse_status = 'completed'.
-   d. Returns the full DealEmailThread record.
-3. On every subsequent /bot/ask call, QueryService calls get_thread_context()
-   which returns the formatted context string (or "" if no thread).
+   b. Queues parse_thread() on a background worker and returns the pending
+      record at once — the LLM call is not on the request path.
+3. parse_thread() (background, own app context):
+   a. Calls _parse_via_llm() → LLM returns structured JSON.
+   b. Updates row with parsed fields → parse_status = 'completed' ('failed'
+      if the LLM returned no valid JSON).
+4. Clients poll GET /bot/thread/<session_id> for parse_status.
+5. On every subsequent /bot/ask call, QueryService calls get_thread_context()
+   which returns the formatted context string (or "" if no thread, or the
+   thread is not parsed yet).
 
 Null thread handling
 --------------------
@@ -32,8 +37,11 @@ deal-detection logic handles it during chat.
 
 # Python Packages
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict
 
+from flask import current_app
+
 # Database
 from ...config.database import db
 
@@ -44,10 +52,18 @@ from ...models.odp_deal import Deal
 # Vendors
 from ...vendors import ChatService
 
+# Exceptions
+from ...util.exceptions import AppException
+
 # Config
 from ..config import prompts, llm_config, bot_config
 
 
+# Background parses. Each job opens its own app context (and so its own DB
+# session); two workers keep a burst of pastes from queueing behind one LLM call.
+_PARSE_POOL = ThreadPoolExecutor(max_workers = 2, thread_name_prefix = "bot-thread-parse")
+
+
 
 
 
@@ -75,14 +91,12 @@ class ThreadParserService:
         source: str = "manual_paste"
     ) -> DealEmailThread:
         """
-        Validate, store, parse, and return a thread record.
+        Validate and store a thread, then queue its parse in the background.
 
         Steps:
           1. Deactivate any existing active thread for this session.
           2. Store new thread row with parse_status='pending'.
-          3. Parse via LLM.
-          4. Update row with parsed fields.
-          5. Attempt deal_id detection from deal_signals.
+          3. Queue parse_thread() for the new row.
 
         Args:
             session_id:      The bot conversation session this thread belongs to.
@@ -91,10 +105,10 @@ class ThreadParserService:
             source:          'manual_paste' (v1) or 'gmail_extension' (future).
 
         Returns:
-            Updated DealEmailThread record (parse_status='completed' or 'failed').
+            The stored DealEmailThread record (parse_status='pending').
 
         Raises:
-            ValueError: If thread text fails validation.
+            AppException: INVALID_THREAD if thread text fails validation.
             Exception:  Propagated on unrecoverable DB error.
         """
         raw_thread_text = raw_thread_text.strip()
@@ -119,8 +133,29 @@ class ThreadParserService:
         db.session.refresh(thread)
         print(f"📧 Thread stored | id={thread.id} | session={session_id}")
 
+        # ── Parse in the background ────────────────────────────────────────────
+        _PARSE_POOL.submit(self._parse_job, current_app._get_current_object(), thread.id)
+        return thread
+
+
+    def parse_thread(self, thread_id: int) -> Optional[DealEmailThread]:
+        """
+        Parse a stored thread via LLM and update its record.
+
+        Steps:
+          1. Parse via LLM.
+          2. Attempt deal_id detection from deal_signals.
+          3. Update row with parsed fields (parse_status='completed' or 'failed').
+
+        Returns:
+            Updated DealEmailThread record, or None if *thread_id* does not exist.
+        """
+        thread = db.session.get(DealEmailThread, thread_id)
+        if thread is None:
+            return None
+
         # ── Parse via LLM ──────────────────────────────────────────────────────
-        parsed = self._parse_via_llm(raw_thread_text)
+        parsed = self._parse_via_llm(thread.raw_thread_text)
 
         if parsed:
             # ── Detect deal_id from deal_signals ───────────────────────────────
@@ -145,10 +180,19 @@ class ThreadParserService:
             print(f"⚠️  Thread parse failed | id={thread.id}")
 
         db.session.commit()
-        db.session.refresh(thread)
         return thread
 
 
+    def _parse_job(self, app, thread_id: int) -> None:
+        """ Background entry point — parse_thread() inside its own app context. """
+        with app.app_context():
+            try:
+                self.parse_thread(thread_id)
+            except Exception as exc:
+                db.session.rollback()
+                print(f"⚠️  Background thread parse failed | id={thread_id}: {exc}")
+
+
 
     # ── Public: Load Thread Context ────────────────────────────────────────────
     def get_thread_context(self, session_id: str) -> str:
@@ -175,7 +219,7 @@ class ThreadParserService:
         already_discussed = ctx.get("already_discussed") or []
         open_items        = ctx.get("open_items")        or []
 
-        return prompts.THREAD_CONTEXT_BLOCK_TEMPLATE.format(
+        return prompts.THREAD_CONTEXT_BLOCK_RENDER(
             investor_name     = ctx.get("investor_name")   or unk,
             investor_email    = ctx.get("investor_email")  or unk,
             investor_tone     = ctx.get("investor_tone")   or unk,
@@ -225,7 +269,7 @@ class ThreadParserService:
         """
 
         try:
-            user_prompt = prompts.THREAD_PARSER_USER_TEMPLATE.format(
+            user_prompt = prompts.THREAD_PARSER_USER_RENDER(
                 raw_thread=raw_thread
             )
 
@@ -234,8 +278,8 @@ class ThreadParserService:
                     {"role": "system", "content": prompts.THREAD_PARSER_SYSTEM_PROMPT},
                     {"role": "user",   "content": user_prompt}
                 ],
-                temperature = llm_config.LLM_THREAD_PARSER_TEMPERATURE,
-                max_tokens  = llm_config.LLM_THREAD_PARSER_MAX_TOKENS
+                temperature = llm_config.THREAD_PARSER.temperature,
+                max_tokens  = llm_config.THREAD_PARSER.max_tokens
             )
 
             # Strip any accidental markdown fences
@@ -347,14 +391,18 @@ class ThreadParserService:
 
     def _validate_thread_text(self, text: str) -> None:
         """
-        Raise ValueError if thread text fails basic sanity checks.
-        Limits live in config/bot_config.py.
+        Raise AppException (INVALID_THREAD, 400) if thread text fails basic
+        sanity checks. Limits live in config/bot_config.py.
         """
         if len(text) < bot_config.BOT_THREAD_MIN_LENGTH:
-            raise ValueError(
-                f"Thread text too short. Minimum {bot_config.BOT_THREAD_MIN_LENGTH} characters."
+            raise AppException(
+                error_code = "INVALID_THREAD",
+                message = f"Thread text too short. Minimum {bot_config.BOT_THREAD_MIN_LENGTH} characters.",
+                status_code = 400
             )
         if len(text) > bot_config.BOT_THREAD_MAX_LENGTH:
-            raise ValueError(
-                f"Thread text too long. Maximum {bot_config.BOT_THREAD_MAX_LENGTH} characters."
+            raise AppException(
+                error_code = "INVALID_THREAD",
+                message = f"Thread text too long. Maximum {bot_config.BOT_THREAD_MAX_LENGTH} characters.",
+                status_code = 400
             )
@@ -8,6 +8,9 @@ from ...util.exceptions import AppException
 # Messages
 from ...util import messages
 
+# Config
+from ..config import bot_config
+
 
 
 
@@ -23,6 +26,34 @@ class BotValidation:
             )
 
 
+    @staticmethod
+    def validate_ask_body(data) -> tuple:
+        """
+        Validate an /ask request body in one call and return its
+        (question, user_id, session_id), strings already stripped.
+        An empty session_id means "start a new session" (None).
+        """
+        if not data or not isinstance(data, dict):
+            raise AppException(
+                error_code = "INVALID_REQUEST",
+                message = messages.ERROR["INVALID_REQUEST"]
+            )
+
+        question   = data.get("question")
+        user_id    = data.get("user_id")
+        session_id = data.get("session_id") or None
+
+        if isinstance(question, str):
+            question = question.strip()
+        if isinstance(user_id, str):
+            user_id = user_id.strip()
+
+        BotValidation.validate_question(question)
+        BotValidation.validate_user_id(user_id)
+
+        return question, user_id, session_id
+
+
     @staticmethod
     def validate_question(question):
         if not question:
@@ -31,7 +62,7 @@ class BotValidation:
                 message = messages.ERROR["MISSING_QUESTION"]
             )
 
-        if not isinstance(question, str) or len(question.strip()) == 0:
+        if not isinstance(question, str) or question.isspace():
             raise AppException(
                 error_code = "INVALID_QUESTION",
                 message = messages.ERROR["INVALID_QUESTION"]
@@ -55,7 +86,7 @@ class BotValidation:
                 message = messages.ERROR["MISSING_USER_ID"]
             )
 
-        if not isinstance(user_id, str) or len(user_id.strip()) == 0:
+        if not isinstance(user_id, str) or user_id.isspace():
             raise AppException(
                 error_code = "INVALID_USER_ID",
                 message = messages.ERROR["INVALID_USER_ID"]
@@ -68,8 +99,6 @@ class BotValidation:
         Validate raw email thread text before storing.
         Length limits come from config/bot_config.py.
         """
-        from ..config import bot_config
-
         if not thread_text:
             raise AppException(
                 error_code  = "MISSING_THREAD_TEXT",
@@ -101,9 +130,24 @@ class BotValidation:
             )
 
 
+    @staticmethod
+    def validate_thread_body_size(content_length):
+        """
+        Reject a thread submission whose declared body size cannot hold a
+        valid thread, before the body is read. None (no Content-Length,
+        e.g. chunked) is left to validate_thread_text().
+        """
+        if content_length is not None and content_length > bot_config.BOT_THREAD_MAX_BODY_BYTES:
+            raise AppException(
+                error_code  = "THREAD_TOO_LONG",
+                message     = f"thread_text must not exceed {bot_config.BOT_THREAD_MAX_LENGTH} characters.",
+                status_code = 400
+            )
+
+
     @staticmethod
     def validate_session_id(session_id):
-        if not session_id or not isinstance(session_id, str) or not session_id.strip():
+        if not session_id or not isinstance(session_id, str) or session_id.isspace():
             raise AppException(
                 error_code  = "MISSING_SESSION_ID",
                 message     = messages.ERROR.get("MISSING_SESSION_ID", "session_id is required."),
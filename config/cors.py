@@ -0,0 +1,51 @@
+""" Static CORS middleware for production... """
+
+
+
+
+
+class StaticCORSMiddleware:
+    """
+    Minimal WSGI CORS layer for a single, fixed allowed origin.
+
+    flask-cors inspects request and response headers in Python on every
+    response. In production the policy is static, so the headers are built
+    once here and appended as-is; preflight requests are answered directly
+    without entering Flask.
+    """
+
+    ALLOW_METHODS = "GET, POST, PUT, PATCH, DELETE, OPTIONS"
+    ALLOW_HEADERS = "Content-Type, Authorization"
+    MAX_AGE       = "86400"
+
+
+    def __init__(self, wsgi_app, origin = "*"):
+        """ Wrap *wsgi_app* and precompute the header lists once """
+
+        self.wsgi_app = wsgi_app
+        self.headers  = [("Access-Control-Allow-Origin", origin)]
+        self.preflight_headers = self.headers + [
+            ("Access-Control-Allow-Methods", self.ALLOW_METHODS),
+            ("Access-Control-Allow-Headers", self.ALLOW_HEADERS),
+            ("Access-Control-Max-Age", self.MAX_AGE),
+            ("Content-Length", "0"),
+        ]
+
+
+    def __call__(self, environ, start_response):
+        """ Answer preflights directly; append the origin header to everything else """
+
+        if (
+            environ.get("REQUEST_METHOD") == "OPTIONS"
+            and "HTTP_ACCESS_CONTROL_REQUEST_METHOD" in environ
+        ):
+            start_response("204 No Content", list(self.preflight_headers))
+            return [b""]
+
+        headers = self.headers
+
+        def cors_start_response(status, response_headers, exc_info = None):
+            response_headers.extend(headers)
+            return start_response(status, response_headers, exc_info)
+
+        return self.wsgi_app(environ, cors_start_response)
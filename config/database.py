@@ -40,6 +40,9 @@ class Database:
 # Global SQLAlchemy object
 db = SQLAlchemy()
 
+# Number of compiled SQL statements kept per engine (SQLAlchemy default: 500)
+SQL_COMPILED_CACHE_SIZE = 1200
+
 
 def init_db(app):
     """
@@ -51,4 +54,11 @@ def init_db(app):
     app.config["SQLALCHEMY_DATABASE_URI"] = database.get_database_uri()
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+    # Compiled-statement cache: every ORM query shape is compiled to SQL once
+    # and reused across requests. pgvector's Vector type is cache_ok, and the
+    # models define no custom TypeDecorators, so all our queries are cacheable.
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "query_cache_size": SQL_COMPILED_CACHE_SIZE
+    }
+
     db.init_app(app)
@@ -0,0 +1,60 @@
+""" orjson-backed JSON encoding for Flask and flask-restx... """
+
+# Python Packages
+from decimal import Decimal
+
+import orjson
+from flask import make_response
+from flask.json.provider import JSONProvider
+
+
+
+
+
+# Dict keys that are not strings (e.g. deal_id ints) are stringified, as the
+# stdlib encoder does, instead of raising.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+
+def _default(obj):
+    """ Types orjson does not encode natively — Decimal (Numeric columns) → str, like Flask """
+
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+
+def dumps_bytes(obj) -> bytes:
+    """ Encode *obj* as compact UTF-8 JSON """
+
+    return orjson.dumps(obj, default = _default, option = ORJSON_OPTIONS)
+
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson (app.json).
+
+    Used by jsonify(), request.get_json() and Flask's own JSON responses.
+    Output is compact and keeps dict insertion order; datetimes encode as
+    ISO 8601 (services already send .isoformat() strings).
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps_bytes(obj).decode()
+
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+
+def output_json(data, code, headers = None):
+    """ flask-restx representation for application/json, encoded with orjson """
+
+    response = make_response(dumps_bytes(data), code)
+    response.headers.extend(headers or {})
+    response.headers["Content-Type"] = "application/json"
+    return response
@@ -6,6 +6,9 @@ from flask_restx import Api
 # Constants
 from ..base import constants
 
+# JSON
+from .json_provider import output_json
+
 
 
 
@@ -35,3 +38,6 @@ api = Api(
     description = constants.SWAGGER_APP_PROPS['description'],
     doc = doc
 )
+
+# Encode every namespace's JSON responses with orjson
+api.representation("application/json")(output_json)
@@ -30,6 +30,10 @@ from ..util.exceptions import AppException, InternalServerException
 # Namespaces
 deal_namespace = Namespace('deals', description = 'Deal Management APIs')
 
+# One controller per worker process. Building it creates an OpenAI client and
+# loads the tiktoken encoding; its services keep no per-request state.
+_controller = DealController()
+
 
 
 
@@ -51,7 +55,7 @@ class AddDeal(Resource):
             AddDealValidation().validate(args)
 
             # Controller
-            result = DealController().create_deal(args)
+            result = _controller.create_deal(args)
 
             return {
                 "status": "success",
@@ -84,7 +88,7 @@ class ListDeal(Resource):
             search = request.args.get("search", type = str)
 
             # Controller
-            result = DealController().list_deals(search)
+            result = _controller.list_deals(search)
 
             return {
                 "status": "success",
@@ -117,7 +121,7 @@ class EditDeal(Resource):
             EditDealValidation().validate(args)
 
             # Controller
-            result = DealController().edit_deal(args)
+            result = _controller.edit_deal(args)
 
             return {
                 "status": "success",
@@ -143,7 +147,7 @@ class DeleteDeal(Resource):
 
         try:
             # Controller
-            result = DealController().delete_deal(deal_id)
+            result = _controller.delete_deal(deal_id)
 
             return {
                 "status": "success",
@@ -176,7 +180,7 @@ class ProcessDealDocument(Resource):
             ProcessDocumentValidation().validate(doc_id)
 
             # Controller
-            result = DealController().process_deal_document(doc_id)
+            result = _controller.process_deal_document(doc_id)
 
             return {
                 "status": "success",
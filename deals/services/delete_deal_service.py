@@ -15,6 +15,7 @@ from ...models.odp_deal import Deal
 
 # Services
 from ...vendors.aws.s3_delete import S3DeleteService
+from ...bot.services.knowledge_version import bump_knowledge_version
 
 # Exceptions
 from ...util.exceptions import ServiceException
@@ -58,6 +59,9 @@ class DeleteDealService:
 
             db.session.commit()
 
+            # Cached bot answers may still quote the deleted deal
+            bump_knowledge_version(deal_id)
+
             return {
                 "deal_id": deal_id,
                 "message": messages.SUCCESS['DEAL_DELETE_SUCCESS']
@@ -15,6 +15,7 @@ from ...models.odp_deal_document import DealDocument
 # Services
 from ...document_processing.services.document_processor import DocumentProcessor
 from ...document_processing.services.chunk_storage import ChunkStorageService
+from ...bot.services.knowledge_version import bump_knowledge_version
 
 # Messages & Exceptions
 from ...util.exceptions import ServiceException
@@ -95,6 +96,10 @@ class DocumentProcessService:
                 chunks = chunks
             )
 
+            # New chunks are committed — drop this deal's cached bot answers
+            # in every worker (and here, when running inside Celery)
+            bump_knowledge_version(deal_id)
+
             print(f"\n{'='*60}")
             print(f"✅ COMPLETE: {doc_name}")
             print(f"   - Chunks created: {len(chunk_ids)}")
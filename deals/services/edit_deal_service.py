@@ -11,6 +11,9 @@ from odp.config.database import db
 # Models
 from ...models.odp_deal import Deal
 
+# Services
+from ...bot.services.knowledge_version import bump_knowledge_version
+
 # Exceptions
 from ...util.exceptions import ServiceException
 
@@ -45,6 +48,9 @@ class EditDealService:
 
             db.session.commit()
 
+            # Cached bot answers were built with the old name in their deal context
+            bump_knowledge_version(deal_id)
+
             return {
                 "deal_id": deal.deal_id,
                 "deal_name": deal.deal_name,
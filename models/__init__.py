@@ -15,6 +15,7 @@ from .odp_conversation import Conversation
 from .odp_conversation_message import ConversationMessage
 from .odp_tone_rule import ToneRule
 from .odp_deal_email_thread import DealEmailThread
+from .odp_knowledge_version import KnowledgeVersion
 
 
 __all__ = [
@@ -25,5 +26,6 @@ __all__ = [
     "Conversation",
     "ConversationMessage",
     "ToneRule",
-    "DealEmailThread"
+    "DealEmailThread",
+    "KnowledgeVersion"
 ]
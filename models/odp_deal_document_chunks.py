@@ -81,10 +81,13 @@ class DealDocumentChunk(db.Model):
 
 
 
-# IVFFlat index for fast approximate cosine-similarity search
+# HNSW index for fast approximate cosine-similarity search.
+# Unlike IVFFlat it needs no training data, so it stays accurate when created
+# on an empty table and as chunks are ingested.
 Index(
     "idx_deal_document_chunks_embedding",
     DealDocumentChunk.embedding,
-    postgresql_using = "ivfflat",
+    postgresql_using = "hnsw",
+    postgresql_with = {"m": 16, "ef_construction": 64},
     postgresql_ops = {"embedding": "vector_cosine_ops"}
 )
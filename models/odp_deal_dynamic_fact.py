@@ -112,6 +112,7 @@ class DealDynamicFact(db.Model):
 Index(
     "idx_deal_dynamic_facts_embedding",
     DealDynamicFact.embedding,
-    postgresql_using = "ivfflat",
+    postgresql_using = "hnsw",
+    postgresql_with = {"m": 16, "ef_construction": 64},
     postgresql_ops = {"embedding": "vector_cosine_ops"}
 )
@@ -0,0 +1,53 @@
+"""
+Model: KnowledgeVersion
+Table: odp_knowledge_versions
+
+One counter per deal, bumped whenever that deal's knowledge base changes
+(documents processed, team facts stored). The bot's first-turn answer
+caches live in each worker process; they put the counter in their keys, so
+a bump made by ANY process (web worker or Celery task) makes every
+process's cached answers for that deal unreachable.
+
+Reserved rows (no foreign key, so they can exist without a deal):
+  deal_id =  0 — bumped with every deal; versions answers searched across all deals
+  deal_id = -1 — bumped by a full cache flush; part of every key
+"""
+
+# Python Packages
+from sqlalchemy import func
+
+# Database
+from ..config.database import db
+
+
+
+
+
+class KnowledgeVersion(db.Model):
+    """ Knowledge-base version counter for one deal (or a reserved scope)... """
+
+    # Table Name
+    __tablename__ = "odp_knowledge_versions"
+
+    deal_id = db.Column(
+        db.Integer,
+        primary_key = True,
+        autoincrement = False,
+        doc = "Deal whose knowledge this versions; 0 = any deal, -1 = full flush."
+    )
+
+    version = db.Column(
+        db.Integer,
+        nullable = False,
+        default = 0
+    )
+
+    updated_at = db.Column(
+        db.DateTime(timezone = True),
+        nullable = False,
+        server_default = func.now(),
+        onupdate = func.now()
+    )
+
+    def __repr__(self):
+        return f"<KnowledgeVersion deal_id={self.deal_id} version={self.version}>"
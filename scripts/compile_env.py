@@ -0,0 +1,61 @@
+"""
+Compile .env into base/_env_cache.py
+
+Run once at build/deploy time, from the project root:
+
+    python scripts/compile_env.py
+
+The generated module holds the .env values as a plain dict literal, so
+base/constants.py loads them from the cached .pyc instead of locating and
+parsing .env on every process start. Real environment variables still take
+precedence over the cached values at runtime.
+
+The generated file contains secrets — it is git-ignored; never commit it.
+Delete it (or re-run this script) whenever .env changes.
+"""
+
+# Python Packages
+import os
+import py_compile
+import sys
+from decouple import RepositoryEnv
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_FILE     = os.path.join(PROJECT_ROOT, ".env")
+CACHE_FILE   = os.path.join(PROJECT_ROOT, "base", "_env_cache.py")
+
+
+
+
+
+def main():
+    """ Parse .env with decouple's own parser and write the cache module """
+
+    if not os.path.isfile(ENV_FILE):
+        print(f"❌ No .env file found at {ENV_FILE}")
+        return 1
+
+    values = RepositoryEnv(ENV_FILE).data
+
+    lines = [
+        '""" Generated by scripts/compile_env.py from .env — do not edit or commit. """',
+        "",
+        "ENV = {",
+    ]
+    lines += [f"    {key!r}: {value!r}," for key, value in sorted(values.items())]
+    lines += ["}", ""]
+
+    with open(CACHE_FILE, "w", encoding = "utf-8") as handle:
+        handle.write("\n".join(lines))
+
+    # Byte-compile now so the first import is a plain .pyc load
+    py_compile.compile(CACHE_FILE, doraise = True)
+
+    print(f"✅ Wrote {len(values)} values to {CACHE_FILE}")
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,13 +6,23 @@ Reads ANTHROPIC_API_KEY from environment via base/constants.py.
 """
 
 # Python Packages
-from anthropic import Anthropic
+import httpx
+from anthropic import Anthropic, DefaultHttpxClient
 from typing import Optional
 
 # Constants
 from ...base import constants
 
 
+# Keep idle connections open past httpx's 5s default so requests a few seconds
+# apart reuse the TLS connection (same settings as the OpenAI client).
+HTTP_LIMITS = httpx.Limits(
+    max_connections           = 100,
+    max_keepalive_connections = 20,
+    keepalive_expiry          = 30
+)
+
+
 
 
 
@@ -28,7 +38,10 @@ class AnthropicClient:
     def __new__(cls, api_key: Optional[str] = None):
         if cls._instance is None:
             cls._instance = super(AnthropicClient, cls).__new__(cls)
-            cls._client   = Anthropic(api_key=constants.ANTHROPIC_API_KEY)
+            cls._client   = Anthropic(
+                api_key     = constants.ANTHROPIC_API_KEY,
+                http_client = DefaultHttpxClient(limits = HTTP_LIMITS)
+            )
         return cls._instance
 
 
@@ -15,10 +15,19 @@ Key difference from OpenAI:
 This class handles that conversion internally — callers always pass messages
 in the standard OpenAI format (system role inside messages array) and this
 service splits it out automatically before calling the Anthropic API.
+
+Prompt caching:
+  OpenAI caches long prompt prefixes automatically; Anthropic only caches up
+  to explicit cache_control breakpoints. Every request marks two: the system
+  prompt, and the last turn before the new message — so the system prompt and
+  the conversation so far are read from cache on the next turn. Prompts shorter
+  than the model's minimum cacheable length are simply not cached.
+  The cache_key argument (OpenAI's prompt_cache_key) is accepted for interface
+  parity and ignored — the breakpoints already scope the cache per prompt.
 """
 
 # Python Packages
-from typing import List, Dict, Optional
+from typing import Any, Iterator, List, Dict, Optional
 
 # Client
 from .anthropic_client import AnthropicClient
@@ -27,6 +36,10 @@ from .anthropic_client import AnthropicClient
 from ...base import constants
 
 
+# Cache breakpoint marker (default 5-minute TTL)
+EPHEMERAL = {"type": "ephemeral"}
+
+
 
 
 
@@ -46,7 +59,8 @@ class ChatService:
         messages: List[Dict[str, str]],
         model: str = None,
         temperature: float = 0.2,
-        max_tokens: int = 1024
+        max_tokens: int = 1024,
+        cache_key: Optional[str] = None
     ) -> str:
         """
         Generate a response using the Anthropic Claude API.
@@ -63,6 +77,7 @@ class ChatService:
             model:       Claude model string. Defaults to ANTHROPIC_DEFAULT_MODEL.
             temperature: Sampling temperature (0.0 – 1.0).
             max_tokens:  Maximum tokens in response.
+            cache_key:   Unused — see "Prompt caching" above.
 
         Returns:
             Generated response text as a string.
@@ -80,9 +95,10 @@ class ChatService:
 
             # Anthropic ignores empty system strings — only pass if present
             if system_prompt:
-                kwargs["system"] = system_prompt
+                kwargs["system"] = self._cached_system(system_prompt)
 
             response = self.client.messages.create(**kwargs)
+            self._log_cache_usage(response.usage)
             return response.content[0].text
 
         except Exception as e:
@@ -91,6 +107,93 @@ class ChatService:
 
 
 
+    def generate_response_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = None,
+        temperature: float = 0.2,
+        max_tokens: int = 1024,
+        cache_key: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Same as generate_response(), but yields the reply text piece by piece
+        as the model produces it (Anthropic streaming Messages API).
+
+        Yields:
+            Text deltas — "".join() of them equals generate_response()'s result.
+        """
+
+        try:
+            system_prompt, conversation = self._split_messages(messages)
+
+            kwargs = dict(
+                model       = model or self.default_model,
+                max_tokens  = max_tokens,
+                temperature = temperature,
+                messages    = conversation,
+            )
+
+            if system_prompt:
+                kwargs["system"] = self._cached_system(system_prompt)
+
+            with self.client.messages.stream(**kwargs) as stream:
+                yield from stream.text_stream
+                self._log_cache_usage(stream.get_final_message().usage)
+
+        except Exception as e:
+            print(f"❌ Anthropic error streaming response: {e}")
+            raise
+
+
+
+    def generate_json(
+        self,
+        messages: List[Dict[str, str]],
+        schema: Dict[str, Any],
+        schema_name: str,
+        model: str = None,
+        temperature: float = 0.0,
+        max_tokens: int = 256
+    ) -> Dict[str, Any]:
+        """
+        Generate a JSON object that conforms to *schema*.
+
+        Uses Anthropic tool use: a single tool whose input_schema is *schema*
+        is offered and forced via tool_choice, so the model's reply is the
+        tool input — already parsed, no fences or prose to strip.
+
+        Returns:
+            The tool input as a dict.
+        """
+
+        try:
+            system_prompt, conversation = self._split_messages(messages)
+
+            kwargs = dict(
+                model       = model or self.default_model,
+                max_tokens  = max_tokens,
+                temperature = temperature,
+                messages    = conversation,
+                tools       = [{"name": schema_name, "input_schema": schema}],
+                tool_choice = {"type": "tool", "name": schema_name},
+            )
+
+            if system_prompt:
+                kwargs["system"] = self._cached_system(system_prompt)
+
+            response = self.client.messages.create(**kwargs)
+            for block in response.content:
+                if block.type == "tool_use":
+                    return block.input
+
+            raise ValueError(f"No '{schema_name}' tool call in Anthropic response")
+
+        except Exception as e:
+            print(f"❌ Anthropic error generating JSON: {e}")
+            raise
+
+
+
     def generate_answer_from_context(self, question: str, context: str, model: str = None) -> str:
         """
         Generate answer based on provided context.
@@ -126,6 +229,7 @@ class ChatService:
           - The FIRST "system" role message becomes the top-level system prompt.
           - All "user" and "assistant" messages form the conversation array.
           - Additional system messages (rare) are prepended to the next user message.
+          - The second-to-last turn carries a cache_control breakpoint.
         """
         system_parts   = []
         conversation   = []
@@ -149,5 +253,29 @@ class ChatService:
                     pending_system = []
                 conversation.append({"role": role, "content": content})
 
+        # Cache breakpoint on the last turn before the new message, so the
+        # next call in this conversation reads everything up to it from cache
+        if len(conversation) >= 2:
+            previous = conversation[-2]
+            conversation[-2] = {
+                "role":    previous["role"],
+                "content": [{"type": "text", "text": previous["content"], "cache_control": EPHEMERAL}]
+            }
+
         system_prompt = "\n\n".join(system_parts)
         return system_prompt, conversation
+
+
+    @staticmethod
+    def _cached_system(system_prompt: str) -> List[Dict[str, Any]]:
+        """ The system prompt as one text block carrying a cache breakpoint. """
+        return [{"type": "text", "text": system_prompt, "cache_control": EPHEMERAL}]
+
+
+    @staticmethod
+    def _log_cache_usage(usage) -> None:
+        """ Print prompt-cache reads/writes for a response, when there were any. """
+        read    = getattr(usage, "cache_read_input_tokens", None) or 0
+        written = getattr(usage, "cache_creation_input_tokens", None) or 0
+        if read or written:
+            print(f"   💾 Prompt cache: {read} tokens read, {written} written")
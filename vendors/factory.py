@@ -26,6 +26,9 @@ create a new embedding service in vendors/ and update get_embedding_service()
 below — that's the only place to change.
 """
 
+# Python Packages
+from functools import lru_cache
+
 # Constants
 from ..base import constants
 
@@ -37,6 +40,10 @@ def get_chat_service():
     """
     Return the correct ChatService instance based on AI_PROVIDER env variable.
 
+    ChatService holds no per-call state, so every caller gets the same
+    instance for the provider — one wrapper per process over the shared
+    client and its keep-alive connection pool.
+
     Returns:
         ChatService with a generate_response(messages, temperature, max_tokens) method.
 
@@ -44,7 +51,12 @@ def get_chat_service():
         ValueError: If AI_PROVIDER is set to an unsupported value.
     """
 
-    provider = constants.AI_PROVIDER.lower().strip()
+    return _chat_service_for(constants.AI_PROVIDER.lower().strip())
+
+
+@lru_cache(maxsize = None)
+def _chat_service_for(provider: str):
+    """ Build the ChatService for *provider* once; later calls return the same instance. """
 
     if provider == "anthropic":
         from .anthropic.chat_service import ChatService
@@ -1,7 +1,8 @@
 """ OpenAI Chat/Completion Service... """
 
 # Python Packages
-from typing import List, Dict, Optional
+import json
+from typing import Any, Iterator, List, Dict, Optional
 
 # Open Client
 from .openai_client import OpenAIClient
@@ -29,7 +30,8 @@ class ChatService:
         messages: List[Dict[str, str]],
         model: str = None,
         temperature: float = constants.OPENAI_ANSWER_TEMPERATURE,
-        max_tokens: int = constants.OPENAI_MAX_TOKENS
+        max_tokens: int = constants.OPENAI_MAX_TOKENS,
+        cache_key: Optional[str] = None
     ) -> str:
         """
         Generate a chat completion response
@@ -39,6 +41,8 @@ class ChatService:
             model: OpenAI model to use
             temperature: Sampling temperature (0-2)
             max_tokens: Maximum tokens in response
+            cache_key: Optional conversation id, sent as prompt_cache_key so
+                       the turns of one conversation reach the same prompt cache
             
         Returns:
             Generated response text
@@ -49,7 +53,8 @@ class ChatService:
                 model = model or self.default_model,
                 messages = messages,
                 temperature = temperature,
-                max_tokens = max_tokens
+                max_tokens = max_tokens,
+                **self._cache_kwargs(cache_key)
             )
 
             return response.choices[0].message.content
@@ -60,6 +65,80 @@ class ChatService:
 
 
 
+    def generate_response_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = None,
+        temperature: float = constants.OPENAI_ANSWER_TEMPERATURE,
+        max_tokens: int = constants.OPENAI_MAX_TOKENS,
+        cache_key: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Same as generate_response(), but yields the reply text piece by piece
+
+        Yields:
+            Text deltas — "".join() of them equals generate_response()'s result
+        """
+
+        try:
+            stream = self.client.chat.completions.create(
+                model = model or self.default_model,
+                messages = messages,
+                temperature = temperature,
+                max_tokens = max_tokens,
+                stream = True,
+                **self._cache_kwargs(cache_key)
+            )
+
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            print(f"❌ Error streaming response: {e}")
+            raise
+
+
+
+    def generate_json(
+        self,
+        messages: List[Dict[str, str]],
+        schema: Dict[str, Any],
+        schema_name: str,
+        model: str = None,
+        temperature: float = 0.0,
+        max_tokens: int = 256
+    ) -> Dict[str, Any]:
+        """
+        Generate a JSON object that conforms to *schema*
+
+        Uses Structured Outputs (response_format json_schema, strict), so the
+        reply is guaranteed to parse and match the schema.
+
+        Returns:
+            The parsed JSON object
+        """
+
+        try:
+            response = self.client.chat.completions.create(
+                model = model or self.default_model,
+                messages = messages,
+                temperature = temperature,
+                max_tokens = max_tokens,
+                response_format = {
+                    "type": "json_schema",
+                    "json_schema": {"name": schema_name, "schema": schema, "strict": True}
+                }
+            )
+
+            return json.loads(response.choices[0].message.content)
+
+        except Exception as e:
+            print(f"❌ Error generating JSON: {e}")
+            raise
+
+
+
     def generate_answer_from_context(
         self,
         question: str,
@@ -90,3 +169,11 @@ class ChatService:
         ]
 
         return self.generate_response(messages, model = model)
+
+
+
+    @staticmethod
+    def _cache_kwargs(cache_key: Optional[str]) -> Dict[str, str]:
+        """ prompt_cache_key for the request, only when a conversation id is known """
+
+        return {"prompt_cache_key": cache_key} if cache_key else {}
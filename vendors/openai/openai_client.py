@@ -2,13 +2,25 @@
 
 # Python Packages
 import os
-from openai import OpenAI
+import httpx
+from openai import DefaultHttpxClient, OpenAI
 from typing import Optional
 
 # Constants
 from ...base import constants
 
 
+# Connection pool for the shared client. httpx closes idle keep-alive
+# connections after 5s by default, so requests a few seconds apart would pay a
+# new TLS handshake; keep them open longer. The SDK retries the rare request
+# that lands on a connection the server has already closed.
+HTTP_LIMITS = httpx.Limits(
+    max_connections           = 100,
+    max_keepalive_connections = 20,
+    keepalive_expiry          = 30
+)
+
+
 
 
 
@@ -22,7 +34,8 @@ class OpenAIClient:
         if cls._instance is None:
             cls._instance = super(OpenAIClient, cls).__new__(cls)
             cls._client = OpenAI(
-                api_key = constants.OPENAI_API_KEY
+                api_key = constants.OPENAI_API_KEY,
+                http_client = DefaultHttpxClient(limits = HTTP_LIMITS)
             )
         return cls._instance
 